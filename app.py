@@ -1,44 +1,31 @@
 # app.py
-from flask import Flask, render_template, redirect, url_for, flash
-from flask_login import LoginManager, login_required
+import importlib
 from datetime import date
-import os
-
-# blueprints (rotas)
-from routes.user_routes import user_bp
-from routes.conta_bancaria_routes import conta_bancaria_bp
-from routes.contas_pagar_route import contas_pagar_bp
-from routes.crediario_routes import crediario_bp
-from routes.movimento_routes import movimento_bp
-from routes.transacao_routes import transacao_bp
-from routes.tipo_crediario_routes import tipo_crediario_bp
-from routes.grupo_crediario_routes import grupo_crediario_bp
-from routes.movimento_crediario_routes import movimento_crediario_bp
-from routes.extrato_routes import extrato_bp
-from routes.despesa_fixa_routes import despesas_fixas_bp
-
-# modelos
-from models.user_model import User
-from models.conta_bancaria_model import ContaBancaria
-from models.contas_pagar_model import ContasPagar
-from models.crediario_model import Crediario
-from models.movimento_bancario_model import MovimentoBancario
-from models.transacao_model import Transacao
-from models.tipo_crediario_model import TipoCrediario
-from models.grupo_crediario_model import GrupoCrediario
-from models.movimento_crediario_model import MovimentoCrediario
-from models.despesa_fixa_model import DespesaFixa
-
-# checar e atualizar constraints
-from database.db_manager import check_and_update_table_constraints
-
-app = Flask(__name__)
-app.config.from_object('config.Config')
+from decimal import Decimal
+
+from flask import Flask, render_template, flash, current_app
+from flask.json.provider import DefaultJSONProvider
+from flask_login import LoginManager, login_required, current_user
+
+# blueprints (rotas): nome -> (módulo, objeto). Os módulos de rotas (e, com eles, os
+# modelos e o driver do banco) só são importados quando create_app() registra o blueprint.
+BLUEPRINTS = {
+    'users': ('routes.user_routes', 'user_bp'),
+    'contas_bancarias': ('routes.conta_bancaria_routes', 'conta_bancaria_bp'),
+    'contas_pagar': ('routes.contas_pagar_route', 'contas_pagar_bp'),
+    'crediarios': ('routes.crediario_routes', 'crediario_bp'),
+    'movimento': ('routes.movimento_routes', 'movimento_bp'),
+    'transacoes': ('routes.transacao_routes', 'transacao_bp'),
+    'tipos_crediario': ('routes.tipo_crediario_routes', 'tipo_crediario_bp'),
+    'grupo_crediario': ('routes.grupo_crediario_routes', 'grupo_crediario_bp'),
+    'movimento_crediario': ('routes.movimento_crediario_routes', 'movimento_crediario_bp'),
+    'extrato': ('routes.extrato_routes', 'extrato_bp'),
+    'despesa_fixa': ('routes.despesa_fixa_routes', 'despesas_fixas_bp'),
+}
 
 
 # 1. Configuração do Flask-Login
 login_manager = LoginManager()
-login_manager.init_app(app)
 login_manager.login_view = 'users.login'
 login_manager.login_message = "Faça login para acessar o sistema."
 login_manager.login_message_category = "info"
@@ -46,55 +33,102 @@ login_manager.login_message_category = "info"
 
 @login_manager.user_loader
 def load_user(user_id):
+    from models.user_model import User
     return User.get_by_id(user_id)
 
 
-# 3. Registrar Blueprints (Rotas)
-app.register_blueprint(user_bp)
-app.register_blueprint(conta_bancaria_bp)
-app.register_blueprint(contas_pagar_bp)
-app.register_blueprint(crediario_bp)
-app.register_blueprint(movimento_bp)
-app.register_blueprint(transacao_bp)
-app.register_blueprint(tipo_crediario_bp)
-app.register_blueprint(grupo_crediario_bp)
-app.register_blueprint(movimento_crediario_bp)
-app.register_blueprint(extrato_bp)
-app.register_blueprint(despesas_fixas_bp)
+class JSONProvider(DefaultJSONProvider):
+    # dinheiro (Decimal) sai como número em jsonify e no filtro tojson, não como texto:
+    # com duas casas, o float mais curto tem exatamente os mesmos dígitos
+    @staticmethod
+    def default(o):
+        if isinstance(o, Decimal):
+            return float(o)
+        return DefaultJSONProvider.default(o)
 
 
-# 4. Rota Home Principal
-@app.route('/')
+# 2. Rota Home Principal
 @login_required
 def index():
+    from services.projecao import calcular_projecao
     current_date = date.today()
-    return render_template('index.html', today_date=current_date)
+    projecao = calcular_projecao(current_user.id)
+    return render_template('index.html', today_date=current_date, projecao=projecao)
+
+
+def _contar_erro(codigo):
+    if 'metricas' in current_app.extensions:
+        from services.metricas import registrar_erro
+        registrar_erro(codigo)
 
 
-@app.errorhandler(404)
 def page_not_found(e):
+    _contar_erro(404)
     flash('A página que você está tentando acessar não existe.', 'danger')
     return render_template('erros/404.html'), 404  # <--- ALTERADO AQUI
 
 
-@app.errorhandler(500)
 def internal_server_error(e):
+    _contar_erro(500)
     flash('Ocorreu um erro interno no servidor. Por favor, tente novamente mais tarde.', 'danger')
     return render_template('erros/500.html'), 500  # <--- ALTERADO AQUI
 
 
+# 3. Fábrica da aplicação
+def create_app(config='config.Config', blueprints=None):
+    # config: objeto/caminho aceito por app.config.from_object ou um dict de overrides.
+    # blueprints: nomes de BLUEPRINTS a registrar (padrão: todos). Um subconjunto serve a
+    # apps leves (testes, APIs); as páginas que usam base.html precisam de todos.
+    app = Flask(__name__)
+    app.json = JSONProvider(app)
+    if isinstance(config, dict):
+        app.config.from_object('config.Config')
+        app.config.update(config)
+    else:
+        app.config.from_object(config)
+
+    login_manager.init_app(app)
+
+    for nome in (BLUEPRINTS if blueprints is None else blueprints):
+        modulo, objeto = BLUEPRINTS[nome]
+        app.register_blueprint(getattr(importlib.import_module(modulo), objeto))
+
+    if app.config.get('METRICS_ENABLED'):
+        from services import metricas
+        metricas.init_app(app)
+
+    if app.config.get('SQL_DEBUG'):
+        from services import instrumentacao_sql
+        instrumentacao_sql.init_app(app)
+
+    if app.config.get('SLOW_QUERY_MS'):
+        from database import consultas_lentas
+        consultas_lentas.ativar(app.config['SLOW_QUERY_MS'],
+                                app.config.get('SLOW_QUERY_EXPLAIN_SAMPLE', 0))
+
+    app.add_url_rule('/', 'index', index)
+    app.register_error_handler(404, page_not_found)
+    app.register_error_handler(500, internal_server_error)
+
+    # 4. Comandos de manutenção (flask --app app <comando>)
+    from comandos import COMANDOS
+    for comando in COMANDOS:
+        app.cli.add_command(comando)
+
+    return app
+
+
+def preaquecer(app):
+    # para servidores pre-fork (gunicorn --preload): compila todos os templates no processo
+    # mestre, antes do fork, para que os workers não paguem isso na primeira requisição
+    for nome in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(nome)
+    return app
+
+
 if __name__ == '__main__':
-    with app.app_context():
-        User.create_table()
-        ContaBancaria.create_table()
-        ContasPagar.create_table()
-        Crediario.create_table()
-        Transacao.create_table()
-        MovimentoBancario.create_table()
-        TipoCrediario.create_table()
-        GrupoCrediario.create_table()
-        MovimentoCrediario.create_table()
-        DespesaFixa.create_table()
-        check_and_update_table_constraints()
-
-    app.run(debug=True)
+    from database.migrate import verificar_versao
+
+    # o esquema é atualizado à parte (flask --app app db-migrate); aqui só a versão é conferida
+    verificar_versao()
+    create_app().run(debug=True)
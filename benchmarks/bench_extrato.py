@@ -0,0 +1,125 @@
+# benchmarks/bench_extrato.py
+# Mostra a mudança de plano de get_extrato_mensal: EXTRACT(YEAR/MONTH) x intervalo semiaberto,
+# com e sem o índice (conta_id, data, id), numa movimentos_bancarios sintética isolada
+# no schema "bench_extrato" (as tabelas da aplicação não são tocadas).
+#
+#   python -m benchmarks.bench_extrato --linhas 3000000 --contas 2000
+import argparse
+import json
+import time
+
+from database.db_manager import get_db_cursor
+
+CONSULTA_EXTRACT = """
+SELECT id, conta_id, data, valor, descricao
+FROM bench_extrato.movimentos_bancarios
+WHERE conta_id = %s AND EXTRACT(YEAR FROM data) = %s AND EXTRACT(MONTH FROM data) = %s
+ORDER BY data ASC, id ASC
+"""
+
+CONSULTA_INTERVALO = """
+SELECT id, conta_id, data, valor, descricao
+FROM bench_extrato.movimentos_bancarios
+WHERE conta_id = %s AND data >= %s AND data < %s
+ORDER BY data ASC, id ASC
+"""
+
+
+def _preparar(linhas, contas, anos):
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute("DROP SCHEMA IF EXISTS bench_extrato CASCADE")
+        cursor.execute("CREATE SCHEMA bench_extrato")
+        cursor.execute("""
+            CREATE TABLE bench_extrato.movimentos_bancarios (
+                id SERIAL PRIMARY KEY,
+                conta_id INTEGER NOT NULL,
+                data DATE NOT NULL,
+                valor NUMERIC(15, 2) NOT NULL,
+                descricao VARCHAR(255) NOT NULL
+            )
+        """)
+        cursor.execute("""
+            INSERT INTO bench_extrato.movimentos_bancarios (conta_id, data, valor, descricao)
+            SELECT 1 + (g %% %s),
+                   CURRENT_DATE - ((random() * %s * 365)::int),
+                   round((random() * 2000 - 1000)::numeric, 2),
+                   'lancamento ' || g
+            FROM generate_series(1, %s) AS g
+        """, (contas, anos, linhas))
+        cursor.execute("ANALYZE bench_extrato.movimentos_bancarios")
+
+
+def _criar_indice():
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute("""
+            CREATE INDEX idx_bench_movimentos_conta_data
+            ON bench_extrato.movimentos_bancarios (conta_id, data, id)
+        """)
+        cursor.execute("ANALYZE bench_extrato.movimentos_bancarios")
+
+
+def _medir(consulta, params, repeticoes):
+    with get_db_cursor() as cursor:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + consulta, params)
+        plano = cursor.fetchone()[0][0]
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            cursor.execute(consulta, params)
+            cursor.fetchall()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    no = plano['Plan']
+    nos = []
+    while no:
+        nos.append(no['Node Type'] + (f" ({no['Index Name']})" if 'Index Name' in no else ''))
+        no = no.get('Plans', [None])[0]
+    return {
+        'plano': ' -> '.join(nos),
+        'linhas': plano['Plan'].get('Actual Rows'),
+        'buffers_lidos': plano['Plan'].get('Shared Hit Blocks', 0) + plano['Plan'].get('Shared Read Blocks', 0),
+        'execucao_ms': plano['Execution Time'],
+        'melhor_ms': round(min(tempos), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--linhas', type=int, default=3_000_000)
+    parser.add_argument('--contas', type=int, default=2000)
+    parser.add_argument('--anos', type=int, default=5)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--manter', action='store_true',
+                        help='não remove o schema bench_extrato ao final')
+    args = parser.parse_args()
+
+    _preparar(args.linhas, args.contas, args.anos)
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "SELECT EXTRACT(YEAR FROM MAX(data))::int, EXTRACT(MONTH FROM MAX(data))::int FROM bench_extrato.movimentos_bancarios")
+        ano, mes = cursor.fetchone()
+    inicio = f'{ano}-{mes:02d}-01'
+    fim = f'{ano + 1}-01-01' if mes == 12 else f'{ano}-{mes + 1:02d}-01'
+    conta_id = 42
+
+    resultados = {}
+    resultados['sem_indice'] = {
+        'extract': _medir(CONSULTA_EXTRACT, (conta_id, ano, mes), args.repeticoes),
+        'intervalo': _medir(CONSULTA_INTERVALO, (conta_id, inicio, fim), args.repeticoes)
+    }
+    _criar_indice()
+    resultados['com_indice'] = {
+        'extract': _medir(CONSULTA_EXTRACT, (conta_id, ano, mes), args.repeticoes),
+        'intervalo': _medir(CONSULTA_INTERVALO, (conta_id, inicio, fim), args.repeticoes)
+    }
+
+    if not args.manter:
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute("DROP SCHEMA bench_extrato CASCADE")
+
+    print(json.dumps({'linhas': args.linhas, 'contas': args.contas,
+          'resultados': resultados}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_hidratacao.py
+# Tempo e memória para montar objetos a partir de linhas do banco (por 100 mil linhas):
+# o mapeamento antigo (tuplas indexadas à mão em classes com __dict__) contra os modelos com
+# __slots__ hidratados por row factories do psycopg. As linhas vêm de generate_series, com o
+# formato de movimentos_bancarios; nenhuma tabela é tocada.
+#
+#   python -m benchmarks.bench_hidratacao --linhas 100000 --repeticoes 5
+import argparse
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+
+from psycopg.rows import args_row, class_row, namedtuple_row, tuple_row
+
+from database.db_manager import get_db_cursor
+from models.movimento_bancario_model import MovimentoBancario
+
+CONSULTA = """
+SELECT g AS id, 1 + g %% 50 AS conta_id, DATE '2020-01-01' + g %% 1800 AS data,
+       ((g %% 200000) / 100.0 - 1000)::numeric(15, 2) AS valor, 'lançamento ' || g AS descricao
+FROM generate_series(1, %s) AS g
+"""
+
+
+class _MovimentoLegado:
+    # como os modelos eram antes: atributos em __dict__, montados por índice
+    def __init__(self, id, conta_id, data, valor, descricao, saldo_acumulado=None):
+        self.id = id
+        self.conta_id = conta_id
+        self.data = data
+        self.valor = valor
+        self.descricao = descricao
+        self.saldo_acumulado = saldo_acumulado
+
+
+def _buscar(linhas, row_factory, montar=None):
+    with get_db_cursor(row_factory=row_factory) as cursor:
+        cursor.execute(CONSULTA, (linhas,))
+        rows = cursor.fetchall()
+    return montar(rows) if montar else rows
+
+
+ESTRATEGIAS = {
+    'tuplas (sem objetos)': (tuple_row, None),
+    'legado: tupla + classe com __dict__': (
+        tuple_row,
+        lambda rows: [_MovimentoLegado(row[0], row[1], row[2], float(row[3]), row[4]) for row in rows]),
+    'namedtuple_row': (namedtuple_row, None),
+    'class_row(MovimentoBancario) com __slots__': (class_row(MovimentoBancario), None),
+    'args_row(MovimentoBancario) com __slots__': (args_row(MovimentoBancario), None),
+}
+
+
+def _medir_tempo(linhas, row_factory, montar, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        objetos = _buscar(linhas, row_factory, montar)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        del objetos
+    return statistics.median(tempos)
+
+
+def _medir_memoria(linhas, row_factory, montar):
+    # bytes retidos pela lista final (objetos e valores) e pico durante a montagem (inclui
+    # as tuplas intermediárias do mapeamento manual), medidos com tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        objetos = _buscar(linhas, row_factory, montar)
+        gc.collect()
+        atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objetos
+    return atual - antes, pico - antes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--linhas', type=int, default=100000)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    escala = 100000 / args.linhas
+    resultados = {}
+    for nome, (row_factory, montar) in ESTRATEGIAS.items():
+        _buscar(1000, row_factory, montar)
+        tempo_ms = _medir_tempo(args.linhas, row_factory, montar, args.repeticoes)
+        retido, pico = _medir_memoria(args.linhas, row_factory, montar)
+        resultados[nome] = {
+            'ms_por_100k': round(tempo_ms * escala, 1),
+            'mb_por_100k': round(retido * escala / 1024 / 1024, 2),
+            'mb_pico_por_100k': round(pico * escala / 1024 / 1024, 2),
+            'bytes_por_linha': round(retido / args.linhas, 1)
+        }
+        print(f"  {nome}: {resultados[nome]['ms_por_100k']} ms, "
+              f"{resultados[nome]['mb_por_100k']} MB retidos "
+              f"(pico {resultados[nome]['mb_pico_por_100k']} MB) por 100 mil linhas")
+
+    print(json.dumps({'linhas': args.linhas, 'repeticoes': args.repeticoes,
+                      'resultados': resultados}, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
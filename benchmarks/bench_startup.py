@@ -0,0 +1,67 @@
+# benchmarks/bench_startup.py
+# Mede, em interpretadores novos, o custo de inicialização de um worker: import do módulo
+# app, create_app() com todos os blueprints ou só com alguns, e a latência da primeira e
+# da segunda requisição (com e sem preaquecer os templates antes).
+#
+#   python -m benchmarks.bench_startup --repeticoes 5
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_FILHO = r'''
+import json, sys, time
+inicio = time.perf_counter()
+import app as modulo_app
+t_import = time.perf_counter()
+blueprints = json.loads(sys.argv[1])
+aplicacao = modulo_app.create_app(blueprints=blueprints)
+t_create = time.perf_counter()
+if sys.argv[2] == '1':
+    modulo_app.preaquecer(aplicacao)
+t_preaquecer = time.perf_counter()
+cliente = aplicacao.test_client()
+cliente.get('/login')
+t_primeira = time.perf_counter()
+cliente.get('/login')
+t_segunda = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t_import - inicio) * 1000,
+    'create_app_ms': (t_create - t_import) * 1000,
+    'preaquecer_ms': (t_preaquecer - t_create) * 1000,
+    'primeira_requisicao_ms': (t_primeira - t_preaquecer) * 1000,
+    'segunda_requisicao_ms': (t_segunda - t_primeira) * 1000,
+    'modulos_carregados': len(sys.modules),
+}))
+'''
+
+CENARIOS = {
+    'completo': (None, False),
+    'completo_preaquecido': (None, True),
+    'somente_users': (['users'], False),
+}
+
+
+def _medir(blueprints, preaquecer, repeticoes):
+    amostras = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, '-c', _FILHO, json.dumps(blueprints), '1' if preaquecer else '0'],
+            capture_output=True, text=True, check=True)
+        amostras.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    return {chave: round(statistics.median(a[chave] for a in amostras), 2) for chave in amostras[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    resultados = {nome: _medir(blueprints, preaquecer, args.repeticoes)
+                  for nome, (blueprints, preaquecer) in CENARIOS.items()}
+    print(json.dumps({'mediana_de': args.repeticoes, 'cenarios': resultados}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
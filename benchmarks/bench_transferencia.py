@@ -0,0 +1,107 @@
+# benchmarks/bench_transferencia.py
+# Compara o caminho antigo de transferência (uma conexão por perna + leitura de saldo
+# fora da transação) com MovimentoBancario.transfer sob transferências concorrentes.
+#
+#   python -m benchmarks.bench_transferencia --threads 16 --transferencias 2000
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.comum import criar_usuario_bench, remover_usuario_bench, resumo_latencias
+from config import Config
+from database.db_manager import execute_query, get_db_cursor, get_pool_stats
+from models.conta_bancaria_model import ContaBancaria
+from models.movimento_bancario_model import MovimentoBancario
+from services.dinheiro import dinheiro
+
+VALOR_TRANSFERENCIA = dinheiro('1.00')
+
+
+def _transfer_legado(conta_origem_id, conta_destino_id, valor, descricao):
+    # reprodução do caminho anterior: cada perna relê a conta por outra conexão
+    # (saldo_atual chega como Decimal; somar float a ele levanta TypeError)
+    valor = dinheiro(valor)
+    with get_db_cursor(commit=True) as cursor:
+        for conta_id, valor_perna in ((conta_origem_id, -valor), (conta_destino_id, valor)):
+            conta = ContaBancaria.get_by_id(conta_id)
+            novo_saldo = conta.saldo_atual + valor_perna
+            cursor.execute(
+                'INSERT INTO movimentos_bancarios (conta_id, data, valor, descricao) VALUES (%s, %s, %s, %s)',
+                (conta_id, datetime.now().date(), valor_perna, descricao)
+            )
+            cursor.execute(
+                'UPDATE contas_bancarias SET saldo_atual = %s WHERE id = %s',
+                (novo_saldo, conta_id)
+            )
+    return True
+
+
+def _executar(nome, funcao, contas, threads, transferencias):
+    latencias = []
+    erros = 0
+    primeiro_erro = None
+    pares = [tuple(random.sample(contas, 2)) for _ in range(transferencias)]
+
+    def _uma(par):
+        inicio = time.perf_counter()
+        funcao(par[0], par[1], VALOR_TRANSFERENCIA, 'bench transferencia')
+        return (time.perf_counter() - inicio) * 1000
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futuros = [executor.submit(_uma, par) for par in pares]
+        for futuro in futuros:
+            try:
+                latencias.append(futuro.result())
+            except Exception as e:
+                erros += 1
+                primeiro_erro = primeiro_erro or e
+    duracao = time.perf_counter() - inicio
+    # um caminho que só falha não tem o que comparar: interrompe em vez de reportar 0/s
+    if not latencias:
+        raise SystemExit(
+            f"Caminho '{nome}': todas as {erros} transferências falharam ({primeiro_erro!r}).")
+
+    saldo_total = execute_query(
+        "SELECT SUM(saldo_atual) FROM contas_bancarias WHERE id = ANY(%s)", (contas,), fetchone=True)[0]
+    esperado = dinheiro(len(contas) * 1_000_000)
+    return {
+        'caminho': nome,
+        'transferencias_por_s': round(len(latencias) / duracao, 1),
+        'erros': erros,
+        'primeiro_erro': repr(primeiro_erro) if primeiro_erro else None,
+        'saldo_total_divergente': saldo_total - esperado,
+        'latencia': resumo_latencias(latencias)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--transferencias', type=int, default=1000)
+    parser.add_argument('--contas', type=int, default=4)
+    args = parser.parse_args()
+
+    # o caminho legado segura duas conexões por transferência; sem folga no pool ele trava
+    Config.DATABASE['pool_max_size'] = max(
+        Config.DATABASE['pool_max_size'], args.threads * 2 + 2)
+
+    resultados = []
+    for nome, funcao in (('legado', _transfer_legado), ('transacao_unica', MovimentoBancario.transfer)):
+        user_id, contas = criar_usuario_bench(
+            'bench_transferencia', num_contas=args.contas)
+        try:
+            resultados.append(_executar(nome, funcao, contas,
+                                        args.threads, args.transferencias))
+        finally:
+            remover_usuario_bench(user_id)
+
+    print(json.dumps({'resultados': resultados,
+          'pool': get_pool_stats()}, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
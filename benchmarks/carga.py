@@ -0,0 +1,256 @@
+# benchmarks/carga.py
+# Teste de carga contra a aplicação rodando localmente (flask run, gunicorn, wsgi.py...) e o
+# PostgreSQL local: loga usuários gerados por benchmarks.gerar_dados, cada um com a própria
+# sessão (cookie), e repete uma mistura de extratos, lançamentos, crediário e páginas de
+# cadastro a partir de várias threads. Informa p50/p95/p99 por operação e requisições por
+# segundo, para dimensionar workers e o pool do banco.
+#
+#   python -m benchmarks.gerar_dados --usuarios 1000 --anos 5
+#   gunicorn -w 4 --threads 4 --preload wsgi:app   (em outro terminal)
+#   python -m benchmarks.carga --url http://127.0.0.1:8000 --threads 32 --duracao 60
+import argparse
+import http.cookiejar
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+
+from benchmarks.comum import resumo_latencias
+from benchmarks.gerar_dados import PREFIXO_PADRAO, SENHA_PADRAO, usuarios_gerados
+
+# operação -> peso na mistura
+MISTURA_PADRAO = {
+    'extrato': 30,
+    'index': 10,
+    'lancamento_form': 8,
+    'lancamento': 8,
+    'transferencia': 4,
+    'crediario_lista': 12,
+    'crediario_previsao': 5,
+    'contas_bancarias': 5,
+    'crediarios': 5,
+    'transacoes': 4,
+    'despesas_fixas': 5,
+    'grupos_crediario': 2,
+    'contas_pagar': 2,
+}
+
+PAGINAS = {
+    'index': '/',
+    'lancamento_form': '/movimento/lancamento',
+    'crediario_lista': '/movimento_crediario/',
+    'crediario_previsao': '/movimento_crediario/previsao',
+    'contas_bancarias': '/contas_bancarias/',
+    'crediarios': '/crediarios/',
+    'transacoes': '/transacoes/',
+    'despesas_fixas': '/despesa_fixa/',
+    'grupos_crediario': '/grupo_crediario/',
+    'contas_pagar': '/contas_pagar/',
+}
+
+
+class _SemRedirecionamento(urllib.request.HTTPRedirectHandler):
+    # o 302 vira a resposta medida; seguir o redirecionamento somaria outra requisição
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Sessao:
+    def __init__(self, url_base, login, contas, timeout):
+        self.url_base = url_base.rstrip('/')
+        self.login = login
+        self.contas = contas
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _SemRedirecionamento())
+
+    def requisitar(self, caminho, dados=None):
+        # devolve o status HTTP; 3xx e 4xx/5xx chegam como HTTPError
+        corpo = urllib.parse.urlencode(dados).encode() if dados is not None else None
+        try:
+            with self.opener.open(self.url_base + caminho, data=corpo, timeout=self.timeout) as resposta:
+                resposta.read()
+                return resposta.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+    def entrar(self, senha):
+        status = self.requisitar('/login', {'login': self.login, 'password': senha})
+        if status != 302:
+            raise RuntimeError(f"Falha no login de {self.login} (status {status}).")
+
+
+def _requisicao(operacao, sessao, rng, anos):
+    # (caminho, dados do formulário ou None, status esperado)
+    if operacao == 'extrato':
+        hoje = date.today()
+        mes = date(hoje.year, hoje.month, 1) - relativedelta(months=rng.randrange(anos * 12))
+        return (f'/extratos/bancario?conta_id={rng.choice(sessao.contas)}&mes_ano={mes:%Y-%m}',
+                None, 200)
+    if operacao == 'lancamento':
+        return ('/movimento/lancamento', {
+            'conta_id': rng.choice(sessao.contas),
+            'data': date.today().isoformat(),
+            'valor': f'{-rng.uniform(1, 50):.2f}',
+            'descricao': 'Lançamento carga'
+        }, 302)
+    if operacao == 'transferencia':
+        origem, destino = rng.sample(sessao.contas, 2)
+        return ('/movimento/lancamento', {
+            'conta_id': origem,
+            'conta_destino_id': destino,
+            'is_transfer': 'on',
+            'data': date.today().isoformat(),
+            'valor': f'{rng.uniform(1, 20):.2f}',
+            'descricao': 'Transferência carga'
+        }, 302)
+    return PAGINAS[operacao], None, 200
+
+
+class Coleta:
+    def __init__(self):
+        self.latencias = {}
+        self.status = {}
+        self.erros = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, operacao, ms, status, esperado):
+        with self._lock:
+            self.status.setdefault(operacao, {})
+            self.status[operacao][str(status)] = self.status[operacao].get(str(status), 0) + 1
+            if status == esperado:
+                self.latencias.setdefault(operacao, []).append(ms)
+            else:
+                self.erros[operacao] = self.erros.get(operacao, 0) + 1
+
+
+def _trabalhador(sessoes, mistura, coleta, fim, anos, semente, aquecimento_ate):
+    rng = random.Random(semente)
+    operacoes = list(mistura)
+    pesos = [mistura[op] for op in operacoes]
+    while time.perf_counter() < fim:
+        sessao = rng.choice(sessoes)
+        operacao = rng.choices(operacoes, pesos)[0]
+        if operacao == 'transferencia' and len(sessao.contas) < 2:
+            operacao = 'lancamento'
+        caminho, dados, esperado = _requisicao(operacao, sessao, rng, anos)
+        inicio = time.perf_counter()
+        try:
+            status = sessao.requisitar(caminho, dados)
+        except OSError:
+            status = 'conexao'
+        if inicio >= aquecimento_ate:
+            coleta.registrar(operacao, (time.perf_counter() - inicio) * 1000, status, esperado)
+
+
+def _ler_mistura(texto):
+    # "extrato=50,lancamento=10" -> {'extrato': 50, 'lancamento': 10}
+    mistura = {}
+    for parte in texto.split(','):
+        nome, _, peso = parte.partition('=')
+        nome = nome.strip()
+        if nome not in MISTURA_PADRAO:
+            raise ValueError(f"Operação desconhecida na mistura: {nome}")
+        mistura[nome] = float(peso or 1)
+    return mistura
+
+
+def executar_carga(url, threads=16, duracao=30, aquecimento=5, sessoes=50, mistura=None,
+                   prefixo=PREFIXO_PADRAO, senha=SENHA_PADRAO, anos=5, timeout=30, semente=42):
+    mistura = mistura or MISTURA_PADRAO
+    usuarios = [u for u in usuarios_gerados(prefixo) if u[2]]
+    if not usuarios:
+        raise RuntimeError(
+            f"Nenhum usuário com prefixo '{prefixo}'. Execute antes: python -m benchmarks.gerar_dados")
+
+    rng = random.Random(semente)
+    escolhidos = rng.sample(usuarios, min(sessoes, len(usuarios)))
+    print(f"Logando {len(escolhidos)} usuário(s) em {url}...")
+    lista_sessoes = []
+    for _, login, contas in escolhidos:
+        sessao = Sessao(url, login, contas, timeout)
+        sessao.entrar(senha)
+        lista_sessoes.append(sessao)
+
+    coleta = Coleta()
+    inicio = time.perf_counter()
+    aquecimento_ate = inicio + aquecimento
+    fim = aquecimento_ate + duracao
+    print(f"{threads} thread(s), {aquecimento} s de aquecimento + {duracao} s medidos...")
+    trabalhadores = [
+        threading.Thread(target=_trabalhador,
+                         args=(lista_sessoes[i::threads] or lista_sessoes, mistura, coleta, fim,
+                               anos, semente + i, aquecimento_ate))
+        for i in range(threads)
+    ]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    medido = time.perf_counter() - aquecimento_ate
+
+    operacoes = {}
+    todas = []
+    for operacao in mistura:
+        latencias = coleta.latencias.get(operacao, [])
+        todas.extend(latencias)
+        resumo = resumo_latencias(latencias)
+        resumo['rps'] = round(len(latencias) / medido, 2)
+        resumo['erros'] = coleta.erros.get(operacao, 0)
+        resumo['status'] = coleta.status.get(operacao, {})
+        operacoes[operacao] = resumo
+
+    total = resumo_latencias(todas)
+    total['rps'] = round(len(todas) / medido, 2)
+    total['erros'] = sum(coleta.erros.values())
+    return {
+        'parametros': {'url': url, 'threads': threads, 'duracao_s': duracao,
+                       'aquecimento_s': aquecimento, 'sessoes': len(lista_sessoes),
+                       'mistura': mistura},
+        'total': total,
+        'operacoes': operacoes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duracao', type=float, default=30, help='segundos medidos')
+    parser.add_argument('--aquecimento', type=float, default=5, help='segundos descartados no início')
+    parser.add_argument('--sessoes', type=int, default=50, help='usuários logados')
+    parser.add_argument('--mistura', help='pesos das operações, ex.: extrato=50,lancamento=10,index=5 '
+                                          f'(operações: {", ".join(MISTURA_PADRAO)})')
+    parser.add_argument('--prefixo', default=PREFIXO_PADRAO)
+    parser.add_argument('--senha', default=SENHA_PADRAO)
+    parser.add_argument('--anos', type=int, default=5, help='meses sorteados para os extratos')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', help='grava o resultado neste arquivo JSON')
+    args = parser.parse_args()
+
+    resultado = executar_carga(
+        args.url, args.threads, args.duracao, args.aquecimento, args.sessoes,
+        _ler_mistura(args.mistura) if args.mistura else None,
+        args.prefixo, args.senha, args.anos, args.timeout, args.semente)
+
+    print(f"\n{'operação':<20} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>6}")
+    for nome, resumo in list(resultado['operacoes'].items()) + [('TOTAL', resultado['total'])]:
+        print(f"{nome:<20} {resumo['rps']:>8.1f} {resumo['p50_ms']:>9.2f} {resumo['p95_ms']:>9.2f} "
+              f"{resumo['p99_ms']:>9.2f} {resumo['erros']:>6}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
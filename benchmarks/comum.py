@@ -0,0 +1,65 @@
+# benchmarks/comum.py
+import statistics
+import time
+from contextlib import contextmanager
+
+from database.db_manager import get_db_cursor
+from werkzeug.security import generate_password_hash
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * (p / 100.0)
+    inferior = int(k)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (k - inferior)
+
+
+def resumo_latencias(latencias_ms):
+    return {
+        'n': len(latencias_ms),
+        'media_ms': round(statistics.fmean(latencias_ms), 3) if latencias_ms else 0.0,
+        'p50_ms': round(percentil(latencias_ms, 50), 3),
+        'p95_ms': round(percentil(latencias_ms, 95), 3),
+        'p99_ms': round(percentil(latencias_ms, 99), 3),
+        'max_ms': round(max(latencias_ms), 3) if latencias_ms else 0.0
+    }
+
+
+@contextmanager
+def cronometro():
+    resultado = {}
+    inicio = time.perf_counter()
+    try:
+        yield resultado
+    finally:
+        resultado['ms'] = (time.perf_counter() - inicio) * 1000
+
+
+def criar_usuario_bench(login, num_contas=2, saldo_inicial=1_000_000, limite_credito=None):
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM users WHERE login = %s", (login,))
+        cursor.execute(
+            "INSERT INTO users (name, email, login, password_hash, is_admin) VALUES (%s, %s, %s, %s, FALSE) RETURNING id",
+            (login, f'{login}@bench.local', login, generate_password_hash(login))
+        )
+        user_id = cursor.fetchone()[0]
+        contas = []
+        for i in range(num_contas):
+            cursor.execute(
+                """
+                INSERT INTO contas_bancarias (user_id, nome_banco, agencia, numero_conta, tipo_conta, saldo_inicial, saldo_atual, limite_credito)
+                VALUES (%s, 'Bench', %s, %s, 'Corrente', %s, %s, %s) RETURNING id
+                """,
+                (user_id, 1000 + (user_id % 9000), f'{user_id}{i:04d}',
+                 saldo_inicial, saldo_inicial, limite_credito)
+            )
+            contas.append(cursor.fetchone()[0])
+    return user_id, contas
+
+
+def remover_usuario_bench(user_id):
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
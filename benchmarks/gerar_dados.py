@@ -0,0 +1,361 @@
+# benchmarks/gerar_dados.py
+# Gera uma massa sintética para medir desempenho: usuários com contas bancárias, movimentos
+# mensais, cadastros (transações, contas a pagar, tipos/grupos de crediário, crediários),
+# compras parceladas e despesas fixas. As linhas entram por COPY; saldo_atual, os fechamentos
+# mensais, as parcelas e o saldo em aberto dos crediários são calculados no final, com os
+# mesmos critérios da aplicação. Os usuários gerados têm login "<prefixo>NNNNN" e a mesma
+# senha; uma nova geração com o mesmo prefixo apaga a anterior.
+#
+#   python -m benchmarks.gerar_dados --usuarios 10000 --anos 5
+#   python -m benchmarks.gerar_dados --usuarios 50 --anos 2 --movimentos-mes 10
+import argparse
+import json
+import random
+import time
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from werkzeug.security import generate_password_hash
+
+from database.db_manager import get_db_cursor
+from services.dinheiro import valor_parcela
+
+PREFIXO_PADRAO = 'sint_'
+SENHA_PADRAO = 'sint123'
+
+TRANSACOES = [('Salário', 'Entrada'), ('Rendimentos', 'Entrada'), ('Mercado', 'Saída'),
+              ('Aluguel', 'Saída'), ('Combustível', 'Saída'), ('Lazer', 'Saída')]
+CONTAS_PAGAR = [('Energia', 'Despesa'), ('Internet', 'Despesa'), ('Condomínio', 'Despesa'),
+                ('Freelance', 'Receita')]
+TIPOS_CREDIARIO = ['Cartão de Crédito', 'Carnê']
+GRUPOS_CREDIARIO = [('Compras', 'Compra'), ('Viagens', 'Compra'), ('Estornos', 'Estorno')]
+CREDIARIOS = [('Cartão Azul', 'Cartão de Crédito', 8000), ('Cartão Verde', 'Cartão de Crédito', 15000),
+              ('Loja Centro', 'Carnê', 3000)]
+GASTOS = ['Mercado', 'Padaria', 'Farmácia', 'Combustível', 'Restaurante', 'Energia', 'Internet',
+          'Aluguel', 'Academia', 'Pix enviado', 'Saque', 'Tarifa bancária', 'Streaming']
+COMPRAS = ['Eletrônicos', 'Roupas', 'Passagem aérea', 'Hotel', 'Móveis', 'Supermercado',
+           'Livros', 'Presentes', 'Manutenção do carro']
+DESPESAS_FIXAS = ['Aluguel', 'Condomínio', 'Energia', 'Água', 'Internet', 'Telefone',
+                  'Plano de saúde', 'Escola', 'Seguro do carro', 'Academia', 'Streaming', 'IPTU']
+PARCELAMENTOS = [1, 1, 1, 2, 3, 3, 4, 5, 6, 10, 12]
+
+
+def _filtro_prefixo(coluna='login'):
+    # LIKE trataria "_" do prefixo como curinga
+    return f'left({coluna}, length(%s)) = %s'
+
+
+def usuarios_gerados(prefixo=PREFIXO_PADRAO):
+    # [(user_id, login, [conta_id, ...])] dos usuários sintéticos, em ordem de login
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT u.id, u.login, COALESCE(array_agg(c.id ORDER BY c.id) FILTER (WHERE c.id IS NOT NULL), '{{}}')
+            FROM users u
+            LEFT JOIN contas_bancarias c ON c.user_id = u.id
+            WHERE {_filtro_prefixo('u.login')}
+            GROUP BY u.id, u.login
+            ORDER BY u.login
+            """,
+            (prefixo, prefixo)
+        )
+        return [(row[0], row[1], list(row[2])) for row in cursor.fetchall()]
+
+
+def _meses(anos, hoje):
+    atual = date(hoje.year, hoje.month, 1)
+    primeiro = atual - relativedelta(months=anos * 12 - 1)
+    return [primeiro + relativedelta(months=i) for i in range(anos * 12)]
+
+
+def _dia(rng, mes, hoje):
+    ultimo = 28 if (mes.year, mes.month) != (hoje.year, hoje.month) else min(28, hoje.day)
+    return mes.replace(day=rng.randint(1, ultimo))
+
+
+def _valor(v):
+    return f'{v:.2f}'
+
+
+def _remover(prefixo):
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(f'DELETE FROM users WHERE {_filtro_prefixo()}', (prefixo, prefixo))
+        return cursor.rowcount
+
+
+def _copiar(cursor, tabela, colunas, linhas):
+    total = 0
+    with cursor.copy(f'COPY {tabela} ({", ".join(colunas)}) FROM STDIN') as copy:
+        for linha in linhas:
+            copy.write_row(linha)
+            total += 1
+    return total
+
+
+def _ids_por_usuario(cursor, tabela, coluna, usuarios):
+    # {user_id: [(id, valor da coluna)]} para as linhas recém-copiadas
+    cursor.execute(
+        f'SELECT user_id, id, {coluna} FROM {tabela} WHERE user_id = ANY(%s) ORDER BY id',
+        (usuarios,))
+    resultado = {}
+    for user_id, id_linha, valor in cursor.fetchall():
+        resultado.setdefault(user_id, []).append((id_linha, valor))
+    return resultado
+
+
+def _gerar_contas(rng, usuarios, por_usuario, prefixo):
+    # saldo_atual provisório: é recalculado depois que os movimentos entram
+    tipos = ['Corrente', 'Poupança', 'Investimento']
+    for user_id in usuarios:
+        for i in range(por_usuario):
+            saldo = _valor(rng.uniform(500, 20000))
+            yield (user_id, f'Banco {1 + i % 3}', 1000 + user_id % 9000, f'{prefixo}{user_id}-{i}',
+                   tipos[i % len(tipos)], saldo, saldo, '2000.00' if i == 0 else None)
+
+
+def _gerar_movimentos(rng, contas, meses, hoje, por_mes):
+    # a primeira conta de cada usuário recebe o salário; as demais, aportes menores.
+    # Os gastos do mês somam em média 90% da entrada.
+    for user_id, conta_id, ordem in contas:
+        renda = rng.uniform(3000, 15000) if ordem == 0 else rng.uniform(300, 2000)
+        for mes in meses:
+            entrada = renda * rng.uniform(0.95, 1.05)
+            dia_entrada = mes.replace(day=5) if mes.replace(day=5) <= hoje else mes
+            yield (conta_id, dia_entrada, _valor(entrada), 'Salário' if ordem == 0 else 'Aplicação')
+            media_gasto = entrada * 0.9 / max(por_mes - 1, 1)
+            for _ in range(por_mes - 1):
+                yield (conta_id, _dia(rng, mes, hoje),
+                       _valor(-media_gasto * rng.uniform(0.2, 1.8)), rng.choice(GASTOS))
+
+
+def _gerar_compras(rng, crediarios, grupos, meses, hoje, por_mes):
+    for user_id, lista_crediarios in crediarios.items():
+        compras = [g for g, tipo in grupos[user_id] if tipo == 'Compra']
+        estornos = [g for g, tipo in grupos[user_id] if tipo == 'Estorno']
+        for mes in meses:
+            for _ in range(por_mes):
+                id_crediario = rng.choice(lista_crediarios)[0]
+                estorno = rng.random() < 0.05
+                num_parcelas = 1 if estorno else rng.choice(PARCELAMENTOS)
+                valor_total = round(rng.uniform(30, 2500), 2)
+                data_compra = _dia(rng, mes, hoje)
+                primeira = mes + relativedelta(months=1)
+                yield (user_id, data_compra, rng.choice(COMPRAS),
+                       rng.choice(estornos if estorno else compras), id_crediario,
+                       _valor(valor_total), num_parcelas, primeira,
+                       primeira + relativedelta(months=num_parcelas - 1),
+                       _valor(valor_parcela(_valor(valor_total), num_parcelas)))
+
+
+def _gerar_despesas(rng, usuarios, meses, por_mes):
+    por_mes = min(por_mes, len(DESPESAS_FIXAS))
+    for user_id in usuarios:
+        fixas = rng.sample(DESPESAS_FIXAS, por_mes)
+        valores = {descricao: rng.uniform(50, 2500) for descricao in fixas}
+        for mes in meses:
+            for descricao in fixas:
+                yield (user_id, descricao, mes, _valor(valores[descricao] * rng.uniform(0.97, 1.03)))
+
+
+def gerar(usuarios=100, anos=5, contas=2, movimentos_mes=25, compras_mes=4, despesas_mes=6,
+          prefixo=PREFIXO_PADRAO, senha=SENHA_PADRAO, semente=42, hoje=None):
+    rng = random.Random(semente)
+    hoje = hoje or date.today()
+    meses = _meses(anos, hoje)
+    tempos = {}
+    linhas = {}
+
+    def fase(nome, inicio):
+        tempos[nome] = round(time.perf_counter() - inicio, 2)
+        if nome in linhas:
+            print(f"  {nome}: {linhas[nome]} linha(s) em {tempos[nome]} s")
+        else:
+            print(f"  {nome}: {tempos[nome]} s")
+
+    inicio = time.perf_counter()
+    removidos = _remover(prefixo)
+    fase('remocao', inicio)
+    print(f"  {removidos} usuário(s) sintético(s) anteriores removido(s)")
+
+    # uma senha para todos: o hash (lento de propósito) é calculado uma vez só
+    password_hash = generate_password_hash(senha)
+    with get_db_cursor(commit=True) as cursor:
+        inicio = time.perf_counter()
+        linhas['users'] = _copiar(
+            cursor, 'users', ('name', 'email', 'login', 'password_hash', 'is_admin'),
+            ((f'Usuário Sintético {i}', f'{prefixo}{i:05d}@bench.local', f'{prefixo}{i:05d}',
+              password_hash, False) for i in range(1, usuarios + 1)))
+        cursor.execute(
+            f'SELECT id FROM users WHERE {_filtro_prefixo()} ORDER BY id', (prefixo, prefixo))
+        ids_usuarios = [row[0] for row in cursor.fetchall()]
+        fase('users', inicio)
+
+        inicio = time.perf_counter()
+        linhas['cadastros'] = (
+            _copiar(cursor, 'transacoes', ('user_id', 'transacao', 'tipo'),
+                    ((u, t, tipo) for u in ids_usuarios for t, tipo in TRANSACOES))
+            + _copiar(cursor, 'contas_pagar', ('user_id', 'conta', 'tipo'),
+                      ((u, c, tipo) for u in ids_usuarios for c, tipo in CONTAS_PAGAR))
+            + _copiar(cursor, 'tipos_crediario', ('user_id', 'nome_tipo'),
+                      ((u, t) for u in ids_usuarios for t in TIPOS_CREDIARIO))
+            + _copiar(cursor, 'grupo_crediario', ('user_id', 'grupo', 'tipo'),
+                      ((u, g, tipo) for u in ids_usuarios for g, tipo in GRUPOS_CREDIARIO))
+            + _copiar(cursor, 'crediarios', ('user_id', 'crediario', 'tipo', 'final', 'limite'),
+                      ((u, c, tipo, rng.randint(1000, 9999), limite)
+                       for u in ids_usuarios for c, tipo, limite in CREDIARIOS)))
+        fase('cadastros', inicio)
+
+        inicio = time.perf_counter()
+        linhas['contas_bancarias'] = _copiar(
+            cursor, 'contas_bancarias',
+            ('user_id', 'nome_banco', 'agencia', 'numero_conta', 'tipo_conta',
+             'saldo_inicial', 'saldo_atual', 'limite_credito'),
+            _gerar_contas(rng, ids_usuarios, contas, prefixo))
+        cursor.execute(
+            'SELECT user_id, id FROM contas_bancarias WHERE user_id = ANY(%s) ORDER BY user_id, id',
+            (ids_usuarios,))
+        lista_contas = []
+        ordem = {}
+        for user_id, conta_id in cursor.fetchall():
+            lista_contas.append((user_id, conta_id, ordem.get(user_id, 0)))
+            ordem[user_id] = ordem.get(user_id, 0) + 1
+        fase('contas_bancarias', inicio)
+
+        inicio = time.perf_counter()
+        linhas['movimentos_bancarios'] = _copiar(
+            cursor, 'movimentos_bancarios', ('conta_id', 'data', 'valor', 'descricao'),
+            _gerar_movimentos(rng, lista_contas, meses, hoje, movimentos_mes))
+        fase('movimentos_bancarios', inicio)
+
+        inicio = time.perf_counter()
+        crediarios = _ids_por_usuario(cursor, 'crediarios', 'crediario', ids_usuarios)
+        grupos = _ids_por_usuario(cursor, 'grupo_crediario', 'tipo', ids_usuarios)
+        linhas['movimento_crediario'] = _copiar(
+            cursor, 'movimento_crediario',
+            ('user_id', 'data_compra', 'descricao', 'id_grupo_crediario', 'id_crediario',
+             'valor_total', 'num_parcelas', 'primeira_parcela', 'ultima_parcela',
+             'valor_parcela_mensal'),
+            _gerar_compras(rng, crediarios, grupos, meses, hoje, compras_mes))
+        fase('movimento_crediario', inicio)
+
+        inicio = time.perf_counter()
+        linhas['despesas_fixas'] = _copiar(
+            cursor, 'despesas_fixas', ('user_id', 'descricao', 'mes_ano', 'valor'),
+            _gerar_despesas(rng, ids_usuarios, meses, despesas_mes))
+        fase('despesas_fixas', inicio)
+
+        # parcelas (o resto em centavos vai nas primeiras, como em _gerar_parcelas); as de
+        # meses anteriores ao atual já estão pagas
+        inicio = time.perf_counter()
+        cursor.execute(
+            """
+            INSERT INTO parcelas_crediario (id_movimento_crediario, user_id, numero, mes_referencia, valor, pago)
+            SELECT mc.id, mc.user_id, n.numero, p.mes,
+                   (floor(mc.valor_total * 100 / mc.num_parcelas)
+                    + CASE WHEN n.numero <= mod(mc.valor_total * 100, mc.num_parcelas) THEN 1 ELSE 0 END) / 100,
+                   p.mes < %s
+            FROM movimento_crediario mc
+            CROSS JOIN LATERAL generate_series(1, mc.num_parcelas) AS n(numero)
+            CROSS JOIN LATERAL (SELECT (mc.primeira_parcela + (n.numero - 1) * INTERVAL '1 month')::date AS mes) p
+            WHERE mc.user_id = ANY(%s)
+            """,
+            (date(hoje.year, hoje.month, 1), ids_usuarios)
+        )
+        linhas['parcelas_crediario'] = cursor.rowcount
+        cursor.execute(
+            """
+            UPDATE crediarios c SET saldo_aberto = COALESCE(calculo.saldo, 0)
+            FROM (
+                SELECT mc.id_crediario,
+                       SUM(CASE WHEN gc.tipo = 'Estorno' THEN -p.valor ELSE p.valor END) AS saldo
+                FROM parcelas_crediario p
+                JOIN movimento_crediario mc ON p.id_movimento_crediario = mc.id
+                JOIN grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+                WHERE p.pago = FALSE AND mc.user_id = ANY(%s)
+                GROUP BY mc.id_crediario
+            ) AS calculo
+            WHERE c.id = calculo.id_crediario
+            """,
+            (ids_usuarios,)
+        )
+        fase('parcelas_crediario', inicio)
+
+        # saldo_atual = saldo_inicial + lançamentos; fechamentos mensais acumulados por conta
+        inicio = time.perf_counter()
+        cursor.execute(
+            """
+            UPDATE contas_bancarias c SET saldo_atual = c.saldo_inicial + totais.total
+            FROM (
+                SELECT m.conta_id, SUM(m.valor) AS total
+                FROM movimentos_bancarios m
+                JOIN contas_bancarias cb ON cb.id = m.conta_id
+                WHERE cb.user_id = ANY(%s)
+                GROUP BY m.conta_id
+            ) AS totais
+            WHERE c.id = totais.conta_id
+            """,
+            (ids_usuarios,)
+        )
+        cursor.execute(
+            """
+            INSERT INTO saldos_mensais_contas (conta_id, mes, saldo_fechamento)
+            SELECT conta_id, mes, SUM(total) OVER (PARTITION BY conta_id ORDER BY mes)
+            FROM (
+                SELECT m.conta_id, date_trunc('month', m.data)::date AS mes, SUM(m.valor) AS total
+                FROM movimentos_bancarios m
+                JOIN contas_bancarias cb ON cb.id = m.conta_id
+                WHERE cb.user_id = ANY(%s)
+                GROUP BY m.conta_id, date_trunc('month', m.data)
+            ) AS totais_mensais
+            """,
+            (ids_usuarios,)
+        )
+        linhas['saldos_mensais_contas'] = cursor.rowcount
+        fase('saldos_mensais_contas', inicio)
+
+    inicio = time.perf_counter()
+    with get_db_cursor(commit=True) as cursor:
+        for tabela in ('users', 'contas_bancarias', 'movimentos_bancarios', 'saldos_mensais_contas',
+                       'movimento_crediario', 'parcelas_crediario', 'crediarios',
+                       'despesas_fixas', 'transacoes', 'contas_pagar', 'tipos_crediario',
+                       'grupo_crediario'):
+            cursor.execute(f'ANALYZE {tabela}')
+    fase('analyze', inicio)
+
+    return {
+        'parametros': {'usuarios': usuarios, 'anos': anos, 'contas': contas,
+                       'movimentos_mes': movimentos_mes, 'compras_mes': compras_mes,
+                       'despesas_mes': despesas_mes, 'prefixo': prefixo, 'semente': semente},
+        'linhas': linhas,
+        'tempos_s': tempos,
+        'total_s': round(sum(tempos.values()), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--usuarios', type=int, default=100)
+    parser.add_argument('--anos', type=int, default=5)
+    parser.add_argument('--contas', type=int, default=2, help='contas bancárias por usuário')
+    parser.add_argument('--movimentos-mes', type=int, default=25, help='movimentos por conta e mês')
+    parser.add_argument('--compras-mes', type=int, default=4, help='compras no crediário por usuário e mês')
+    parser.add_argument('--despesas-mes', type=int, default=6, help='despesas fixas por usuário e mês')
+    parser.add_argument('--prefixo', default=PREFIXO_PADRAO, help='prefixo do login dos usuários gerados')
+    parser.add_argument('--senha', default=SENHA_PADRAO)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--remover', action='store_true',
+                        help='apenas apaga os usuários com o prefixo (e tudo que pertence a eles)')
+    args = parser.parse_args()
+
+    if args.remover:
+        print(f"{_remover(args.prefixo)} usuário(s) removido(s).")
+        return
+
+    print(f"Gerando {args.usuarios} usuário(s) x {args.anos} ano(s)...")
+    resultado = gerar(args.usuarios, args.anos, args.contas, args.movimentos_mes, args.compras_mes,
+                      args.despesas_mes, args.prefixo, args.senha, args.semente)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
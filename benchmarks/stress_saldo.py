@@ -0,0 +1,107 @@
+# benchmarks/stress_saldo.py
+# Dispara lançamentos e exclusões concorrentes (MovimentoBancario.add/delete) nas mesmas
+# contas e confere, ao final, que saldo_atual = saldo_inicial + soma dos movimentos e que
+# nenhuma conta passou do limite de crédito.
+#
+#   python -m benchmarks.stress_saldo --threads 32 --lancamentos 5000
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from benchmarks.comum import criar_usuario_bench, remover_usuario_bench, resumo_latencias
+from config import Config
+from database.db_manager import execute_query
+from models.movimento_bancario_model import MovimentoBancario
+
+
+def _conferir(contas):
+    rows = execute_query(
+        """
+        SELECT c.id, c.saldo_inicial, c.saldo_atual, COALESCE(c.limite_credito, 0),
+               COALESCE(SUM(m.valor), 0)
+        FROM contas_bancarias c
+        LEFT JOIN movimentos_bancarios m ON m.conta_id = c.id
+        WHERE c.id = ANY(%s)
+        GROUP BY c.id
+        ORDER BY c.id
+        """,
+        (contas,), fetchall=True)
+    divergencias = []
+    for conta_id, saldo_inicial, saldo_atual, limite, soma in rows:
+        if saldo_atual != saldo_inicial + soma or saldo_atual < -limite:
+            divergencias.append({'conta_id': conta_id, 'saldo_atual': saldo_atual,
+                                 'esperado': saldo_inicial + soma, 'limite': limite})
+    return divergencias
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--lancamentos', type=int, default=2000)
+    parser.add_argument('--contas', type=int, default=2)
+    parser.add_argument('--exclusoes', type=float, default=0.2,
+                        help='Fração das operações que exclui um lançamento já feito.')
+    args = parser.parse_args()
+
+    Config.DATABASE['pool_max_size'] = max(
+        Config.DATABASE['pool_max_size'], args.threads + 2)
+
+    # saldo baixo e limite pequeno: boa parte dos débitos esbarra no limite durante o teste
+    user_id, contas = criar_usuario_bench(
+        'bench_stress_saldo', num_contas=args.contas, saldo_inicial=500, limite_credito=200)
+    feitos = []
+    latencias = []
+    contagem = {'lancados': 0, 'recusados': 0, 'excluidos': 0, 'erros': 0}
+
+    def _uma(_):
+        inicio = time.perf_counter()
+        if feitos and random.random() < args.exclusoes:
+            try:
+                movimento_id = feitos.pop(random.randrange(len(feitos)))
+            except (IndexError, ValueError):
+                return None
+            MovimentoBancario.delete(movimento_id, user_id)
+            resultado = 'excluidos'
+        else:
+            valor = round(random.uniform(-120, 100), 2)
+            try:
+                movimento = MovimentoBancario.add(
+                    random.choice(contas), date.today(), valor, 'stress saldo')
+                feitos.append(movimento.id)
+                resultado = 'lancados'
+            except ValueError:
+                resultado = 'recusados'
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        return resultado
+
+    try:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            for futuro in [executor.submit(_uma, i) for i in range(args.lancamentos)]:
+                try:
+                    resultado = futuro.result()
+                    if resultado:
+                        contagem[resultado] += 1
+                except Exception:
+                    contagem['erros'] += 1
+        duracao = time.perf_counter() - inicio
+        divergencias = _conferir(contas)
+    finally:
+        remover_usuario_bench(user_id)
+
+    print(json.dumps({
+        'operacoes_por_s': round(sum(contagem.values()) / duracao, 1),
+        'contagem': contagem,
+        'divergencias': divergencias,
+        'latencia': resumo_latencias(latencias)
+    }, indent=2, default=str))
+    if divergencias or contagem['erros']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
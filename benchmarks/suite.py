@@ -0,0 +1,273 @@
+# benchmarks/suite.py
+# Mede os métodos mais usados dos modelos e as rotas principais (pelo cliente de teste do
+# Flask) sobre a massa gerada por benchmarks.gerar_dados. O resultado vai para JSON, com o
+# commit e o volume de dados; --comparar confronta p50/p95 com um resultado anterior e sai
+# com código 1 se algum caso piorar além da tolerância.
+#
+#   python -m benchmarks.gerar_dados --usuarios 1000 --anos 5
+#   python -m benchmarks.suite --saida antes.json
+#   python -m benchmarks.suite --saida depois.json --comparar antes.json
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+
+from dateutil.relativedelta import relativedelta
+
+from benchmarks.comum import resumo_latencias
+from benchmarks.gerar_dados import PREFIXO_PADRAO, SENHA_PADRAO, usuarios_gerados
+from database.db_manager import get_db_cursor
+from models.conta_bancaria_model import ContaBancaria
+from models.crediario_model import Crediario
+from models.despesa_fixa_model import DespesaFixa
+from models.movimento_bancario_model import MovimentoBancario
+from models.movimento_crediario_model import MovimentoCrediario
+from models.transacao_model import Transacao
+from services.cache import lookup_cache
+from services.dinheiro import dinheiro
+from services.projecao import calcular_projecao
+
+# diferenças abaixo disso (ms) são ruído, mesmo que a variação percentual seja grande
+RUIDO_MS = 0.05
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _volume(usuarios):
+    ids = [u[0] for u in usuarios]
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM contas_bancarias WHERE user_id = ANY(%s)),
+                (SELECT COUNT(*) FROM movimentos_bancarios m JOIN contas_bancarias c ON c.id = m.conta_id
+                 WHERE c.user_id = ANY(%s)),
+                (SELECT COUNT(*) FROM movimento_crediario WHERE user_id = ANY(%s)),
+                (SELECT COUNT(*) FROM parcelas_crediario WHERE user_id = ANY(%s)),
+                (SELECT COUNT(*) FROM despesas_fixas WHERE user_id = ANY(%s))
+            """,
+            (ids, ids, ids, ids, ids)
+        )
+        contas, movimentos, compras, parcelas, despesas = cursor.fetchone()
+    return {'usuarios': len(usuarios), 'contas_bancarias': contas,
+            'movimentos_bancarios': movimentos, 'movimento_crediario': compras,
+            'parcelas_crediario': parcelas, 'despesas_fixas': despesas}
+
+
+def _mes_aleatorio(rng, anos):
+    hoje = date.today()
+    mes = date(hoje.year, hoje.month, 1) - relativedelta(months=rng.randrange(anos * 12))
+    return mes.year, mes.month
+
+
+def _casos_modelos(usuarios, rng, anos):
+    # nome -> (preparar, executar): só executar(*preparar()) entra na medição
+    com_duas_contas = [u for u in usuarios if len(u[2]) >= 2]
+
+    def conta_e_mes():
+        return (rng.choice(rng.choice(usuarios)[2]),) + _mes_aleatorio(rng, anos)
+
+    def usuario():
+        return (rng.choice(usuarios)[0],)
+
+    def usuario_sem_cache():
+        lookup_cache.clear()
+        return usuario()
+
+    def usuario_em_cache(funcao):
+        def preparar():
+            argumentos = usuario()
+            funcao(*argumentos)
+            return argumentos
+        return preparar
+
+    def par_de_contas():
+        origem, destino = rng.sample(rng.choice(com_duas_contas)[2], 2)
+        return origem, destino, dinheiro('1.00'), 'Transferência benchmark'
+
+    def usuario_e_inicio():
+        return rng.choice(usuarios)[0], date.today().replace(day=1), 12
+
+    casos = {
+        'MovimentoBancario.get_extrato_mensal': (conta_e_mes, MovimentoBancario.get_extrato_mensal),
+        'MovimentoBancario.get_saldo_inicial_do_mes': (conta_e_mes, MovimentoBancario.get_saldo_inicial_do_mes),
+        'ContaBancaria.get_all_for_user': (usuario, ContaBancaria.get_all_for_user),
+        'Transacao.get_all_for_user[cache]': (usuario_em_cache(Transacao.get_all_for_user), Transacao.get_all_for_user),
+        'Transacao.get_all_for_user[banco]': (usuario_sem_cache, Transacao.get_all_for_user),
+        'Crediario.get_all_for_user[cache]': (usuario_em_cache(Crediario.get_all_for_user), Crediario.get_all_for_user),
+        'Crediario.get_all_for_user[banco]': (usuario_sem_cache, Crediario.get_all_for_user),
+        'DespesaFixa.get_all_for_user': (usuario, DespesaFixa.get_all_for_user),
+        'MovimentoCrediario.get_all_for_user': (usuario, MovimentoCrediario.get_all_for_user),
+        'MovimentoCrediario.get_previsao_parcelas': (usuario_e_inicio, MovimentoCrediario.get_previsao_parcelas),
+        'projecao.calcular_projecao': (usuario, calcular_projecao),
+    }
+    if com_duas_contas:
+        casos['MovimentoBancario.transfer'] = (par_de_contas, MovimentoBancario.transfer)
+    return casos
+
+
+def _casos_rotas(usuarios, rng, anos, senha, sessoes):
+    from app import create_app
+
+    app = create_app()
+    app.config['TESTING'] = True
+    clientes = []
+    for user_id, login, contas in rng.sample(usuarios, min(sessoes, len(usuarios))):
+        cliente = app.test_client()
+        resposta = cliente.post('/login', data={'login': login, 'password': senha})
+        if resposta.status_code != 302:
+            raise RuntimeError(f"Falha no login de {login} (status {resposta.status_code}).")
+        clientes.append((cliente, contas))
+
+    def pagina(caminho):
+        def preparar():
+            cliente, contas = rng.choice(clientes)
+            ano, mes = _mes_aleatorio(rng, anos)
+            return cliente, caminho.format(conta=rng.choice(contas), ano=ano, mes=mes)
+        return preparar
+
+    def obter(cliente, caminho):
+        resposta = cliente.get(caminho)
+        if resposta.status_code != 200:
+            raise RuntimeError(f"GET {caminho}: status {resposta.status_code}")
+        return resposta
+
+    caminhos = {
+        'GET /': '/',
+        'GET /extratos/bancario': '/extratos/bancario?conta_id={conta}&mes_ano={ano}-{mes:02d}',
+        'GET /movimento/lancamento': '/movimento/lancamento',
+        'GET /movimento_crediario/': '/movimento_crediario/',
+        'GET /movimento_crediario/previsao': '/movimento_crediario/previsao',
+        'GET /contas_bancarias/': '/contas_bancarias/',
+        'GET /crediarios/': '/crediarios/',
+        'GET /despesa_fixa/': '/despesa_fixa/',
+    }
+    return {nome: (pagina(caminho), obter) for nome, caminho in caminhos.items()}
+
+
+def _medir(preparar, executar, repeticoes, aquecimento):
+    latencias = []
+    erros = 0
+    for i in range(aquecimento + repeticoes):
+        argumentos = preparar()
+        inicio = time.perf_counter()
+        try:
+            executar(*argumentos)
+        except Exception as e:
+            erros += 1
+            if erros == 1:
+                print(f"    erro: {e}")
+            continue
+        if i >= aquecimento:
+            latencias.append((time.perf_counter() - inicio) * 1000)
+    resumo = resumo_latencias(latencias)
+    resumo['erros'] = erros
+    return resumo
+
+
+def executar_suite(prefixo=PREFIXO_PADRAO, senha=SENHA_PADRAO, repeticoes=200, aquecimento=10,
+                   anos=5, sessoes=5, filtro=None, semente=42, incluir_rotas=True):
+    usuarios = [u for u in usuarios_gerados(prefixo) if u[2]]
+    if not usuarios:
+        raise RuntimeError(
+            f"Nenhum usuário com prefixo '{prefixo}'. Execute antes: python -m benchmarks.gerar_dados")
+    rng = random.Random(semente)
+
+    casos = _casos_modelos(usuarios, rng, anos)
+    if incluir_rotas:
+        casos.update(_casos_rotas(usuarios, rng, anos, senha, sessoes))
+
+    resultados = {}
+    for nome, (preparar, executar) in casos.items():
+        if filtro and filtro not in nome:
+            continue
+        resultados[nome] = _medir(preparar, executar, repeticoes, aquecimento)
+        print(f"  {nome}: p50 {resultados[nome]['p50_ms']} ms, p95 {resultados[nome]['p95_ms']} ms")
+
+    return {
+        'meta': {
+            'commit': _commit_atual(),
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'repeticoes': repeticoes,
+            'aquecimento': aquecimento,
+            'semente': semente,
+            'volume': _volume(usuarios)
+        },
+        'casos': resultados
+    }
+
+
+def comparar(anterior, atual, tolerancia):
+    # devolve os nomes dos casos cujo p50 ou p95 piorou mais que a tolerância
+    regressoes = []
+    print(f"\n{'caso':<48} {'p50 antes':>10} {'p50 agora':>10} {'Δ%':>7} "
+          f"{'p95 antes':>10} {'p95 agora':>10} {'Δ%':>7}")
+    for nome, agora in atual['casos'].items():
+        antes = anterior['casos'].get(nome)
+        if not antes:
+            print(f"{nome:<48} {'(novo)':>10}")
+            continue
+        colunas = []
+        piorou = False
+        for chave in ('p50_ms', 'p95_ms'):
+            variacao = ((agora[chave] - antes[chave]) / antes[chave] * 100) if antes[chave] else 0.0
+            if variacao > tolerancia * 100 and agora[chave] - antes[chave] > RUIDO_MS:
+                piorou = True
+            colunas.append(f"{antes[chave]:>10.3f} {agora[chave]:>10.3f} {variacao:>+6.1f}%")
+        print(f"{nome:<48} {' '.join(colunas)}{'  <- regressão' if piorou else ''}")
+        if piorou:
+            regressoes.append(nome)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--prefixo', default=PREFIXO_PADRAO)
+    parser.add_argument('--senha', default=SENHA_PADRAO)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    parser.add_argument('--aquecimento', type=int, default=10)
+    parser.add_argument('--anos', type=int, default=5, help='meses sorteados para os extratos')
+    parser.add_argument('--sessoes', type=int, default=5, help='usuários logados no cliente de teste')
+    parser.add_argument('--filtro', help='mede só os casos cujo nome contém este texto')
+    parser.add_argument('--sem-rotas', action='store_true')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', help='grava o resultado neste arquivo JSON')
+    parser.add_argument('--comparar', help='resultado JSON anterior para comparação')
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help='piora relativa aceita em p50/p95 (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    resultado = executar_suite(args.prefixo, args.senha, args.repeticoes, args.aquecimento,
+                               args.anos, args.sessoes, args.filtro, args.semente,
+                               not args.sem_rotas)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em {args.saida}")
+    else:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        print(f"Comparando com {args.comparar} (commit {anterior['meta'].get('commit')})")
+        regressoes = comparar(anterior, resultado, args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} caso(s) com regressão acima de {args.tolerancia:.0%}.")
+            sys.exit(1)
+        print("\nNenhuma regressão acima da tolerância.")
+
+
+if __name__ == '__main__':
+    main()
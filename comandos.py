@@ -0,0 +1,85 @@
+# comandos.py
+# Comandos de manutenção (flask --app app <comando>), registrados por create_app()
+# Modelos e serviços são importados dentro de cada comando: create_app() registra todos os
+# comandos, mas um app com poucos blueprints não deve carregar o resto da aplicação.
+import click
+
+
+@click.command('rebuild-saldos-mensais')
+@click.option('--conta-id', type=int, default=None, help='Recalcula apenas esta conta.')
+def rebuild_saldos_mensais_command(conta_id):
+    from models.movimento_bancario_model import MovimentoBancario
+    total = MovimentoBancario.rebuild_saldos_mensais(conta_id)
+    click.echo(f'{total} fechamento(s) mensal(is) recalculado(s).')
+
+
+@click.command('importar-extrato')
+@click.argument('conta_id', type=int)
+@click.argument('arquivo', type=click.Path(exists=True, dir_okay=False))
+def importar_extrato_command(conta_id, arquivo):
+    from models.movimento_bancario_model import MovimentoBancario
+    from services.importacao_extrato import ler_extrato
+    try:
+        with open(arquivo, 'rb') as stream:
+            resultado = MovimentoBancario.importar_lote(
+                conta_id, ler_extrato(stream, arquivo))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(
+        f"{resultado['lidos']} linha(s) lida(s), {resultado['inseridos']} importada(s), "
+        f"{resultado['duplicados']} duplicada(s) ignorada(s).")
+
+
+@click.command('reconciliar-crediarios')
+@click.option('--user-id', type=int, default=None, help='Reconcilia apenas os crediários deste usuário.')
+@click.option('--apenas-verificar', is_flag=True, help='Só relata as divergências, sem corrigir.')
+def reconciliar_crediarios_command(user_id, apenas_verificar):
+    from models.crediario_model import Crediario
+    divergencias = Crediario.reconciliar_saldos(
+        user_id, corrigir=not apenas_verificar)
+    for d in divergencias:
+        click.echo(
+            f"Crediário {d['id']} ({d['crediario']}, usuário {d['user_id']}): "
+            f"registrado R$ {d['registrado']:.2f}, calculado R$ {d['calculado']:.2f}, "
+            f"diferença R$ {d['diferenca']:.2f}")
+    acao = 'encontrada(s)' if apenas_verificar else 'corrigida(s)'
+    click.echo(f'{len(divergencias)} divergência(s) {acao}.')
+
+
+@click.command('db-migrate')
+@click.option('--ate', type=int, default=None, help='Aplica as migrações só até esta versão.')
+@click.option('--status', is_flag=True, help='Mostra a versão do banco sem aplicar nada.')
+def db_migrate_command(ate, status):
+    from database.migrate import migrar, versao_atual, versao_esperada
+    if status:
+        click.echo(
+            f'Versão do banco: {versao_atual()} (última migração: {versao_esperada()}).')
+        return
+    aplicadas = migrar(ate)
+    for versao, nome in aplicadas:
+        click.echo(f'Migração {versao:04d}_{nome} aplicada.')
+    click.echo(f'Banco na versão {versao_atual()}.')
+
+
+@click.command('consultas-lentas')
+@click.option('--limite', type=int, default=10, help='Quantidade de planos, do mais recente.')
+@click.option('--sem-plano', is_flag=True, help='Mostra só origem, duração e SQL.')
+def consultas_lentas_command(limite, sem_plano):
+    from database.consultas_lentas import listar_planos
+    planos = listar_planos(limite)
+    for id_plano, registrada_em, origem, sql, duracao_ms, plano in planos:
+        click.echo(f"#{id_plano} {registrada_em:%Y-%m-%d %H:%M:%S} {duracao_ms} ms em {origem}")
+        click.echo(f"  {sql}")
+        if not sem_plano:
+            click.echo(plano)
+        click.echo('')
+    click.echo(f'{len(planos)} plano(s) registrado(s).')
+
+
+COMANDOS = [
+    rebuild_saldos_mensais_command,
+    importar_extrato_command,
+    reconciliar_crediarios_command,
+    db_migrate_command,
+    consultas_lentas_command,
+]
@@ -12,5 +12,34 @@ class Config:
         'user': os.getenv('DB_USER'),
         'password': os.getenv('DB_PASSWORD'),
         'host': os.getenv('DB_HOST'),
-        'port': os.getenv('DB_PORT')
+        'port': os.getenv('DB_PORT'),
+        # pool de conexões (psycopg_pool)
+        'pool_min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+        'pool_max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+        'pool_max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_check': os.getenv('DB_POOL_CHECK', '1') == '1'
     }
+    # cache do usuário carregado pelo Flask-Login (por processo); update/delete chegam aos
+    # outros workers pelo mesmo NOTIFY do LOOKUP_CACHE_NOTIFY, e o TTL curto limita a
+    # defasagem (senha, is_admin, usuário excluído) quando o ouvinte está desligado ou caído
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))
+    USER_CACHE_MAXSIZE = int(os.getenv('USER_CACHE_MAXSIZE', 1024))
+    # cache das listas de cadastro por usuário (transações, crediários, grupos, tipos, contas a pagar)
+    # com LOOKUP_CACHE_NOTIFY as invalidações chegam aos outros workers por LISTEN/NOTIFY;
+    # desligado, cada processo só vê as próprias gravações e os demais ficam defasados até o TTL
+    LOOKUP_CACHE_TTL = int(os.getenv('LOOKUP_CACHE_TTL', 600))
+    LOOKUP_CACHE_MAXSIZE = int(os.getenv('LOOKUP_CACHE_MAXSIZE', 4096))
+    LOOKUP_CACHE_NOTIFY = os.getenv('LOOKUP_CACHE_NOTIFY', '1') == '1'
+    # projeção de fluxo de caixa exibida na página inicial
+    PROJECAO_MESES = int(os.getenv('PROJECAO_MESES', 12))
+    # instrumentação SQL por requisição (cabeçalho X-SQL-Stats e log); só para diagnóstico
+    SQL_DEBUG = os.getenv('SQL_DEBUG', '0') == '1'
+    # log de comandos acima de SLOW_QUERY_MS (0 desliga); SLOW_QUERY_EXPLAIN_SAMPLE é a fração
+    # das leituras lentas repetidas com EXPLAIN (ANALYZE, BUFFERS) e gravadas em consultas_lentas
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 500))
+    SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE', 0))
+    # métricas no formato Prometheus em /metrics, protegidas por "Authorization: Bearer <METRICS_TOKEN>";
+    # desligadas por padrão, e sem METRICS_TOKEN a rota não é registrada
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '0') == '1'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
@@ -0,0 +1,160 @@
+# database/consultas_lentas.py
+# Log de consultas lentas: todo comando acima de SLOW_QUERY_MS é impresso com a duração, o
+# método do modelo que o chamou e os parâmetros redigidos (só os tipos, nunca os valores).
+# Uma amostra (SLOW_QUERY_EXPLAIN_SAMPLE) das leituras lentas é repetida com
+# EXPLAIN (ANALYZE, BUFFERS) numa thread em segundo plano e o plano fica em consultas_lentas.
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+
+from database.db_manager import get_db_cursor, registrar_ouvinte, remover_ouvinte
+
+# a mesma consulta não é explicada de novo antes deste intervalo
+INTERVALO_EXPLAIN_S = 600
+# planos aguardando a thread; cheia, novas amostras são descartadas
+TAMANHO_FILA = 50
+# teto do EXPLAIN ANALYZE, que executa a consulta de novo
+TIMEOUT_EXPLAIN_MS = 30000
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DIR_DATABASE = os.path.join(_RAIZ, 'database')
+_ESPACOS = re.compile(r'\s+')
+# só leituras: EXPLAIN ANALYZE executa o comando de verdade
+_LEITURA = re.compile(r'(SELECT|WITH)\b', re.IGNORECASE)
+_ESCRITA = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE|SHARE|NEXTVAL|SETVAL)\b', re.IGNORECASE)
+
+_config = {'limite_ms': 0.0, 'amostra': 0.0}
+_fila = queue.Queue(maxsize=TAMANHO_FILA)
+_thread = None
+_thread_lock = threading.Lock()
+_explicadas = {}
+_local = threading.local()
+
+
+def _redigir(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {chave: _tipo(valor) for chave, valor in params.items()}
+    return [_tipo(valor) for valor in params]
+
+
+def _tipo(valor):
+    if isinstance(valor, (list, tuple)):
+        return f'<{type(valor).__name__}[{len(valor)}]>'
+    return f'<{type(valor).__name__}>'
+
+
+def _origem():
+    # primeiro quadro da pilha que é código da aplicação fora de database/
+    # (modelo, serviço ou rota que disparou o comando)
+    quadro = sys._getframe(1)
+    while quadro is not None:
+        arquivo = os.path.abspath(quadro.f_code.co_filename)
+        if arquivo.startswith(_RAIZ) and not arquivo.startswith(_DIR_DATABASE):
+            nome = getattr(quadro.f_code, 'co_qualname', quadro.f_code.co_name)
+            return f'{nome} ({os.path.relpath(arquivo, _RAIZ)}:{quadro.f_lineno})'
+        quadro = quadro.f_back
+    return 'desconhecida'
+
+
+def _ouvinte(evento):
+    if evento['tipo'] != 'consulta' or getattr(_local, 'explicando', False):
+        return
+    if evento['duracao_ms'] < _config['limite_ms'] or not evento['sql']:
+        return
+
+    sql = _ESPACOS.sub(' ', evento['sql']).strip()
+    origem = _origem()
+    print(f"[SQL LENTA] {evento['duracao_ms']:.1f} ms em {origem}: {sql[:500]} "
+          f"| parâmetros: {_redigir(evento['params'])}")
+
+    if _config['amostra'] and random.random() < _config['amostra']:
+        _agendar_explain(evento['sql'], evento['params'], origem, evento['duracao_ms'])
+
+
+def _agendar_explain(sql, params, origem, duracao_ms):
+    # o texto original vai para o EXPLAIN (comentários "--" dependem das quebras de linha)
+    sql = sql.strip()
+    if not _LEITURA.match(sql) or _ESCRITA.search(sql):
+        return
+    agora = time.monotonic()
+    with _thread_lock:
+        chave = _ESPACOS.sub(' ', sql)
+        if agora - _explicadas.get(chave, -INTERVALO_EXPLAIN_S) < INTERVALO_EXPLAIN_S:
+            return
+        if len(_explicadas) > 1000:
+            _explicadas.clear()
+        _explicadas[chave] = agora
+        _iniciar_thread()
+    try:
+        _fila.put_nowait((sql, params, origem, duracao_ms))
+    except queue.Full:
+        pass
+
+
+def _iniciar_thread():
+    global _thread
+    if _thread is None or not _thread.is_alive():
+        _thread = threading.Thread(target=_trabalhador, name='explain-consultas-lentas', daemon=True)
+        _thread.start()
+
+
+def _trabalhador():
+    # os comandos desta thread não passam pelo log (o próprio EXPLAIN seria "lento")
+    _local.explicando = True
+    while True:
+        sql, params, origem, duracao_ms = _fila.get()
+        try:
+            capturar_plano(sql, params, origem, duracao_ms)
+        except Exception as e:
+            print(f"Erro ao capturar o plano da consulta lenta: {e}")
+
+
+def capturar_plano(sql, params, origem, duracao_ms):
+    # o EXPLAIN roda numa transação desfeita ao final; o plano é gravado em outra
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT set_config('statement_timeout', %s, true)", (str(TIMEOUT_EXPLAIN_MS),))
+        cursor.execute('EXPLAIN (ANALYZE, BUFFERS) ' + sql, params)
+        plano = '\n'.join(row[0] for row in cursor.fetchall())
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            """
+            INSERT INTO consultas_lentas (origem, sql, duracao_ms, plano)
+            VALUES (%s, %s, %s, %s) RETURNING id
+            """,
+            (origem[:255], _ESPACOS.sub(' ', sql), round(duracao_ms, 3), plano)
+        )
+        return cursor.fetchone()[0]
+
+
+def listar_planos(limite=20):
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT id, registrada_em, origem, sql, duracao_ms, plano
+            FROM consultas_lentas
+            ORDER BY registrada_em DESC, id DESC
+            LIMIT %s
+            """,
+            (limite,)
+        )
+        return cursor.fetchall()
+
+
+def ativar(limite_ms, amostra=0.0):
+    # limite_ms <= 0 desliga o log; amostra: fração (0 a 1) das leituras lentas explicadas
+    _config['limite_ms'] = float(limite_ms)
+    _config['amostra'] = min(max(float(amostra), 0.0), 1.0)
+    if _config['limite_ms'] > 0:
+        registrar_ouvinte(_ouvinte)
+    else:
+        remover_ouvinte(_ouvinte)
+
+
+def desativar():
+    ativar(0)
@@ -1,20 +1,115 @@
 # database/bd_manager.py
+import atexit
+import threading
+import time
+
 import psycopg
-from psycopg.errors import OperationalError, UniqueViolation, UndefinedTable
+from psycopg.errors import OperationalError, UniqueViolation
+from psycopg.pq import TransactionStatus
+from psycopg_pool import ConnectionPool
 from config import Config
 from contextlib import contextmanager
 
 
-def get_db_connection():
+_pool = None
+_pool_lock = threading.Lock()
+_pool_wait = {
+    'acquisitions': 0,
+    'wait_total_ms': 0.0,
+    'wait_max_ms': 0.0
+}
+# funções chamadas a cada comando executado e a cada conexão obtida do pool
+# (instrumentação por requisição, métricas); recebem um dict com 'tipo'
+_ouvintes = []
+
+
+def registrar_ouvinte(funcao):
+    if funcao not in _ouvintes:
+        _ouvintes.append(funcao)
+
+
+def remover_ouvinte(funcao):
+    if funcao in _ouvintes:
+        _ouvintes.remove(funcao)
+
+
+def _notificar(evento):
+    for funcao in list(_ouvintes):
+        try:
+            funcao(evento)
+        except Exception as e:
+            print(f"Erro em ouvinte do banco de dados: {e}")
+
+
+def _texto_sql(query, cursor):
+    if isinstance(query, str):
+        return query
+    if isinstance(query, bytes):
+        return query.decode('utf-8', 'replace')
+    try:
+        return query.as_string(cursor)
+    except Exception:
+        return repr(query)
+
+
+class _InstrumentacaoMixin:
+    # mede cada execute/executemany e avisa os ouvintes (nada é medido sem ouvintes)
+    def execute(self, query, params=None, **kwargs):
+        if not _ouvintes:
+            return super().execute(query, params, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            self._avisar(query, params, inicio)
+
+    def executemany(self, query, params_seq, **kwargs):
+        if not _ouvintes:
+            return super().executemany(query, params_seq, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(query, params_seq, **kwargs)
+        finally:
+            self._avisar(query, None, inicio)
+
+    def _avisar(self, query, params, inicio):
+        _notificar({
+            'tipo': 'consulta',
+            'sql': _texto_sql(query, self),
+            'params': params,
+            'duracao_ms': (time.perf_counter() - inicio) * 1000,
+            'linhas': self.rowcount
+        })
+
+
+class CursorInstrumentado(_InstrumentacaoMixin, psycopg.Cursor):
+    pass
+
+
+class ServerCursorInstrumentado(_InstrumentacaoMixin, psycopg.ServerCursor):
+    pass
+
+
+def _configurar_conexao(conn):
+    conn.cursor_factory = CursorInstrumentado
+    conn.server_cursor_factory = ServerCursorInstrumentado
+
+
+def _connection_kwargs():
     db_config = Config.DATABASE
+    return {
+        'dbname': db_config['dbname'],
+        'user': db_config['user'],
+        'password': db_config['password'],
+        'host': db_config['host'],
+        'port': db_config['port']
+    }
+
+
+def get_db_connection():
     try:
-        conn = psycopg.connect(
-            dbname=db_config['dbname'],
-            user=db_config['user'],
-            password=db_config['password'],
-            host=db_config['host'],
-            port=db_config['port']
-        )
+        conn = psycopg.connect(**_connection_kwargs())
+        _configurar_conexao(conn)
         return conn
     except OperationalError as e:
         print(f"Erro ao conectar ao PostgreSQL: {e}")
@@ -22,18 +117,90 @@ def get_db_connection():
             "Não foi possível conectar ao banco de dados.") from e
 
 
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                db_config = Config.DATABASE
+                _pool = ConnectionPool(
+                    kwargs=_connection_kwargs(),
+                    configure=_configurar_conexao,
+                    min_size=db_config.get('pool_min_size', 2),
+                    max_size=db_config.get('pool_max_size', 10),
+                    max_idle=db_config.get('pool_max_idle', 300),
+                    timeout=db_config.get('pool_timeout', 30),
+                    check=ConnectionPool.check_connection if db_config.get(
+                        'pool_check', True) else None,
+                    name='finance_pool',
+                    open=True
+                )
+    return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+atexit.register(close_pool)
+
+
+def get_pool_stats():
+    stats = dict(_pool_wait)
+    stats['wait_avg_ms'] = (
+        stats['wait_total_ms'] / stats['acquisitions']) if stats['acquisitions'] else 0.0
+    if _pool is not None:
+        stats.update(_pool.get_stats())
+    return stats
+
+
+def _acquire_connection():
+    start = time.perf_counter()
+    try:
+        conn = get_pool().getconn()
+    except OperationalError as e:
+        print(f"Erro ao obter conexão do pool: {e}")
+        raise RuntimeError(
+            "Não foi possível conectar ao banco de dados.") from e
+    wait_ms = (time.perf_counter() - start) * 1000
+    with _pool_lock:
+        _pool_wait['acquisitions'] += 1
+        _pool_wait['wait_total_ms'] += wait_ms
+        if wait_ms > _pool_wait['wait_max_ms']:
+            _pool_wait['wait_max_ms'] = wait_ms
+    if _ouvintes:
+        _notificar({'tipo': 'conexao', 'espera_ms': wait_ms})
+    return conn
+
+
+def _release_connection(conn):
+    try:
+        if not conn.closed and conn.info.transaction_status != TransactionStatus.IDLE:
+            conn.rollback()
+    except Exception as e:
+        print(f"Erro ao devolver conexão ao pool: {e}")
+    get_pool().putconn(conn)
+
+
 @contextmanager
-def get_db_cursor(commit=False):
+def get_db_cursor(commit=False, name=None, row_factory=None):
+    # name: cria um cursor do lado do servidor (as linhas são buscadas em lotes de cursor.itersize)
+    # row_factory: forma das linhas (psycopg.rows.args_row(Modelo), dict_row...); padrão: tuplas
     conn = None
     cursor = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        conn = _acquire_connection()
+        opcoes = {'row_factory': row_factory} if row_factory else {}
+        cursor = conn.cursor(name=name, **opcoes) if name else conn.cursor(**opcoes)
         yield cursor
         if commit:
             conn.commit()
     except Exception as e:
-        if conn:
+        if conn and not conn.closed:
             conn.rollback()
         print(f"Erro na transação do banco de dados: {e}")
         raise
@@ -41,12 +208,12 @@ def get_db_cursor(commit=False):
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            _release_connection(conn)
 
 
-def execute_query(query, params=None, fetchone=False, fetchall=False, commit=False):
+def execute_query(query, params=None, fetchone=False, fetchall=False, commit=False, row_factory=None):
     try:
-        with get_db_cursor(commit=commit) as cursor:
+        with get_db_cursor(commit=commit, row_factory=row_factory) as cursor:
             cursor.execute(query, params)
             if fetchone:
                 return cursor.fetchone()
@@ -63,98 +230,3 @@ def execute_query(query, params=None, fetchone=False, fetchall=False, commit=Fal
     except Exception as e:
         print(f"Erro inesperado ao executar consulta: {e}")
         raise
-
-
-def check_and_update_table_constraints():
-    try:
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = 'users' AND column_name = 'password_hash';
-            """)
-            if not cursor.fetchone():
-                print("Adicionando coluna 'password_hash' à tabela 'users'...")
-                cursor.execute(
-                    "ALTER TABLE users ADD COLUMN password_hash VARCHAR(255);")
-                print("Coluna 'password_hash' adicionada à tabela 'users'.")
-
-            cursor.execute("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = 'users' AND column_name = 'is_active';
-            """)
-            if not cursor.fetchone():
-                print("Adicionando coluna 'is_active' à tabela 'users'...")
-                cursor.execute(
-                    "ALTER TABLE users ADD COLUMN is_active BOOLEAN DEFAULT TRUE;")
-                print("Coluna 'is_active' adicionada à tabela 'users'.")
-
-            cursor.execute("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = 'users' AND column_name = 'is_admin';
-            """)
-            if not cursor.fetchone():
-                print("Adicionando coluna 'is_admin' à tabela 'users'...")
-                cursor.execute(
-                    "ALTER TABLE users ADD COLUMN is_admin BOOLEAN DEFAULT FALSE;")
-                print("Coluna 'is_admin' adicionada à tabela 'users'.")
-
-            cursor.execute("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = 'contas_bancarias' AND column_name = 'saldo_atual';
-            """)
-            if not cursor.fetchone():
-                print("Adicionando coluna 'saldo_atual' à tabela 'contas_bancarias'...")
-                cursor.execute(
-                    "ALTER TABLE contas_bancarias ADD COLUMN NUMERIC(15, 2) NOT NULL DEFAULT 0.0;")
-                print("Coluna 'saldo_atual' adicionada à tabela 'contas_bancarias'.")
-
-            cursor.execute("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = 'contas_bancarias' AND column_name = 'limite_credito';
-            """)
-            if not cursor.fetchone():
-                print(
-                    "Adicionando coluna 'limite_credito' à tabela 'contas_bancarias'...")
-                cursor.execute(
-                    "ALTER TABLE contas_bancarias ADD COLUMN limite_credito NUMERIC(15, 2) NULL;")
-                print("Coluna 'limite_credito' adicionada à tabela 'contas_bancarias'.")
-
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables
-                    WHERE table_schema = 'public' AND table_name = 'tipos_crediario'
-                );
-            """)
-            if cursor.fetchone()[0]:
-                cursor.execute("""
-                    SELECT column_name FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'tipos_crediario' AND column_name = 'user_id';
-                """)
-                if not cursor.fetchone():
-                    print("Adicionando coluna 'user_id' à tabela 'tipos_crediario'...")
-                    cursor.execute(
-                        "ALTER TABLE tipos_crediario ADD COLUMN user_id INTEGER;")
-                    cursor.execute(
-                        "ALTER TABLE tipos_crediario ADD CONSTRAINT fk_user_id_tipos_crediario FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;")
-                    print(
-                        "Coluna 'user_id' e FK adicionadas à tabela 'tipos_crediario'.")
-
-                cursor.execute("""
-                    SELECT conname FROM pg_constraint
-                    WHERE conrelid = 'public.tipos_crediario'::regclass AND contype = 'u' AND conkey = ARRAY[
-                        (SELECT attnum FROM pg_attribute WHERE attrelid = 'public.tipos_crediario'::regclass AND attname = 'user_id'),
-                        (SELECT attnum FROM pg_attribute WHERE attrelid = 'public.tipos_crediario'::regclass AND attname = 'nome_tipo')
-                    ];
-                """)
-                if not cursor.fetchone():
-                    print(
-                        "Adicionando UNIQUE constraint (user_id, nome_tipo) à tabela 'tipos_crediario'...")
-                    cursor.execute(
-                        "ALTER TABLE tipos_crediario ADD CONSTRAINT unique_user_tipo UNIQUE (user_id, nome_tipo);")
-                    print("UNIQUE constraint adicionada à tabela 'tipos_crediario'.")
-
-    except UndefinedTable:
-        print("Aviso: Alguma tabela não existe ao tentar verificar/atualizar constraints. Isso é normal se o 'create_table()' for executado primeiro.")
-    except Exception as e:
-        print(
-            f"Erro inesperado durante a verificação/correção das constraints: {e}")
@@ -0,0 +1,83 @@
+# database/migrate.py
+import os
+import re
+
+from database.db_manager import get_db_cursor
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+# chave do pg_advisory_xact_lock: dois processos não aplicam a mesma migração ao mesmo tempo
+LOCK_MIGRACOES = 7260117
+
+_PADRAO_ARQUIVO = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+
+def listar_migracoes():
+    # [(versao, nome, caminho)] em ordem de versão, a partir de database/migrations/NNNN_nome.sql
+    migracoes = []
+    for arquivo in sorted(os.listdir(MIGRATIONS_DIR)):
+        encontrado = _PADRAO_ARQUIVO.match(arquivo)
+        if encontrado:
+            migracoes.append((int(encontrado.group(1)), encontrado.group(2),
+                              os.path.join(MIGRATIONS_DIR, arquivo)))
+    versoes = [versao for versao, _, _ in migracoes]
+    if len(versoes) != len(set(versoes)):
+        raise RuntimeError("Há mais de uma migração com o mesmo número.")
+    return migracoes
+
+
+def versao_esperada():
+    migracoes = listar_migracoes()
+    return migracoes[-1][0] if migracoes else 0
+
+
+def _versao_atual(cursor):
+    cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL;")
+    if not cursor.fetchone()[0]:
+        return 0
+    cursor.execute("SELECT COALESCE(MAX(versao), 0) FROM schema_version;")
+    return cursor.fetchone()[0]
+
+
+def versao_atual():
+    with get_db_cursor() as cursor:
+        return _versao_atual(cursor)
+
+
+def verificar_versao():
+    # chamada na inicialização: uma consulta ao banco, nenhuma alteração de esquema
+    atual = versao_atual()
+    esperada = versao_esperada()
+    if atual < esperada:
+        raise RuntimeError(
+            f"Banco de dados desatualizado (versão {atual}, esperada {esperada}). "
+            "Execute: flask --app app db-migrate")
+    return atual
+
+
+def migrar(ate=None):
+    # aplica as migrações pendentes, cada uma na própria transação junto com o registro
+    # em schema_version; devolve [(versao, nome)] aplicadas
+    aplicadas = []
+    for versao, nome, caminho in listar_migracoes():
+        if ate is not None and versao > ate:
+            break
+        with open(caminho, encoding='utf-8') as arquivo:
+            sql = arquivo.read()
+
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s);", (LOCK_MIGRACOES,))
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    versao INTEGER PRIMARY KEY,
+                    nome VARCHAR(255) NOT NULL,
+                    aplicada_em TIMESTAMP NOT NULL DEFAULT NOW()
+                );
+            """)
+            if _versao_atual(cursor) >= versao:
+                continue
+            print(f"Aplicando migração {versao:04d}_{nome}...")
+            cursor.execute(sql)
+            cursor.execute(
+                "INSERT INTO schema_version (versao, nome) VALUES (%s, %s);", (versao, nome))
+        aplicadas.append((versao, nome))
+    return aplicadas
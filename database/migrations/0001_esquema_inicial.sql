@@ -0,0 +1,108 @@
+-- database/migrations/0001_esquema_inicial.sql
+-- Tabelas originalmente criadas pelos create_table() dos modelos. IF NOT EXISTS permite
+-- adotar o controle de versão em bancos que já existiam antes do schema_version.
+
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    login VARCHAR(80) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    is_admin BOOLEAN DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS contas_bancarias (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    nome_banco VARCHAR(100) NOT NULL,
+    agencia INTEGER NOT NULL,
+    numero_conta VARCHAR(50) NOT NULL,
+    tipo_conta VARCHAR(20) NOT NULL,
+    saldo_inicial NUMERIC(15, 2) NOT NULL,
+    saldo_atual NUMERIC(15, 2) NOT NULL,
+    limite_credito NUMERIC(15, 2) NULL,
+    UNIQUE(agencia, numero_conta, tipo_conta),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS contas_pagar (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    conta VARCHAR(100) NOT NULL,
+    tipo VARCHAR(100) NOT NULL CHECK (tipo IN ('Receita', 'Despesa')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE(user_id, conta, tipo)
+);
+
+CREATE TABLE IF NOT EXISTS crediarios (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    crediario VARCHAR(100) NOT NULL,
+    tipo VARCHAR(100) NOT NULL,
+    final INTEGER NOT NULL,
+    limite NUMERIC(10, 2) NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE(user_id, crediario, final)
+);
+
+CREATE TABLE IF NOT EXISTS transacoes (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    transacao VARCHAR(100) NOT NULL,
+    tipo VARCHAR(10) NOT NULL CHECK (tipo IN ('Entrada', 'Saída')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE (user_id, transacao, tipo)
+);
+
+CREATE TABLE IF NOT EXISTS movimentos_bancarios (
+    id SERIAL PRIMARY KEY,
+    conta_id INTEGER NOT NULL,
+    data DATE NOT NULL,
+    valor NUMERIC(15, 2) NOT NULL,
+    descricao VARCHAR(255) NOT NULL,
+    FOREIGN KEY (conta_id) REFERENCES contas_bancarias(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS tipos_crediario (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    nome_tipo VARCHAR(100) NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE (user_id, nome_tipo)
+);
+
+CREATE TABLE IF NOT EXISTS grupo_crediario (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    grupo VARCHAR(255) NOT NULL,
+    tipo VARCHAR (10) NOT NULL CHECK (tipo IN ('Compra', 'Estorno')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE (user_id, grupo, tipo)
+);
+
+CREATE TABLE IF NOT EXISTS movimento_crediario (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    data_compra DATE NOT NULL,
+    descricao VARCHAR(255) NOT NULL,
+    id_grupo_crediario INTEGER NOT NULL,
+    id_crediario INTEGER NOT NULL,
+    valor_total DECIMAL(10, 2) NOT NULL,
+    num_parcelas INTEGER NOT NULL,
+    primeira_parcela DATE NOT NULL,
+    ultima_parcela DATE NOT NULL,
+    valor_parcela_mensal DECIMAL(10, 2) NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (id_grupo_crediario) REFERENCES grupo_crediario(id) ON DELETE RESTRICT,
+    FOREIGN KEY (id_crediario) REFERENCES crediarios(id) ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS despesas_fixas (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    descricao VARCHAR(100) NOT NULL,
+    mes_ano DATE NOT NULL,
+    valor DECIMAL(10, 2) NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE(user_id, descricao, mes_ano)
+);
@@ -0,0 +1,9 @@
+-- database/migrations/0002_colunas_users_contas.sql
+-- Colunas que check_and_update_table_constraints() acrescentava a bancos antigos.
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS password_hash VARCHAR(255);
+ALTER TABLE users ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS is_admin BOOLEAN DEFAULT FALSE;
+
+ALTER TABLE contas_bancarias ADD COLUMN IF NOT EXISTS saldo_atual NUMERIC(15, 2) NOT NULL DEFAULT 0.0;
+ALTER TABLE contas_bancarias ADD COLUMN IF NOT EXISTS limite_credito NUMERIC(15, 2) NULL;
@@ -0,0 +1,28 @@
+-- database/migrations/0003_tipos_crediario_usuario.sql
+-- tipos_crediario antigos não tinham user_id nem a unicidade (user_id, nome_tipo).
+
+ALTER TABLE tipos_crediario ADD COLUMN IF NOT EXISTS user_id INTEGER;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'tipos_crediario'::regclass AND contype = 'f'
+          AND confrelid = 'users'::regclass
+    ) THEN
+        ALTER TABLE tipos_crediario ADD CONSTRAINT fk_user_id_tipos_crediario
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'tipos_crediario'::regclass AND contype = 'u'
+          AND conkey = ARRAY[
+              (SELECT attnum FROM pg_attribute WHERE attrelid = 'tipos_crediario'::regclass AND attname = 'user_id'),
+              (SELECT attnum FROM pg_attribute WHERE attrelid = 'tipos_crediario'::regclass AND attname = 'nome_tipo')
+          ]::smallint[]
+    ) THEN
+        ALTER TABLE tipos_crediario ADD CONSTRAINT unique_user_tipo UNIQUE (user_id, nome_tipo);
+    END IF;
+END
+$$;
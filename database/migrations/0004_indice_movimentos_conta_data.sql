@@ -0,0 +1,5 @@
+-- database/migrations/0004_indice_movimentos_conta_data.sql
+-- Extrato mensal, paginação e saldo inicial filtram por conta e faixa de datas.
+
+CREATE INDEX IF NOT EXISTS idx_movimentos_bancarios_conta_data
+ON movimentos_bancarios (conta_id, data, id);
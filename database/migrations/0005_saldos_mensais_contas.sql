@@ -0,0 +1,21 @@
+-- database/migrations/0005_saldos_mensais_contas.sql
+-- Fechamento mensal acumulado por conta, mantido pelos lançamentos. Bancos com
+-- histórico recebem os fechamentos calculados a partir dos movimentos existentes.
+
+CREATE TABLE IF NOT EXISTS saldos_mensais_contas (
+    conta_id INTEGER NOT NULL,
+    mes DATE NOT NULL,
+    saldo_fechamento NUMERIC(15, 2) NOT NULL,
+    PRIMARY KEY (conta_id, mes),
+    FOREIGN KEY (conta_id) REFERENCES contas_bancarias(id) ON DELETE CASCADE
+);
+
+INSERT INTO saldos_mensais_contas (conta_id, mes, saldo_fechamento)
+SELECT conta_id, mes, SUM(total) OVER (PARTITION BY conta_id ORDER BY mes)
+FROM (
+    SELECT conta_id, date_trunc('month', data)::date AS mes, SUM(valor) AS total
+    FROM movimentos_bancarios
+    GROUP BY conta_id, date_trunc('month', data)
+) AS totais_mensais
+WHERE NOT EXISTS (SELECT 1 FROM saldos_mensais_contas)
+ON CONFLICT (conta_id, mes) DO NOTHING;
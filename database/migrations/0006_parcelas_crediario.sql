@@ -0,0 +1,30 @@
+-- database/migrations/0006_parcelas_crediario.sql
+-- Uma linha por parcela de cada movimento de crediário; a última parcela absorve a
+-- diferença de arredondamento. Movimentos existentes recebem o cronograma aqui.
+
+CREATE TABLE IF NOT EXISTS parcelas_crediario (
+    id SERIAL PRIMARY KEY,
+    id_movimento_crediario INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    numero INTEGER NOT NULL,
+    mes_referencia DATE NOT NULL,
+    valor DECIMAL(10, 2) NOT NULL,
+    pago BOOLEAN NOT NULL DEFAULT FALSE,
+    FOREIGN KEY (id_movimento_crediario) REFERENCES movimento_crediario(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE (id_movimento_crediario, numero)
+);
+
+CREATE INDEX IF NOT EXISTS idx_parcelas_crediario_user_mes
+ON parcelas_crediario (user_id, mes_referencia);
+
+INSERT INTO parcelas_crediario (id_movimento_crediario, user_id, numero, mes_referencia, valor)
+SELECT mc.id, mc.user_id, n.numero,
+       (mc.primeira_parcela + (n.numero - 1) * INTERVAL '1 month')::date,
+       CASE WHEN n.numero = mc.num_parcelas
+            THEN mc.valor_total - mc.valor_parcela_mensal * (mc.num_parcelas - 1)
+            ELSE mc.valor_parcela_mensal
+       END
+FROM movimento_crediario mc
+CROSS JOIN LATERAL generate_series(1, mc.num_parcelas) AS n(numero)
+ON CONFLICT (id_movimento_crediario, numero) DO NOTHING;
@@ -0,0 +1,17 @@
+-- database/migrations/0007_crediarios_saldo_aberto.sql
+-- Saldo em aberto por crediário (parcelas não pagas; estornos abatem), mantido pelos
+-- lançamentos de crediário. Calculado aqui uma vez para os dados existentes.
+
+ALTER TABLE crediarios ADD COLUMN IF NOT EXISTS saldo_aberto NUMERIC(12, 2) NOT NULL DEFAULT 0;
+
+UPDATE crediarios c SET saldo_aberto = calculo.saldo
+FROM (
+    SELECT mc.id_crediario,
+           SUM(CASE WHEN gc.tipo = 'Estorno' THEN -p.valor ELSE p.valor END) AS saldo
+    FROM parcelas_crediario p
+    JOIN movimento_crediario mc ON p.id_movimento_crediario = mc.id
+    JOIN grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+    WHERE p.pago = FALSE
+    GROUP BY mc.id_crediario
+) AS calculo
+WHERE c.id = calculo.id_crediario;
@@ -0,0 +1,14 @@
+-- database/migrations/0008_consultas_lentas.sql
+-- Planos (EXPLAIN ANALYZE, BUFFERS) capturados por amostragem das consultas lentas.
+
+CREATE TABLE IF NOT EXISTS consultas_lentas (
+    id SERIAL PRIMARY KEY,
+    registrada_em TIMESTAMP NOT NULL DEFAULT NOW(),
+    origem VARCHAR(255) NOT NULL,
+    sql TEXT NOT NULL,
+    duracao_ms NUMERIC(12, 3) NOT NULL,
+    plano TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_consultas_lentas_registrada_em
+ON consultas_lentas (registrada_em);
@@ -0,0 +1,34 @@
+-- database/migrations/0009_parcelas_sem_valor_negativo.sql
+-- Com o arredondamento antigo a última parcela recebia valor_total - parcela * (n - 1) e podia
+-- ficar zerada ou negativa (0,35 em 10 parcelas: nove de 0,04 e a última de -0,01). Esses
+-- movimentos passam à regra atual de _gerar_parcelas: o resto da divisão em centavos vai, um
+-- centavo para cada, nas primeiras parcelas. O status "pago" das parcelas é mantido.
+
+CREATE TEMPORARY TABLE movimentos_corrigidos AS
+SELECT DISTINCT mc.id, mc.id_crediario
+FROM movimento_crediario mc
+JOIN parcelas_crediario p ON p.id_movimento_crediario = mc.id
+WHERE mc.valor_total > 0 AND p.valor <= 0;
+
+UPDATE parcelas_crediario p
+SET valor = (floor(mc.valor_total * 100 / mc.num_parcelas)
+             + CASE WHEN p.numero <= mod(mc.valor_total * 100, mc.num_parcelas) THEN 1 ELSE 0 END) / 100
+FROM movimento_crediario mc
+WHERE p.id_movimento_crediario = mc.id
+  AND mc.id IN (SELECT id FROM movimentos_corrigidos);
+
+UPDATE movimento_crediario
+SET valor_parcela_mensal = ceil(valor_total * 100 / num_parcelas) / 100
+WHERE id IN (SELECT id FROM movimentos_corrigidos);
+
+UPDATE crediarios c
+SET saldo_aberto = COALESCE((
+    SELECT SUM(CASE WHEN gc.tipo = 'Estorno' THEN -p.valor ELSE p.valor END)
+    FROM parcelas_crediario p
+    JOIN movimento_crediario mc ON p.id_movimento_crediario = mc.id
+    JOIN grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+    WHERE mc.id_crediario = c.id AND p.pago = FALSE
+), 0)
+WHERE c.id IN (SELECT id_crediario FROM movimentos_corrigidos);
+
+DROP TABLE movimentos_corrigidos;
@@ -1,49 +1,32 @@
 # models/contas_pagar_model.py
 from database.db_manager import execute_query
 from psycopg.errors import UniqueViolation
+from psycopg.rows import args_row
+from services.cache import lookup_cache
 
 
 class ContasPagar:
+    __slots__ = ('id', 'conta', 'tipo', 'user_id')
+
     def __init__(self, id, conta, tipo, user_id):
         self.id = id
         self.conta = conta
         self.tipo = tipo
         self.user_id = user_id
 
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS contas_pagar (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL, 
-            conta VARCHAR(100) NOT NULL,
-            tipo VARCHAR(100) NOT NULL CHECK (tipo IN ('Receita', 'Despesa')),
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE, 
-            UNIQUE(user_id, conta, tipo) 
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(
-                f"ERRO CRÍTICO ao criar/verificar tabela 'contas_pagar': {e}")
-            raise
-
     @staticmethod
     def get_all_for_user(user_id):
         query = "SELECT id, conta, tipo, user_id FROM contas_pagar WHERE user_id = %s ORDER BY tipo DESC, conta ASC;"
-        rows = execute_query(query, (user_id,), fetchall=True)
-        if rows:
-            return [ContasPagar(row[0], row[1], row[2], row[3]) for row in rows]
-        return []
+        rows = lookup_cache.get_or_load(
+            'contas_pagar', user_id,
+            lambda: execute_query(query, (user_id,), fetchall=True, row_factory=args_row(ContasPagar)))
+        return list(rows) if rows else []
 
     @staticmethod
     def get_by_id(conta_id, user_id):
         query = "SELECT id, conta, tipo, user_id FROM contas_pagar WHERE id = %s AND user_id = %s;"
-        row = execute_query(query, (conta_id, user_id), fetchone=True)
-        if row:
-            return ContasPagar(row[0], row[1], row[2], row[3])
-        return None
+        row = execute_query(query, (conta_id, user_id), fetchone=True, row_factory=args_row(ContasPagar))
+        return row if row else None
 
     @staticmethod
     def add(conta, tipo, user_id):
@@ -54,6 +37,7 @@ class ContasPagar:
         try:
             result = execute_query(query, (conta, tipo, user_id),
                                    fetchone=True, commit=True)
+            lookup_cache.invalidate('contas_pagar', user_id)
             if result:
                 return ContasPagar(result[0], conta, tipo, user_id)
             return None
@@ -73,6 +57,7 @@ class ContasPagar:
         try:
             execute_query(
                 query, (conta_val, tipo, conta_id, user_id), commit=True)
+            lookup_cache.invalidate('contas_pagar', user_id)
             return ContasPagar.get_by_id(conta_id, user_id)
         except UniqueViolation:
             raise ValueError(
@@ -85,4 +70,5 @@ class ContasPagar:
     def delete(conta_id, user_id):
         query = "DELETE FROM contas_pagar WHERE id = %s AND user_id = %s;"
         execute_query(query, (conta_id, user_id), commit=True)
+        lookup_cache.invalidate('contas_pagar', user_id)
         return True
@@ -1,52 +1,39 @@
 # models/crediario_model.py
-from database.db_manager import execute_query
+from database.db_manager import execute_query, get_db_cursor
 from psycopg.errors import UniqueViolation
+from psycopg.rows import args_row
+from services.cache import lookup_cache
+from services.dinheiro import ZERO
 
 
 class Crediario:
-    def __init__(self, id, crediario, tipo, final, limite, user_id):
+    __slots__ = ('id', 'crediario', 'tipo', 'final', 'limite', 'user_id', 'saldo_aberto',
+                 'limite_disponivel')
+
+    def __init__(self, id, crediario, tipo, final, limite, user_id, saldo_aberto=ZERO):
         self.id = id
         self.crediario = crediario
         self.tipo = tipo
         self.final = final
         self.limite = limite
-        self.user_id = user_id 
-
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS crediarios (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL, -- Campo para vincular ao usuário
-            crediario VARCHAR(100) NOT NULL,
-            tipo VARCHAR(100) NOT NULL,
-            final INTEGER NOT NULL,
-            limite NUMERIC(10, 2) NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE, -- Chave estrangeira
-            UNIQUE(user_id, crediario, final) -- Unicidade por usuário, crediario e final
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(f"ERRO CRÍTICO ao criar/verificar tabela 'crediarios': {e}")
-            raise
+        self.user_id = user_id
+        # soma das parcelas ainda não pagas (estornos abatem), mantida pelos lançamentos
+        self.saldo_aberto = saldo_aberto
+        self.limite_disponivel = self.limite - self.saldo_aberto
 
     @staticmethod
     def get_all_for_user(user_id):
-        query = "SELECT id, crediario, tipo, final, limite, user_id FROM crediarios WHERE user_id = %s ORDER BY crediario ASC;"
-        rows = execute_query(query, (user_id,), fetchall=True)
-        if rows:
-            return [Crediario(row[0], row[1], row[2], row[3], float(row[4]), row[5]) for row in rows]
-        return []
+        query = "SELECT id, crediario, tipo, final, limite, user_id, saldo_aberto FROM crediarios WHERE user_id = %s ORDER BY crediario ASC;"
+        rows = lookup_cache.get_or_load(
+            'crediarios', user_id,
+            lambda: execute_query(query, (user_id,), fetchall=True, row_factory=args_row(Crediario)))
+        return list(rows) if rows else []
 
     @staticmethod
     def get_by_id(crediario_id, user_id):
-        query = "SELECT id, crediario, tipo, final, limite, user_id FROM crediarios WHERE id = %s AND user_id = %s;"
-        row = execute_query(query, (crediario_id, user_id), fetchone=True)
-        if row:
-            return Crediario(row[0], row[1], row[2], row[3], float(row[4]), row[5])
-        return None
+        query = "SELECT id, crediario, tipo, final, limite, user_id, saldo_aberto FROM crediarios WHERE id = %s AND user_id = %s;"
+        row = execute_query(query, (crediario_id, user_id), fetchone=True, row_factory=args_row(Crediario))
+        return row if row else None
 
     @staticmethod
     def add(crediario, tipo, final, limite, user_id):
@@ -54,6 +41,7 @@ class Crediario:
         try:
             result = execute_query(
                 query, (crediario, tipo, final, limite, user_id), fetchone=True, commit=True)
+            lookup_cache.invalidate('crediarios', user_id)
             if result:
                 return Crediario(result[0], crediario, tipo, final, limite, user_id)
             return None
@@ -70,6 +58,7 @@ class Crediario:
         try:
             execute_query(query, (crediario_val, tipo, final,
                           limite, crediario_id, user_id), commit=True)
+            lookup_cache.invalidate('crediarios', user_id)
             return Crediario.get_by_id(crediario_id, user_id)
         except UniqueViolation:
             raise ValueError(
@@ -82,4 +71,64 @@ class Crediario:
     def delete(crediario_id, user_id):
         query = "DELETE FROM crediarios WHERE id = %s AND user_id = %s;"
         execute_query(query, (crediario_id, user_id), commit=True)
+        lookup_cache.invalidate('crediarios', user_id)
         return True
+
+    @staticmethod
+    def reconciliar_saldos(user_id=None, corrigir=True):
+        # recalcula saldo_aberto a partir das parcelas em aberto e devolve as divergências
+        # encontradas (crediário, valor registrado, valor calculado)
+        filtro = 'WHERE c.user_id = %s' if user_id is not None else ''
+        params = (user_id,) if user_id is not None else ()
+        calculo = f"""
+        SELECT
+            c.id,
+            c.user_id,
+            c.crediario,
+            c.saldo_aberto AS registrado,
+            COALESCE(SUM(CASE WHEN gc.tipo = 'Estorno' THEN -p.valor ELSE p.valor END)
+                     FILTER (WHERE p.pago = FALSE), 0) AS calculado
+        FROM
+            crediarios c
+        LEFT JOIN
+            movimento_crediario mc ON mc.id_crediario = c.id
+        LEFT JOIN
+            grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+        LEFT JOIN
+            parcelas_crediario p ON p.id_movimento_crediario = mc.id
+        {filtro}
+        GROUP BY
+            c.id, c.user_id, c.crediario, c.saldo_aberto
+        """
+        with get_db_cursor(commit=corrigir) as cursor:
+            if corrigir:
+                # trava os crediários para que nenhum lançamento altere o saldo durante o cálculo
+                cursor.execute(
+                    f"SELECT c.id FROM crediarios c {filtro} ORDER BY c.id FOR UPDATE;", params)
+                cursor.execute(
+                    f"""
+                    WITH calculo AS ({calculo})
+                    UPDATE crediarios c SET saldo_aberto = calculo.calculado
+                    FROM calculo
+                    WHERE c.id = calculo.id AND calculo.registrado <> calculo.calculado
+                    RETURNING c.id, c.user_id, c.crediario, calculo.registrado, calculo.calculado;
+                    """,
+                    params
+                )
+            else:
+                cursor.execute(
+                    f"SELECT * FROM ({calculo}) calculo WHERE registrado <> calculado;", params)
+            rows = cursor.fetchall()
+
+        divergencias = []
+        for row in rows:
+            lookup_cache.invalidate('crediarios', row[1])
+            divergencias.append({
+                'id': row[0],
+                'user_id': row[1],
+                'crediario': row[2],
+                'registrado': row[3],
+                'calculado': row[4],
+                'diferenca': row[4] - row[3]
+            })
+        return divergencias
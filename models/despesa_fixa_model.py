@@ -1,10 +1,13 @@
 # models/despesa_fixa_model.py
 from database.db_manager import execute_query
 from psycopg.errors import UniqueViolation
+from psycopg.rows import args_row
 from datetime import date
 
 
 class DespesaFixa:
+    __slots__ = ('id', 'user_id', 'descricao', 'mes_ano', 'valor')
+
     def __init__(self, id, user_id, descricao, mes_ano, valor):
         self.id = id
         self.user_id = user_id
@@ -12,26 +15,6 @@ class DespesaFixa:
         self.mes_ano = mes_ano
         self.valor = valor
 
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS despesas_fixas (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL,
-            descricao VARCHAR(100) NOT NULL,
-            mes_ano DATE NOT NULL,
-            valor DECIMAL(10, 2) NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-            UNIQUE(user_id, descricao, mes_ano)
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(
-                f"ERRO CRÍTICO ao criar/verificar tabela 'despesas_fixas': {e}")
-            raise
-
     @staticmethod
     def get_all_for_user(user_id):
         query = """
@@ -40,10 +23,8 @@ class DespesaFixa:
         WHERE user_id = %s
         ORDER BY mes_ano DESC, descricao ASC;
         """
-        rows = execute_query(query, (user_id,), fetchall=True)
-        if rows:
-            return [DespesaFixa(row[0], row[1], row[2], row[3], row[4]) for row in rows]
-        return []
+        rows = execute_query(query, (user_id,), fetchall=True, row_factory=args_row(DespesaFixa))
+        return rows if rows else []
 
     @staticmethod
     def get_by_id(despesa_id, user_id):
@@ -52,10 +33,8 @@ class DespesaFixa:
         FROM despesas_fixas
         WHERE id = %s AND user_id = %s;
         """
-        row = execute_query(query, (despesa_id, user_id), fetchone=True)
-        if row:
-            return DespesaFixa(row[0], row[1], row[2], row[3], row[4])
-        return None
+        row = execute_query(query, (despesa_id, user_id), fetchone=True, row_factory=args_row(DespesaFixa))
+        return row if row else None
 
     @staticmethod
     def add(user_id, descricao, mes_ano, valor):
@@ -1,50 +1,32 @@
 # models/grupo_crediario_model.py
-from database.db_manager import execute_query
+from database.db_manager import execute_query, get_db_cursor
 from psycopg.errors import UniqueViolation
+from psycopg.rows import args_row
+from services.cache import lookup_cache
 
 
 class GrupoCrediario():
+    __slots__ = ('id', 'grupo', 'tipo', 'user_id')
+
     def __init__(self, id, grupo, tipo, user_id):
         self.id = id
         self.grupo = grupo
         self.tipo = tipo
         self.user_id = user_id
 
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS grupo_crediario (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL,
-            grupo VARCHAR(255) NOT NULL,
-            tipo VARCHAR (10) NOT NULL CHECK (tipo IN ('Compra', 'Estorno')),
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-            UNIQUE (user_id, grupo, tipo)
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(
-                f"ERRO CRÍTICO ao criar/verificar tabela 'grupo_crediario': {e}")
-            raise
-
     @staticmethod
     def get_all_for_user(user_id):
         query = "SELECT id, grupo, tipo, user_id FROM grupo_crediario WHERE user_id = %s ORDER BY grupo ASC;"
-        rows = execute_query(query, (user_id,), fetchall=True)
-
-        if rows:
-            return [GrupoCrediario(row[0], row[1], row[2], row[3]) for row in rows]
-        return []
+        rows = lookup_cache.get_or_load(
+            'grupo_crediario', user_id,
+            lambda: execute_query(query, (user_id,), fetchall=True, row_factory=args_row(GrupoCrediario)))
+        return list(rows) if rows else []
 
     @staticmethod
     def get_by_id(grupo_id, user_id):
         query = "SELECT id, grupo, tipo, user_id FROM grupo_crediario WHERE id = %s AND user_id = %s;"
-        row = execute_query(query, (grupo_id, user_id), fetchone=True)
-        if row:
-            return GrupoCrediario(row[0], row[1], row[2], row[3])
-        return None
+        row = execute_query(query, (grupo_id, user_id), fetchone=True, row_factory=args_row(GrupoCrediario))
+        return row if row else None
 
     @staticmethod
     def add(grupo, tipo, user_id):
@@ -55,6 +37,7 @@ class GrupoCrediario():
         try:
             result = execute_query(
                 query, (grupo, tipo, user_id), fetchone=True, commit=True)
+            lookup_cache.invalidate('grupo_crediario', user_id)
             if result:
                 return GrupoCrediario(result[0], grupo, tipo, user_id)
             return None
@@ -70,10 +53,48 @@ class GrupoCrediario():
         if tipo not in ('Compra', 'Estorno'):
             raise ValueError(
                 "Grupo de Crediário inválido. Deve ser 'Compra' ou 'Estorno'.")
-        query = "UPDATE grupo_crediario SET grupo = %s, tipo = %s WHERE id = %s AND user_id = %s;"
         try:
-            execute_query(
-                query, (grupo, tipo, grupo_id, user_id), commit=True)
+            with get_db_cursor(commit=True) as cursor:
+                # NO KEY UPDATE: não bloqueia lançamentos que só referenciam o grupo (FK)
+                cursor.execute(
+                    "SELECT tipo FROM grupo_crediario WHERE id = %s AND user_id = %s FOR NO KEY UPDATE;",
+                    (grupo_id, user_id))
+                atual = cursor.fetchone()
+                if not atual:
+                    return None
+                trocou_tipo = atual[0] != tipo
+                if trocou_tipo:
+                    # mesma ordem de bloqueio dos lançamentos de crediário (por id)
+                    cursor.execute(
+                        """
+                        SELECT id FROM crediarios
+                        WHERE id IN (SELECT id_crediario FROM movimento_crediario WHERE id_grupo_crediario = %s)
+                        ORDER BY id FOR UPDATE;
+                        """,
+                        (grupo_id,))
+                cursor.execute(
+                    "UPDATE grupo_crediario SET grupo = %s, tipo = %s WHERE id = %s AND user_id = %s;",
+                    (grupo, tipo, grupo_id, user_id))
+                if trocou_tipo:
+                    # Compra <-> Estorno inverte o sinal das parcelas em aberto do grupo:
+                    # o saldo muda em duas vezes a soma delas
+                    cursor.execute(
+                        """
+                        UPDATE crediarios c
+                        SET saldo_aberto = c.saldo_aberto + %s * parcelas.valor
+                        FROM (
+                            SELECT mc.id_crediario, SUM(p.valor) AS valor
+                            FROM parcelas_crediario p
+                            JOIN movimento_crediario mc ON p.id_movimento_crediario = mc.id
+                            WHERE mc.id_grupo_crediario = %s AND p.pago = FALSE
+                            GROUP BY mc.id_crediario
+                        ) parcelas
+                        WHERE c.id = parcelas.id_crediario;
+                        """,
+                        (-2 if tipo == 'Estorno' else 2, grupo_id))
+            lookup_cache.invalidate('grupo_crediario', user_id)
+            if trocou_tipo:
+                lookup_cache.invalidate('crediarios', user_id)
             return GrupoCrediario.get_by_id(grupo_id, user_id)
         except UniqueViolation:
             raise ValueError(
@@ -86,4 +107,5 @@ class GrupoCrediario():
     def delete(grupo_id, user_id):
         query = "DELETE FROM grupo_crediario WHERE id = %s AND user_id = %s;"
         execute_query(query, (grupo_id, user_id), commit=True)
+        lookup_cache.invalidate('grupo_crediario', user_id)
         return True
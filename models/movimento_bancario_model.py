@@ -1,164 +1,541 @@
 # models/movimento_bancario_model.py
 from database.db_manager import execute_query, get_db_cursor
-from datetime import datetime
-from models.conta_bancaria_model import ContaBancaria
+from datetime import date, datetime
+import base64
+from psycopg.rows import args_row
+from services.dinheiro import ZERO, dinheiro
+
+
+def _intervalo_do_mes(ano, mes):
+    inicio = date(ano, mes, 1)
+    fim = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    return inicio, fim
 
 
 class MovimentoBancario:
-    def __init__(self, id, conta_id, data, valor, descricao):
+    # extratos e históricos montam milhares destes objetos: __slots__ dispensa o __dict__ por
+    # instância. Como nos demais modelos, as linhas viram objetos via args_row, com as colunas
+    # do SELECT na ordem do construtor (class_row monta um dict de argumentos por linha e
+    # é mais lento; ver benchmarks/bench_hidratacao.py)
+    __slots__ = ('id', 'conta_id', 'data', 'valor', 'descricao', 'tipo', 'saldo_acumulado')
+
+    def __init__(self, id, conta_id, data, valor, descricao, saldo_acumulado=None):
         self.id = id
         self.conta_id = conta_id
         self.data = data
         self.valor = valor
         self.descricao = descricao
         self.tipo = 'receita' if valor >= 0 else 'despesa'
+        self.saldo_acumulado = saldo_acumulado
 
     @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS movimentos_bancarios (
-            id SERIAL PRIMARY KEY,
-            conta_id INTEGER NOT NULL,
-            data DATE NOT NULL,
-            valor NUMERIC(15, 2) NOT NULL,
-            descricao VARCHAR(255) NOT NULL,
-            FOREIGN KEY (conta_id) REFERENCES contas_bancarias(id) ON DELETE CASCADE
-        );
-        """
+    def add(conta_id, data, valor, descricao):
+        valor = dinheiro(valor)
         try:
-            execute_query(query, commit=True)
+            with get_db_cursor(commit=True) as cursor:
+                movimento_id, _ = MovimentoBancario.add_internal(
+                    cursor, conta_id, data, valor, descricao)
+            return MovimentoBancario(movimento_id, conta_id, data, valor, descricao)
         except Exception as e:
-            print(
-                f"ERRO CRÍTICO ao criar/verificar tabela 'movimentos_bancarios': {e}")
-            raise
+            raise e
 
     @staticmethod
-    def add(conta_id, data, valor, descricao):
-        try:
-            with get_db_cursor(commit=True) as cursor:
-                conta = ContaBancaria.get_by_id(conta_id)
-                if not conta:
-                    raise ValueError("Conta bancária não encontrada.")
+    def transfer(conta_origem_id, conta_destino_id, valor, descricao):
+        valor = dinheiro(valor)
+        if valor <= 0:
+            raise ValueError("O valor da transferência deve ser positivo.")
 
-                novo_saldo = conta.saldo_atual + valor
+        conta_origem_id = int(conta_origem_id)
+        conta_destino_id = int(conta_destino_id)
+        if conta_origem_id == conta_destino_id:
+            raise ValueError(
+                "Conta de origem e conta de destino não podem ser a mesma.")
 
-                if valor < 0:
-                    if novo_saldo < 0 and (conta.limite_credito is None or abs(novo_saldo) > conta.limite_credito):
+        data = datetime.now().date()
+        try:
+            with get_db_cursor(commit=True) as cursor:
+                # bloqueia as duas contas sempre na mesma ordem (id) para evitar deadlock
+                cursor.execute(
+                    """
+                    SELECT id, nome_banco, tipo_conta, numero_conta, saldo_atual, limite_credito
+                    FROM contas_bancarias
+                    WHERE id IN (%s, %s)
+                    ORDER BY id
+                    FOR UPDATE
+                    """,
+                    (conta_origem_id, conta_destino_id)
+                )
+                contas = {row[0]: row for row in cursor.fetchall()}
+                for conta_id in (conta_origem_id, conta_destino_id):
+                    if conta_id not in contas:
                         raise ValueError(
-                            f"Saldo insuficiente na conta [{conta.nome_banco} | {conta.tipo_conta} | {conta.numero_conta}] ou limite de crédito excedido.")
+                            f"Conta bancária com ID {conta_id} não encontrada para lançamento interno.")
+
+                _, nome_banco, tipo_conta, numero_conta, saldo_atual, limite_credito = contas[
+                    conta_origem_id]
+                novo_saldo = saldo_atual - valor
+                if novo_saldo < 0 and (limite_credito is None or abs(novo_saldo) > limite_credito):
+                    raise ValueError(
+                        f"Saldo insuficiente na conta [{nome_banco} | {tipo_conta} | {numero_conta}] ou limite de crédito excedido.")
 
                 cursor.execute(
-                    'INSERT INTO movimentos_bancarios (conta_id, data, valor, descricao) VALUES (%s, %s, %s, %s) RETURNING id',
-                    (conta_id, data, valor, descricao)
+                    """
+                    INSERT INTO movimentos_bancarios (conta_id, data, valor, descricao)
+                    VALUES (%s, %s, %s, %s), (%s, %s, %s, %s)
+                    """,
+                    (conta_origem_id, data, -valor, descricao,
+                     conta_destino_id, data, valor, descricao)
                 )
-                movimento_id = cursor.fetchone()[0]
-
                 cursor.execute(
-                    'UPDATE contas_bancarias SET saldo_atual = %s WHERE id = %s',
-                    (novo_saldo, conta_id)
+                    """
+                    UPDATE contas_bancarias
+                    SET saldo_atual = saldo_atual + CASE WHEN id = %s THEN %s::numeric ELSE %s::numeric END
+                    WHERE id IN (%s, %s)
+                    """,
+                    (conta_origem_id, -valor, valor,
+                     conta_origem_id, conta_destino_id)
                 )
-                return MovimentoBancario(movimento_id, conta_id, data, valor, descricao)
+                MovimentoBancario._registrar_saldo_mensal(
+                    cursor, conta_origem_id, data, -valor)
+                MovimentoBancario._registrar_saldo_mensal(
+                    cursor, conta_destino_id, data, valor)
+            return True
         except Exception as e:
             raise e
 
     @staticmethod
-    def transfer(conta_origem_id, conta_destino_id, valor, descricao):
-        if valor <= 0:
-            raise ValueError("O valor da transferência deve ser positivo.")
+    def add_lote(user_id, itens):
+        # itens: dicts com conta_id, data, valor, descricao e, nas transferências,
+        # conta_destino_id. Tudo é validado contra os saldos travados antes de gravar;
+        # com qualquer erro nada é lançado e a lista de erros (índice, mensagem) é devolvida.
+        contas_ids = sorted({int(item['conta_id']) for item in itens} |
+                            {int(item['conta_destino_id']) for item in itens if item.get('conta_destino_id')})
+        erros = []
+        pernas = []
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(
+                """
+                SELECT id, nome_banco, tipo_conta, numero_conta, saldo_atual, limite_credito
+                FROM contas_bancarias
+                WHERE id = ANY(%s) AND user_id = %s
+                ORDER BY id
+                FOR UPDATE
+                """,
+                (contas_ids, user_id)
+            )
+            contas = {row[0]: row for row in cursor.fetchall()}
+            saldos = {conta_id: row[4] for conta_id, row in contas.items()}
 
-        try:
-            with get_db_cursor(commit=True) as cursor:
-                MovimentoBancario.add_internal(
-                    cursor, conta_origem_id, datetime.now().date(), -valor, descricao)
+            for indice, item in enumerate(itens):
+                conta_id = int(item['conta_id'])
+                destino_id = int(item['conta_destino_id']) if item.get(
+                    'conta_destino_id') else None
+                valor = dinheiro(item['valor'])
+                try:
+                    for id_ in (conta_id, destino_id):
+                        if id_ is not None and id_ not in contas:
+                            raise ValueError(
+                                f"Conta bancária com ID {id_} não encontrada ou não pertence ao usuário.")
+                    if destino_id is not None:
+                        if valor <= 0:
+                            raise ValueError(
+                                "O valor da transferência deve ser positivo.")
+                        if destino_id == conta_id:
+                            raise ValueError(
+                                "Conta de origem e conta de destino não podem ser a mesma.")
+                        movimentos = [(conta_id, -valor), (destino_id, valor)]
+                    else:
+                        movimentos = [(conta_id, valor)]
 
-                MovimentoBancario.add_internal(
-                    cursor, conta_destino_id, datetime.now().date(), valor, descricao)
+                    # confere o limite na ordem do lote, sobre o saldo já com os itens anteriores
+                    _, nome_banco, tipo_conta, numero_conta, _, limite_credito = contas[conta_id]
+                    novo_saldo = saldos[conta_id] + movimentos[0][1]
+                    if movimentos[0][1] < 0 and novo_saldo < -(limite_credito or 0):
+                        raise ValueError(
+                            f"Saldo insuficiente na conta [{nome_banco} | {tipo_conta} | {numero_conta}] ou limite de crédito excedido.")
+                except ValueError as e:
+                    erros.append({'indice': indice, 'erro': str(e)})
+                    continue
 
-                return True
-        except Exception as e:
-            raise e
+                for id_, valor_perna in movimentos:
+                    saldos[id_] += valor_perna
+                    pernas.append(
+                        (id_, item['data'], valor_perna, item['descricao']))
+
+            if erros:
+                return {'lancados': 0, 'erros': erros}
+
+            cursor.executemany(
+                'INSERT INTO movimentos_bancarios (conta_id, data, valor, descricao) VALUES (%s, %s, %s, %s) RETURNING id',
+                pernas, returning=True
+            )
+            movimento_ids = []
+            while True:
+                movimento_ids.append(cursor.fetchone()[0])
+                if not cursor.nextset():
+                    break
+
+            # um único UPDATE para todas as contas e um ajuste de fechamento por conta/mês
+            deltas = {}
+            meses = {}
+            for conta_id, data, valor, _ in pernas:
+                deltas[conta_id] = deltas.get(conta_id, 0) + valor
+                chave = (conta_id, date(data.year, data.month, 1))
+                meses[chave] = meses.get(chave, 0) + valor
+            cursor.execute(
+                """
+                UPDATE contas_bancarias c
+                SET saldo_atual = c.saldo_atual + v.delta
+                FROM unnest(%s::int[], %s::numeric[]) AS v(id, delta)
+                WHERE c.id = v.id
+                """,
+                (list(deltas), list(deltas.values()))
+            )
+            for (conta_id, mes), valor in sorted(meses.items()):
+                MovimentoBancario._registrar_saldo_mensal(
+                    cursor, conta_id, mes, valor)
+
+        return {'lancados': len(itens), 'movimentos': movimento_ids, 'erros': []}
 
     @staticmethod
     def add_internal(cursor, conta_id, data, valor, descricao):
-        conta = ContaBancaria.get_by_id(
-            conta_id)
+        # o UPDATE trava a linha da conta, confere o limite e aplica o valor num único comando;
+        # sem linha afetada, a conta não existe ou o débito passaria do limite de crédito
+        cursor.execute(
+            """
+            UPDATE contas_bancarias
+            SET saldo_atual = saldo_atual + %s::numeric
+            WHERE id = %s
+              AND (%s::numeric >= 0 OR saldo_atual + %s::numeric >= -COALESCE(limite_credito, 0))
+            RETURNING user_id
+            """,
+            (valor, conta_id, valor, valor)
+        )
+        conta = cursor.fetchone()
         if not conta:
-            raise ValueError(
-                f"Conta bancária com ID {conta_id} não encontrada para lançamento interno.")
-
-        novo_saldo = conta.saldo_atual + valor
-
-        if valor < 0:
-            if novo_saldo < 0 and (conta.limite_credito is None or abs(novo_saldo) > conta.limite_credito):
+            cursor.execute(
+                'SELECT nome_banco, tipo_conta, numero_conta FROM contas_bancarias WHERE id = %s',
+                (conta_id,)
+            )
+            dados = cursor.fetchone()
+            if not dados:
                 raise ValueError(
-                    f"Saldo insuficiente na conta [{conta.nome_banco} | {conta.tipo_conta} | {conta.numero_conta}] ou limite de crédito excedido.")
+                    f"Conta bancária com ID {conta_id} não encontrada para lançamento interno.")
+            nome_banco, tipo_conta, numero_conta = dados
+            raise ValueError(
+                f"Saldo insuficiente na conta [{nome_banco} | {tipo_conta} | {numero_conta}] ou limite de crédito excedido.")
 
         cursor.execute(
-            'INSERT INTO movimentos_bancarios (conta_id, data, valor, descricao) VALUES (%s, %s, %s, %s)',
+            'INSERT INTO movimentos_bancarios (conta_id, data, valor, descricao) VALUES (%s, %s, %s, %s) RETURNING id',
             (conta_id, data, valor, descricao)
         )
+        movimento_id = cursor.fetchone()[0]
+        MovimentoBancario._registrar_saldo_mensal(
+            cursor, conta_id, data, valor)
+        return movimento_id, conta[0]
+
+    @staticmethod
+    def _registrar_saldo_mensal(cursor, conta_id, data, valor):
+        # mantém saldos_mensais_contas: cria/ajusta o fechamento do mês do lançamento
+        # e propaga o valor para os fechamentos dos meses seguintes (lançamentos retroativos)
+        mes = date(data.year, data.month, 1)
+        cursor.execute(
+            """
+            INSERT INTO saldos_mensais_contas (conta_id, mes, saldo_fechamento)
+            VALUES (%s, %s, COALESCE((
+                SELECT saldo_fechamento FROM saldos_mensais_contas
+                WHERE conta_id = %s AND mes < %s
+                ORDER BY mes DESC LIMIT 1
+            ), 0) + %s::numeric)
+            ON CONFLICT (conta_id, mes) DO UPDATE
+            SET saldo_fechamento = saldos_mensais_contas.saldo_fechamento + %s::numeric
+            """,
+            (conta_id, mes, conta_id, mes, valor, valor)
+        )
+        cursor.execute(
+            'UPDATE saldos_mensais_contas SET saldo_fechamento = saldo_fechamento + %s::numeric WHERE conta_id = %s AND mes > %s',
+            (valor, conta_id, mes)
+        )
+
+    @staticmethod
+    def _recalcular_saldos_mensais(cursor, conta_id=None, desde=None):
+        # recalcula os fechamentos (de uma conta ou de todas) a partir do mês "desde",
+        # partindo do último fechamento anterior a ele
+        condicoes = []
+        params = []
+        if conta_id is not None:
+            condicoes.append('conta_id = %s')
+            params.append(conta_id)
+        if desde is not None:
+            desde = date(desde.year, desde.month, 1)
+            condicoes.append('data >= %s')
+            params.append(desde)
+        where_movimentos = ('WHERE ' + ' AND '.join(condicoes)) if condicoes else ''
+        where_saldos = where_movimentos.replace('data >=', 'mes >=')
+
+        cursor.execute(
+            f'DELETE FROM saldos_mensais_contas {where_saldos}', params)
         cursor.execute(
-            'UPDATE contas_bancarias SET saldo_atual = %s WHERE id = %s',
-            (novo_saldo, conta_id)
+            f"""
+            INSERT INTO saldos_mensais_contas (conta_id, mes, saldo_fechamento)
+            SELECT conta_id, mes,
+                   SUM(total) OVER (PARTITION BY conta_id ORDER BY mes) + COALESCE((
+                       SELECT s.saldo_fechamento FROM saldos_mensais_contas s
+                       WHERE s.conta_id = totais_mensais.conta_id AND s.mes < totais_mensais.primeiro_mes
+                       ORDER BY s.mes DESC LIMIT 1
+                   ), 0)
+            FROM (
+                SELECT conta_id, date_trunc('month', data)::date AS mes, SUM(valor) AS total,
+                       MIN(date_trunc('month', data)::date) OVER (PARTITION BY conta_id) AS primeiro_mes
+                FROM movimentos_bancarios
+                {where_movimentos}
+                GROUP BY conta_id, date_trunc('month', data)
+            ) AS totais_mensais
+            """,
+            params
         )
+        return cursor.rowcount
+
+    @staticmethod
+    def rebuild_saldos_mensais(conta_id=None):
+        with get_db_cursor(commit=True) as cursor:
+            if conta_id is not None:
+                cursor.execute(
+                    'SELECT id FROM contas_bancarias WHERE id = %s FOR UPDATE', (conta_id,))
+            else:
+                cursor.execute(
+                    'SELECT id FROM contas_bancarias ORDER BY id FOR UPDATE')
+            return MovimentoBancario._recalcular_saldos_mensais(cursor, conta_id)
+
+    @staticmethod
+    def importar_lote(conta_id, registros):
+        # registros: iterável de (data, valor, descricao). As linhas vão por COPY para uma
+        # tabela temporária; duplicatas (mesma data/valor/descrição já lançadas na conta)
+        # são descartadas e o restante entra num único INSERT ... SELECT.
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(
+                'SELECT user_id FROM contas_bancarias WHERE id = %s FOR UPDATE', (conta_id,))
+            conta = cursor.fetchone()
+            if not conta:
+                raise ValueError("Conta bancária não encontrada.")
+
+            cursor.execute("""
+                CREATE TEMP TABLE staging_movimentos (
+                    ordem BIGSERIAL,
+                    data DATE NOT NULL,
+                    valor NUMERIC(15, 2) NOT NULL,
+                    descricao VARCHAR(255) NOT NULL
+                ) ON COMMIT DROP
+            """)
+            with cursor.copy('COPY staging_movimentos (data, valor, descricao) FROM STDIN') as copy:
+                for registro in registros:
+                    copy.write_row(registro)
+
+            cursor.execute('SELECT COUNT(*) FROM staging_movimentos')
+            lidos = cursor.fetchone()[0]
+            if not lidos:
+                return {'lidos': 0, 'inseridos': 0, 'duplicados': 0, 'valor_total': ZERO}
+
+            # a n-ésima ocorrência de (data, valor, descricao) no arquivo só entra se a conta
+            # tiver menos de n lançamentos iguais (reimportar o mesmo arquivo não duplica nada)
+            cursor.execute(
+                """
+                WITH numerados AS (
+                    SELECT ordem, data, valor, descricao,
+                           ROW_NUMBER() OVER (PARTITION BY data, valor, descricao ORDER BY ordem) AS ocorrencia
+                    FROM staging_movimentos
+                ),
+                existentes AS (
+                    SELECT data, valor, descricao, COUNT(*) AS quantidade
+                    FROM movimentos_bancarios
+                    WHERE conta_id = %s
+                      AND data >= (SELECT MIN(data) FROM staging_movimentos)
+                      AND data <= (SELECT MAX(data) FROM staging_movimentos)
+                    GROUP BY data, valor, descricao
+                ),
+                inseridos AS (
+                    INSERT INTO movimentos_bancarios (conta_id, data, valor, descricao)
+                    SELECT %s, n.data, n.valor, n.descricao
+                    FROM numerados n
+                    LEFT JOIN existentes e
+                      ON e.data = n.data AND e.valor = n.valor AND e.descricao = n.descricao
+                    WHERE n.ocorrencia > COALESCE(e.quantidade, 0)
+                    ORDER BY n.ordem
+                    RETURNING data, valor
+                )
+                SELECT COUNT(*), COALESCE(SUM(valor), 0), MIN(data) FROM inseridos
+                """,
+                (conta_id, conta_id)
+            )
+            inseridos, valor_total, data_inicial = cursor.fetchone()
+
+            if inseridos:
+                cursor.execute(
+                    'UPDATE contas_bancarias SET saldo_atual = saldo_atual + %s WHERE id = %s',
+                    (valor_total, conta_id)
+                )
+                MovimentoBancario._recalcular_saldos_mensais(
+                    cursor, conta_id, desde=data_inicial)
+
+        return {
+            'lidos': lidos,
+            'inseridos': inseridos,
+            'duplicados': lidos - inseridos,
+            'valor_total': valor_total
+        }
 
     @staticmethod
     def get_all_by_conta(conta_id):
         query = 'SELECT id, conta_id, data, valor, descricao FROM movimentos_bancarios WHERE conta_id = %s ORDER BY data DESC, id DESC'
-        rows = execute_query(query, (conta_id,), fetchall=True)
-        return [MovimentoBancario(row[0], row[1], row[2], float(row[3]), row[4]) for row in rows] if rows else []
+        rows = execute_query(query, (conta_id,), fetchall=True,
+                             row_factory=args_row(MovimentoBancario))
+        return rows if rows else []
 
     @staticmethod
-    def get_extrato_mensal(conta_id, ano, mes):
+    def _codificar_cursor(data, movimento_id):
+        token = f'{data.isoformat()}|{movimento_id}'.encode()
+        return base64.urlsafe_b64encode(token).decode().rstrip('=')
+
+    @staticmethod
+    def _decodificar_cursor(cursor_token):
+        try:
+            token = cursor_token + '=' * (-len(cursor_token) % 4)
+            data_str, movimento_id = base64.urlsafe_b64decode(
+                token.encode()).decode().split('|')
+            return date.fromisoformat(data_str), int(movimento_id)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError("Cursor de paginação inválido.") from e
+
+    @staticmethod
+    def get_page_by_conta(conta_id, limite=50, cursor_token=None):
+        # paginação por chave (data DESC, id DESC): o custo de cada página não depende da posição
+        if cursor_token:
+            data, movimento_id = MovimentoBancario._decodificar_cursor(
+                cursor_token)
+            query = '''
+            SELECT id, conta_id, data, valor, descricao FROM movimentos_bancarios
+            WHERE conta_id = %s AND (data, id) < (%s, %s)
+            ORDER BY data DESC, id DESC
+            LIMIT %s
+            '''
+            params = (conta_id, data, movimento_id, limite + 1)
+        else:
+            query = '''
+            SELECT id, conta_id, data, valor, descricao FROM movimentos_bancarios
+            WHERE conta_id = %s
+            ORDER BY data DESC, id DESC
+            LIMIT %s
+            '''
+            params = (conta_id, limite + 1)
+
+        rows = execute_query(query, params, fetchall=True,
+                             row_factory=args_row(MovimentoBancario)) or []
+        movimentos = rows[:limite]
+        proximo_cursor = None
+        if len(rows) > limite:
+            ultimo = movimentos[-1]
+            proximo_cursor = MovimentoBancario._codificar_cursor(
+                ultimo.data, ultimo.id)
+        return movimentos, proximo_cursor
+
+    @staticmethod
+    def iter_by_conta(conta_id, tamanho_lote=1000):
+        query = 'SELECT id, conta_id, data, valor, descricao FROM movimentos_bancarios WHERE conta_id = %s ORDER BY data DESC, id DESC'
+        with get_db_cursor(name='movimentos_por_conta', row_factory=args_row(MovimentoBancario)) as cursor:
+            cursor.itersize = tamanho_lote
+            cursor.execute(query, (conta_id,))
+            yield from cursor
+
+    @staticmethod
+    def iter_extrato_periodo(conta_id, inicio, fim, tamanho_lote=2000):
+        # linhas (data, descricao, valor, saldo) de [inicio, fim) direto de um cursor do servidor
         query = '''
-        SELECT id, conta_id, data, valor, descricao
+        SELECT data, descricao, valor,
+               COALESCE((
+                   SELECT saldo_fechamento FROM saldos_mensais_contas
+                   WHERE conta_id = %s AND mes < %s
+                   ORDER BY mes DESC LIMIT 1
+               ), 0) + SUM(valor) OVER (ORDER BY data ASC, id ASC ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)
         FROM movimentos_bancarios
-        WHERE conta_id = %s AND EXTRACT(YEAR FROM data) = %s AND EXTRACT(MONTH FROM data) = %s
+        WHERE conta_id = %s AND data >= %s AND data < %s
         ORDER BY data ASC, id ASC
         '''
-        rows = execute_query(query, (conta_id, ano, mes), fetchall=True)
-        return [MovimentoBancario(row[0], row[1], row[2], float(row[3]), row[4]) for row in rows] if rows else []
+        inicio = date(inicio.year, inicio.month, 1)
+        with get_db_cursor(name='extrato_periodo') as cursor:
+            cursor.itersize = tamanho_lote
+            cursor.execute(query, (conta_id, inicio, conta_id, inicio, fim))
+            yield from cursor
+
+    @staticmethod
+    def get_extrato_mensal(conta_id, ano, mes, saldo_inicial=None):
+        # saldo_acumulado de cada linha = saldo inicial do mês + soma corrente dos lançamentos;
+        # sem saldo_inicial informado, ele é lido de saldos_mensais_contas na mesma consulta
+        query = '''
+        SELECT id, conta_id, data, valor, descricao,
+               COALESCE(%s::numeric, (
+                   SELECT saldo_fechamento FROM saldos_mensais_contas
+                   WHERE conta_id = %s AND mes < %s
+                   ORDER BY mes DESC LIMIT 1
+               ), 0) + SUM(valor) OVER (ORDER BY data ASC, id ASC ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS saldo_acumulado
+        FROM movimentos_bancarios
+        WHERE conta_id = %s AND data >= %s AND data < %s
+        ORDER BY data ASC, id ASC
+        '''
+        inicio, fim = _intervalo_do_mes(ano, mes)
+        rows = execute_query(
+            query, (saldo_inicial, conta_id, inicio, conta_id, inicio, fim), fetchall=True,
+            row_factory=args_row(MovimentoBancario))
+        return rows if rows else []
 
     @staticmethod
     def get_saldo_inicial_do_mes(conta_id, ano, mes):
         query = '''
-        SELECT COALESCE(SUM(valor), 0.0) FROM movimentos_bancarios
-        WHERE conta_id = %s AND data < %s
+        SELECT saldo_fechamento FROM saldos_mensais_contas
+        WHERE conta_id = %s AND mes < %s
+        ORDER BY mes DESC
+        LIMIT 1
         '''
-        data_limite = datetime(ano, mes, 1).strftime('%Y-%m-%d')
+        data_limite, _ = _intervalo_do_mes(ano, mes)
         saldo = execute_query(query, (conta_id, data_limite), fetchone=True)
-        return float(saldo[0]) if saldo and saldo[0] is not None else 0.0
+        return saldo[0] if saldo and saldo[0] is not None else ZERO
 
     @staticmethod
     def get_by_id(movimento_id):
         query = 'SELECT id, conta_id, data, valor, descricao FROM movimentos_bancarios WHERE id = %s'
-        row = execute_query(query, (movimento_id,), fetchone=True)
-        return MovimentoBancario(row[0], row[1], row[2], float(row[3]), row[4]) if row else None
+        row = execute_query(query, (movimento_id,), fetchone=True,
+                            row_factory=args_row(MovimentoBancario))
+        return row if row else None
 
     @staticmethod
     def delete(movimento_id, user_id):
         try:
             with get_db_cursor(commit=True) as cursor:
-                movimento = MovimentoBancario.get_by_id(movimento_id)
+                # apaga só se a conta for do usuário; o saldo é corrigido com o valor devolvido
+                cursor.execute(
+                    """
+                    DELETE FROM movimentos_bancarios m
+                    USING contas_bancarias c
+                    WHERE m.id = %s AND m.conta_id = c.id AND c.user_id = %s
+                    RETURNING m.conta_id, m.data, m.valor
+                    """,
+                    (movimento_id, user_id)
+                )
+                movimento = cursor.fetchone()
                 if not movimento:
-                    raise ValueError("Movimento bancário não encontrado.")
-
-                conta = ContaBancaria.get_by_id(movimento.conta_id)
-                if not conta or conta.user_id != user_id:
+                    cursor.execute(
+                        'SELECT 1 FROM movimentos_bancarios WHERE id = %s', (movimento_id,))
+                    if not cursor.fetchone():
+                        raise ValueError("Movimento bancário não encontrado.")
                     raise ValueError(
                         "Conta não encontrada ou você não tem permissão para esta conta.")
 
-                novo_saldo = conta.saldo_atual - movimento.valor
-
-                cursor.execute(
-                    'UPDATE contas_bancarias SET saldo_atual = %s WHERE id = %s',
-                    (novo_saldo, conta.id)
-                )
-
+                conta_id, data, valor = movimento
                 cursor.execute(
-                    'DELETE FROM movimentos_bancarios WHERE id = %s',
-                    (movimento_id,)
+                    'UPDATE contas_bancarias SET saldo_atual = saldo_atual - %s WHERE id = %s',
+                    (valor, conta_id)
                 )
-                return True
+                MovimentoBancario._registrar_saldo_mensal(
+                    cursor, conta_id, data, -valor)
+            return True
         except Exception as e:
             raise e
@@ -1,23 +1,46 @@
 # models/movimento_crediario_model.py
-from datetime import date, timedelta
+from datetime import date
 from dateutil.relativedelta import relativedelta
-from database.db_manager import execute_query
+from database.db_manager import execute_query, get_db_cursor
 from psycopg.errors import UniqueViolation
+from psycopg.rows import args_row
+from services.cache import lookup_cache
+from services.dinheiro import ZERO, valor_parcela
+
+
+class ParcelaCrediario:
+    __slots__ = ('id', 'id_movimento_crediario', 'numero', 'mes_referencia', 'valor', 'pago')
+
+    def __init__(self, id, id_movimento_crediario, numero, mes_referencia, valor, pago):
+        self.id = id
+        self.id_movimento_crediario = id_movimento_crediario
+        self.numero = numero
+        self.mes_referencia = mes_referencia
+        self.valor = valor
+        self.pago = pago
 
 
 class MovimentoCrediario:
-    def __init__(self, id, data_compra, descricao, id_grupo_crediario, id_crediario, valor_total, num_parcelas, primeira_parcela, user_id, ultima_parcela=None, valor_parcela_mensal=None):
+    __slots__ = ('id', 'data_compra', 'descricao', 'id_grupo_crediario', 'id_crediario',
+                 'valor_total', 'num_parcelas', 'primeira_parcela', 'ultima_parcela',
+                 'valor_parcela_mensal', 'user_id', 'nome_grupo_crediario', 'nome_crediario')
+
+    def __init__(self, id, data_compra, descricao, id_grupo_crediario, id_crediario, valor_total, num_parcelas, primeira_parcela, user_id, ultima_parcela=None, valor_parcela_mensal=None,
+                 nome_grupo_crediario=None, nome_crediario=None):
         self.id = id
         self.data_compra = data_compra
         self.descricao = descricao
         self.id_grupo_crediario = id_grupo_crediario
         self.id_crediario = id_crediario
-        self.valor_total = float(valor_total)
+        self.valor_total = valor_total
         self.num_parcelas = int(num_parcelas)
         self.primeira_parcela = primeira_parcela
         self.ultima_parcela = ultima_parcela if ultima_parcela else self._calculate_ultima_parcela()
         self.valor_parcela_mensal = valor_parcela_mensal if valor_parcela_mensal else self._calculate_valor_parcela_mensal()
         self.user_id = user_id
+        # nomes vindos dos JOINs com grupo_crediario e crediarios
+        self.nome_grupo_crediario = nome_grupo_crediario
+        self.nome_crediario = nome_crediario
 
     def _calculate_ultima_parcela(self):
         if not self.primeira_parcela or not self.num_parcelas or self.num_parcelas == 0:
@@ -25,36 +48,7 @@ class MovimentoCrediario:
         return self.primeira_parcela + relativedelta(months=self.num_parcelas - 1)
 
     def _calculate_valor_parcela_mensal(self):
-        if not self.valor_total or not self.num_parcelas or self.num_parcelas == 0:
-            return 0.0
-        return round(self.valor_total / self.num_parcelas, 2)
-
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS movimento_crediario (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL,
-            data_compra DATE NOT NULL,
-            descricao VARCHAR(255) NOT NULL,
-            id_grupo_crediario INTEGER NOT NULL,
-            id_crediario INTEGER NOT NULL,
-            valor_total DECIMAL(10, 2) NOT NULL,
-            num_parcelas INTEGER NOT NULL,
-            primeira_parcela DATE NOT NULL,
-            ultima_parcela DATE NOT NULL,
-            valor_parcela_mensal DECIMAL(10, 2) NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-            FOREIGN KEY (id_grupo_crediario) REFERENCES grupo_crediario(id) ON DELETE RESTRICT,
-            FOREIGN KEY (id_crediario) REFERENCES crediarios(id) ON DELETE RESTRICT
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(
-                f"ERRO CRÍTICO ao criar/verificar tabela 'movimento_crediario': {e}")
-            raise
+        return valor_parcela(self.valor_total, self.num_parcelas)
 
     @staticmethod
     def get_all_for_user(user_id):
@@ -64,15 +58,15 @@ class MovimentoCrediario:
             mc.data_compra,
             mc.descricao,
             mc.id_grupo_crediario,
-            gc.grupo AS nome_grupo_crediario,
             mc.id_crediario,
-            c.crediario AS nome_crediario,
             mc.valor_total,
             mc.num_parcelas,
             mc.primeira_parcela,
+            mc.user_id,
             mc.ultima_parcela,
             mc.valor_parcela_mensal,
-            mc.user_id
+            gc.grupo AS nome_grupo_crediario,
+            c.crediario AS nome_crediario
         FROM
             movimento_crediario mc
         JOIN
@@ -84,28 +78,38 @@ class MovimentoCrediario:
         ORDER BY
             mc.id DESC;
         """
-        rows = execute_query(query, (user_id,), fetchall=True)
-        if rows:
-            movimentos = []
-            for row in rows:
-                mov = MovimentoCrediario(
-                    id=row[0],
-                    data_compra=row[1],
-                    descricao=row[2],
-                    id_grupo_crediario=row[3],
-                    id_crediario=row[5],
-                    valor_total=row[7],
-                    num_parcelas=row[8],
-                    primeira_parcela=row[9],
-                    ultima_parcela=row[10],
-                    valor_parcela_mensal=row[11],
-                    user_id=row[12]
-                )
-                mov.nome_grupo_crediario = row[4]
-                mov.nome_crediario = row[6]
-                movimentos.append(mov)
-            return movimentos
-        return []
+        rows = execute_query(query, (user_id,), fetchall=True,
+                             row_factory=args_row(MovimentoCrediario))
+        return rows if rows else []
+
+    @staticmethod
+    def iter_all_for_user(user_id, tamanho_lote=2000):
+        query = """
+        SELECT
+            mc.data_compra,
+            mc.descricao,
+            gc.grupo,
+            c.crediario,
+            mc.valor_total,
+            mc.num_parcelas,
+            mc.primeira_parcela,
+            mc.ultima_parcela,
+            mc.valor_parcela_mensal
+        FROM
+            movimento_crediario mc
+        JOIN
+            grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+        JOIN
+            crediarios c ON mc.id_crediario = c.id
+        WHERE
+            mc.user_id = %s
+        ORDER BY
+            mc.data_compra ASC, mc.id ASC;
+        """
+        with get_db_cursor(name='movimento_crediario_export') as cursor:
+            cursor.itersize = tamanho_lote
+            cursor.execute(query, (user_id,))
+            yield from cursor
 
     @staticmethod
     def get_by_id(movimento_id, user_id):
@@ -115,15 +119,15 @@ class MovimentoCrediario:
             mc.data_compra,
             mc.descricao,
             mc.id_grupo_crediario,
-            gc.grupo AS nome_grupo_crediario,
             mc.id_crediario,
-            c.crediario AS nome_crediario,
             mc.valor_total,
             mc.num_parcelas,
             mc.primeira_parcela,
+            mc.user_id,
             mc.ultima_parcela,
             mc.valor_parcela_mensal,
-            mc.user_id
+            gc.grupo AS nome_grupo_crediario,
+            c.crediario AS nome_crediario
         FROM
             movimento_crediario mc
         JOIN
@@ -133,25 +137,85 @@ class MovimentoCrediario:
         WHERE
             mc.id = %s AND mc.user_id = %s;
         """
-        row = execute_query(query, (movimento_id, user_id), fetchone=True)
-        if row:
-            mov = MovimentoCrediario(
-                id=row[0],
-                data_compra=row[1],
-                descricao=row[2],
-                id_grupo_crediario=row[3],
-                id_crediario=row[5],
-                valor_total=row[7],
-                num_parcelas=row[8],
-                primeira_parcela=row[9],
-                ultima_parcela=row[10],
-                valor_parcela_mensal=row[11],
-                user_id=row[12]
+        row = execute_query(query, (movimento_id, user_id), fetchone=True,
+                            row_factory=args_row(MovimentoCrediario))
+        return row if row else None
+
+    @staticmethod
+    def _gerar_parcelas(cursor, movimento_id=None):
+        # uma linha por parcela, em centavos: cada uma recebe valor_total / num_parcelas
+        # truncado e o resto vai, um centavo para cada, nas primeiras. A soma é exatamente
+        # valor_total e nenhuma parcela fica negativa. Parcelas já existentes mantêm o status "pago".
+        filtro = 'WHERE mc.id = %s' if movimento_id is not None else ''
+        params = (movimento_id,) if movimento_id is not None else None
+        cursor.execute(
+            f"""
+            INSERT INTO parcelas_crediario (id_movimento_crediario, user_id, numero, mes_referencia, valor)
+            SELECT mc.id, mc.user_id, n.numero,
+                   (mc.primeira_parcela + (n.numero - 1) * INTERVAL '1 month')::date,
+                   (floor(mc.valor_total * 100 / mc.num_parcelas)
+                    + CASE WHEN n.numero <= mod(mc.valor_total * 100, mc.num_parcelas) THEN 1 ELSE 0 END) / 100
+            FROM movimento_crediario mc
+            CROSS JOIN LATERAL generate_series(1, mc.num_parcelas) AS n(numero)
+            {filtro}
+            ON CONFLICT (id_movimento_crediario, numero) DO UPDATE
+            SET mes_referencia = EXCLUDED.mes_referencia, valor = EXCLUDED.valor
+            """,
+            params
+        )
+        if movimento_id is not None:
+            cursor.execute(
+                """
+                DELETE FROM parcelas_crediario p
+                USING movimento_crediario mc
+                WHERE p.id_movimento_crediario = mc.id AND mc.id = %s AND p.numero > mc.num_parcelas
+                """,
+                (movimento_id,)
             )
-            mov.nome_grupo_crediario = row[4]
-            mov.nome_crediario = row[6]
-            return mov
-        return None
+
+    @staticmethod
+    def _travar_crediarios(cursor, ids, user_id):
+        # bloqueia os crediários envolvidos (em ordem de id, evitando deadlock) e devolve
+        # o saldo em aberto de cada um antes da alteração
+        cursor.execute(
+            "SELECT id, saldo_aberto FROM crediarios WHERE id = ANY(%s) AND user_id = %s ORDER BY id FOR UPDATE;",
+            ([int(i) for i in ids], user_id)
+        )
+        saldos = dict(cursor.fetchall())
+        if len(saldos) != len(set(int(i) for i in ids)):
+            raise ValueError("Crediário não encontrado.")
+        return saldos
+
+    @staticmethod
+    def _ajustar_saldo_aberto(cursor, movimento_id, sinal):
+        # soma (sinal=1) ou retira (sinal=-1) as parcelas em aberto do movimento do saldo do crediário
+        cursor.execute(
+            """
+            UPDATE crediarios c
+            SET saldo_aberto = c.saldo_aberto + %s * parcelas.valor
+            FROM (
+                SELECT mc.id_crediario,
+                       SUM(CASE WHEN gc.tipo = 'Estorno' THEN -p.valor ELSE p.valor END) AS valor
+                FROM parcelas_crediario p
+                JOIN movimento_crediario mc ON p.id_movimento_crediario = mc.id
+                JOIN grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+                WHERE mc.id = %s AND p.pago = FALSE
+                GROUP BY mc.id_crediario
+            ) parcelas
+            WHERE c.id = parcelas.id_crediario;
+            """,
+            (sinal, movimento_id)
+        )
+
+    @staticmethod
+    def _verificar_limite(cursor, id_crediario, saldos_anteriores):
+        # só recusa quando o lançamento aumenta o comprometimento além do limite
+        cursor.execute(
+            "SELECT limite, saldo_aberto FROM crediarios WHERE id = %s;", (id_crediario,))
+        limite, saldo_aberto = cursor.fetchone()
+        if saldo_aberto > limite and saldo_aberto > saldos_anteriores[int(id_crediario)]:
+            raise ValueError(
+                f"Limite do crediário excedido em R$ {saldo_aberto - limite:.2f}.")
 
     @staticmethod
     def add(data_compra, descricao, id_grupo_crediario, id_crediario, valor_total, num_parcelas, primeira_parcela, user_id):
@@ -178,14 +242,23 @@ class MovimentoCrediario:
         ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id;
         """
         try:
-            result = execute_query(
-                query,
-                (data_compra, descricao, id_grupo_crediario, id_crediario,
-                 valor_total, num_parcelas, primeira_parcela, ultima_parcela,
-                 valor_parcela_mensal, user_id),
-                fetchone=True,
-                commit=True
-            )
+            with get_db_cursor(commit=True) as cursor:
+                saldos = MovimentoCrediario._travar_crediarios(
+                    cursor, [id_crediario], user_id)
+                cursor.execute(
+                    query,
+                    (data_compra, descricao, id_grupo_crediario, id_crediario,
+                     valor_total, num_parcelas, primeira_parcela, ultima_parcela,
+                     valor_parcela_mensal, user_id)
+                )
+                result = cursor.fetchone()
+                if result:
+                    MovimentoCrediario._gerar_parcelas(cursor, result[0])
+                    MovimentoCrediario._ajustar_saldo_aberto(
+                        cursor, result[0], 1)
+                    MovimentoCrediario._verificar_limite(
+                        cursor, id_crediario, saldos)
+            lookup_cache.invalidate('crediarios', user_id)
             if result:
                 return MovimentoCrediario(result[0], data_compra, descricao, id_grupo_crediario, id_crediario,
                                           valor_total, num_parcelas, primeira_parcela, user_id,
@@ -226,13 +299,29 @@ class MovimentoCrediario:
         WHERE id = %s AND user_id = %s;
         """
         try:
-            execute_query(
-                query,
-                (data_compra, descricao, id_grupo_crediario, id_crediario,
-                 valor_total, num_parcelas, primeira_parcela, ultima_parcela,
-                 valor_parcela_mensal, movimento_id, user_id),
-                commit=True
-            )
+            with get_db_cursor(commit=True) as cursor:
+                cursor.execute(
+                    "SELECT id_crediario FROM movimento_crediario WHERE id = %s AND user_id = %s FOR UPDATE;",
+                    (movimento_id, user_id)
+                )
+                anterior = cursor.fetchone()
+                if anterior:
+                    saldos = MovimentoCrediario._travar_crediarios(
+                        cursor, [anterior[0], id_crediario], user_id)
+                    MovimentoCrediario._ajustar_saldo_aberto(
+                        cursor, movimento_id, -1)
+                    cursor.execute(
+                        query,
+                        (data_compra, descricao, id_grupo_crediario, id_crediario,
+                         valor_total, num_parcelas, primeira_parcela, ultima_parcela,
+                         valor_parcela_mensal, movimento_id, user_id)
+                    )
+                    MovimentoCrediario._gerar_parcelas(cursor, movimento_id)
+                    MovimentoCrediario._ajustar_saldo_aberto(
+                        cursor, movimento_id, 1)
+                    MovimentoCrediario._verificar_limite(
+                        cursor, id_crediario, saldos)
+            lookup_cache.invalidate('crediarios', user_id)
             return MovimentoCrediario.get_by_id(movimento_id, user_id)
         except Exception as e:
             print(f"Erro ao atualizar movimento de crediário: {e}")
@@ -240,30 +329,177 @@ class MovimentoCrediario:
 
     @staticmethod
     def delete(movimento_id, user_id):
-        query = "DELETE FROM movimento_crediario WHERE id = %s AND user_id = %s;"
-        execute_query(query, (movimento_id, user_id), commit=True)
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(
+                "SELECT id_crediario FROM movimento_crediario WHERE id = %s AND user_id = %s FOR UPDATE;",
+                (movimento_id, user_id)
+            )
+            anterior = cursor.fetchone()
+            if anterior:
+                MovimentoCrediario._travar_crediarios(
+                    cursor, [anterior[0]], user_id)
+                MovimentoCrediario._ajustar_saldo_aberto(
+                    cursor, movimento_id, -1)
+                cursor.execute(
+                    "DELETE FROM movimento_crediario WHERE id = %s AND user_id = %s;", (movimento_id, user_id))
+        lookup_cache.invalidate('crediarios', user_id)
         return True
 
+    @staticmethod
+    def get_parcelas(movimento_id, user_id):
+        query = """
+        SELECT id, id_movimento_crediario, numero, mes_referencia, valor, pago
+        FROM parcelas_crediario
+        WHERE id_movimento_crediario = %s AND user_id = %s
+        ORDER BY numero ASC;
+        """
+        rows = execute_query(query, (movimento_id, user_id), fetchall=True,
+                             row_factory=args_row(ParcelaCrediario))
+        return rows if rows else []
+
+    @staticmethod
+    def set_parcela_paga(parcela_id, user_id, pago=True):
+        # a parcela sai (ou volta) do saldo em aberto do crediário só quando o status muda.
+        # Trava na mesma ordem de update/delete (movimento, crediário, parcelas) para que
+        # pagar uma parcela enquanto a compra é editada não termine em deadlock
+        query = """
+        WITH anterior AS (
+            SELECT id, pago FROM parcelas_crediario
+            WHERE id = %s AND id_movimento_crediario = %s AND user_id = %s FOR UPDATE
+        )
+        UPDATE parcelas_crediario p SET pago = %s
+        FROM anterior
+        WHERE p.id = anterior.id
+        RETURNING p.id_movimento_crediario, p.valor, anterior.pago;
+        """
+        result = None
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(
+                """
+                SELECT mc.id, mc.id_crediario
+                FROM parcelas_crediario p
+                JOIN movimento_crediario mc ON p.id_movimento_crediario = mc.id
+                WHERE p.id = %s AND p.user_id = %s
+                FOR UPDATE OF mc;
+                """,
+                (parcela_id, user_id)
+            )
+            movimento = cursor.fetchone()
+            if movimento:
+                MovimentoCrediario._travar_crediarios(
+                    cursor, [movimento[1]], user_id)
+                cursor.execute(query, (parcela_id, movimento[0], user_id, pago))
+                result = cursor.fetchone()
+            if result and result[2] != pago:
+                cursor.execute(
+                    """
+                    UPDATE crediarios c
+                    SET saldo_aberto = c.saldo_aberto +
+                        CASE WHEN gc.tipo = 'Estorno' THEN -%s::numeric ELSE %s::numeric END
+                    FROM movimento_crediario mc
+                    JOIN grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+                    WHERE mc.id = %s AND c.id = mc.id_crediario;
+                    """,
+                    ((-1 if pago else 1) * result[1], (-1 if pago else 1) * result[1], result[0])
+                )
+        if result and result[2] != pago:
+            lookup_cache.invalidate('crediarios', user_id)
+        return result[0] if result else None
+
     @staticmethod
     def get_parcelas_mensais_por_mes(user_id, ano, mes):
         query = """
         SELECT
-            SUM(valor_parcela_mensal)
+            SUM(valor)
         FROM
-            movimento_crediario
+            parcelas_crediario
         WHERE
             user_id = %s AND
-            primeira_parcela <= %s AND
-            ultima_parcela >= %s;
+            mes_referencia = %s;
         """
-        start_of_month = date(ano, mes, 1)
+        result = execute_query(
+            query, (user_id, date(ano, mes, 1)), fetchone=True)
 
-        if mes == 12:
-            end_of_month = date(ano, mes, 31)
-        else:
-            end_of_month = date(ano, mes + 1, 1) - timedelta(days=1)
+        return result[0] if result and result[0] is not None else ZERO
 
-        result = execute_query(
-            query, (user_id, end_of_month, start_of_month), fetchone=True)
+    @staticmethod
+    def get_previsao_parcelas(user_id, inicio, meses=12):
+        # compromisso mensal por crediário/grupo numa janela de meses; uma linha por
+        # combinação com o vetor de valores já preenchido com zero nos meses sem parcela.
+        # Estornos entram com sinal negativo.
+        inicio = date(inicio.year, inicio.month, 1)
+        fim = inicio + relativedelta(months=meses - 1)
+        query = """
+        WITH meses AS (
+            SELECT generate_series(%s::date, %s::date, INTERVAL '1 month')::date AS mes
+        ),
+        soma AS (
+            SELECT
+                p.mes_referencia,
+                mc.id_crediario,
+                mc.id_grupo_crediario,
+                SUM(CASE WHEN gc.tipo = 'Estorno' THEN -p.valor ELSE p.valor END) AS valor
+            FROM
+                parcelas_crediario p
+            JOIN
+                movimento_crediario mc ON p.id_movimento_crediario = mc.id
+            JOIN
+                grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+            WHERE
+                p.user_id = %s AND
+                p.mes_referencia BETWEEN %s AND %s
+            GROUP BY
+                p.mes_referencia, mc.id_crediario, mc.id_grupo_crediario
+        ),
+        chaves AS (
+            SELECT DISTINCT id_crediario, id_grupo_crediario FROM soma
+        )
+        SELECT
+            k.id_crediario,
+            c.crediario,
+            k.id_grupo_crediario,
+            gc.grupo,
+            gc.tipo,
+            array_agg(COALESCE(s.valor, 0) ORDER BY m.mes)
+        FROM
+            chaves k
+        CROSS JOIN
+            meses m
+        LEFT JOIN
+            soma s ON s.id_crediario = k.id_crediario
+                  AND s.id_grupo_crediario = k.id_grupo_crediario
+                  AND s.mes_referencia = m.mes
+        JOIN
+            crediarios c ON k.id_crediario = c.id
+        JOIN
+            grupo_crediario gc ON k.id_grupo_crediario = gc.id
+        GROUP BY
+            k.id_crediario, c.crediario, k.id_grupo_crediario, gc.grupo, gc.tipo
+        ORDER BY
+            c.crediario ASC, gc.grupo ASC;
+        """
+        rows = execute_query(
+            query, (inicio, fim, user_id, inicio, fim), fetchall=True) or []
+
+        linhas = []
+        totais = [ZERO] * meses
+        for row in rows:
+            valores = row[5]
+            for i, valor in enumerate(valores):
+                totais[i] += valor
+            linhas.append({
+                'id_crediario': row[0],
+                'crediario': row[1],
+                'id_grupo_crediario': row[2],
+                'grupo': row[3],
+                'tipo': row[4],
+                'valores': valores,
+                'total': sum(valores, ZERO)
+            })
 
-        return result[0] if result and result[0] is not None else 0.0
+        return {
+            'meses': [(inicio + relativedelta(months=i)).strftime('%Y-%m') for i in range(meses)],
+            'linhas': linhas,
+            'totais': totais,
+            'total_geral': sum(totais, ZERO)
+        }
@@ -1,47 +1,31 @@
 # models/tipo_crediario_model.py
 from database.db_manager import execute_query
 from psycopg.errors import UniqueViolation
+from psycopg.rows import args_row
+from services.cache import lookup_cache
 
 
 class TipoCrediario:
+    __slots__ = ('id', 'user_id', 'nome_tipo')
+
     def __init__(self, id, user_id, nome_tipo):
         self.id = id
         self.user_id = user_id
         self.nome_tipo = nome_tipo
 
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS tipos_crediario (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL,
-            nome_tipo VARCHAR(100) NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-            UNIQUE (user_id, nome_tipo) -- Garante unicidade do tipo por usuário
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(
-                f"ERRO CRÍTICO ao criar/verificar tabela 'tipos_crediario': {e}")
-            raise
-
     @staticmethod
     def get_all_for_user(user_id):
         query = "SELECT id, user_id, nome_tipo FROM tipos_crediario WHERE user_id = %s ORDER BY nome_tipo ASC;"
-        rows = execute_query(query, (user_id,), fetchall=True)
-        if rows:
-            return [TipoCrediario(row[0], row[1], row[2]) for row in rows]
-        return []
+        rows = lookup_cache.get_or_load(
+            'tipos_crediario', user_id,
+            lambda: execute_query(query, (user_id,), fetchall=True, row_factory=args_row(TipoCrediario)))
+        return list(rows) if rows else []
 
     @staticmethod
     def get_by_id(tipo_id, user_id):
         query = "SELECT id, user_id, nome_tipo FROM tipos_crediario WHERE id = %s AND user_id = %s;"
-        row = execute_query(query, (tipo_id, user_id), fetchone=True)
-        if row:
-            return TipoCrediario(row[0], row[1], row[2])
-        return None
+        row = execute_query(query, (tipo_id, user_id), fetchone=True, row_factory=args_row(TipoCrediario))
+        return row if row else None
 
     @staticmethod
     def add(user_id, nome_tipo):
@@ -49,6 +33,7 @@ class TipoCrediario:
         try:
             result = execute_query(
                 query, (user_id, nome_tipo), fetchone=True, commit=True)
+            lookup_cache.invalidate('tipos_crediario', user_id)
             if result:
                 return TipoCrediario(result[0], user_id, nome_tipo)
             return None
@@ -64,6 +49,7 @@ class TipoCrediario:
         query = "UPDATE tipos_crediario SET nome_tipo = %s WHERE id = %s AND user_id = %s;"
         try:
             execute_query(query, (nome_tipo, tipo_id, user_id), commit=True)
+            lookup_cache.invalidate('tipos_crediario', user_id)
             return TipoCrediario.get_by_id(tipo_id, user_id)
         except UniqueViolation:
             raise ValueError(
@@ -76,4 +62,5 @@ class TipoCrediario:
     def delete(tipo_id, user_id):
         query = "DELETE FROM tipos_crediario WHERE id = %s AND user_id = %s;"
         execute_query(query, (tipo_id, user_id), commit=True)
+        lookup_cache.invalidate('tipos_crediario', user_id)
         return True
@@ -1,49 +1,32 @@
 # models/transacao_model.py
 from database.db_manager import execute_query
 from psycopg.errors import UniqueViolation
+from psycopg.rows import args_row
+from services.cache import lookup_cache
 
 
 class Transacao:
+    __slots__ = ('id', 'transacao', 'tipo', 'user_id')
+
     def __init__(self, id, transacao, tipo, user_id):
         self.id = id
         self.transacao = transacao
         self.tipo = tipo
         self.user_id = user_id
 
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS transacoes (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL,
-            transacao VARCHAR(100) NOT NULL,
-            tipo VARCHAR(10) NOT NULL CHECK (tipo IN ('Entrada', 'Saída')),
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-            UNIQUE (user_id, transacao, tipo) -- Garante unicidade da transação por usuário e tipo
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(f"ERRO CRÍTICO ao criar/verificar tabela 'transacoes': {e}")
-            raise
-
     @staticmethod
     def get_all_for_user(user_id):
         query = "SELECT id, transacao, tipo, user_id FROM transacoes WHERE user_id = %s ORDER BY transacao ASC;"
-        rows = execute_query(query, (user_id,), fetchall=True)
-
-        if rows:
-            return [Transacao(row[0], row[1], row[2], row[3]) for row in rows]
-        return []
+        rows = lookup_cache.get_or_load(
+            'transacoes', user_id,
+            lambda: execute_query(query, (user_id,), fetchall=True, row_factory=args_row(Transacao)))
+        return list(rows) if rows else []
 
     @staticmethod
     def get_by_id(transacao_id, user_id):
         query = "SELECT id, transacao, tipo, user_id FROM transacoes WHERE id = %s AND user_id = %s;"
-        row = execute_query(query, (transacao_id, user_id), fetchone=True)
-        if row:
-            return Transacao(row[0], row[1], row[2], row[3])
-        return None
+        row = execute_query(query, (transacao_id, user_id), fetchone=True, row_factory=args_row(Transacao))
+        return row if row else None
 
     @staticmethod
     def add(transacao, tipo, user_id):
@@ -54,6 +37,7 @@ class Transacao:
         try:
             result = execute_query(
                 query, (transacao, tipo, user_id), fetchone=True, commit=True)
+            lookup_cache.invalidate('transacoes', user_id)
             if result:
                 return Transacao(result[0], transacao, tipo, user_id)
             return None
@@ -73,6 +57,7 @@ class Transacao:
         try:
             execute_query(
                 query, (transacao, tipo, transacao_id, user_id), commit=True)
+            lookup_cache.invalidate('transacoes', user_id)
             return Transacao.get_by_id(transacao_id, user_id)
         except UniqueViolation:
             raise ValueError(
@@ -85,4 +70,5 @@ class Transacao:
     def delete(transacao_id, user_id):
         query = "DELETE FROM transacoes WHERE id = %s AND user_id = %s;"
         execute_query(query, (transacao_id, user_id), commit=True)
+        lookup_cache.invalidate('transacoes', user_id)
         return True
@@ -3,6 +3,14 @@ from database.db_manager import execute_query
 from psycopg.errors import UniqueViolation
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
+from config import Config
+from services.cache import TTLCache, lookup_cache
+
+# linhas de "users" por id; evita ir ao banco a cada requisição autenticada (load_user).
+# Vinculado ao lookup_cache: update/delete invalidam a linha nos outros workers por NOTIFY.
+user_cache = TTLCache(maxsize=Config.USER_CACHE_MAXSIZE,
+                      ttl=Config.USER_CACHE_TTL, nome='users')
+lookup_cache.vincular(user_cache)
 
 
 class User(UserMixin):
@@ -14,24 +22,6 @@ class User(UserMixin):
         self.password_hash = password_hash
         self.is_admin = is_admin
 
-    @staticmethod
-    def create_table():
-        query = """
-        CREATE TABLE IF NOT EXISTS users (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(255) NOT NULL,
-            email VARCHAR(255) NOT NULL,
-            login VARCHAR(80) UNIQUE NOT NULL,
-            password_hash VARCHAR(255) NOT NULL,
-            is_admin BOOLEAN DEFAULT FALSE 
-        );
-        """
-        try:
-            execute_query(query, commit=True)
-        except Exception as e:
-            print(f"ERRO CRÍTICO ao criar/verificar tabela 'users': {e}")
-            raise
-
     def get_id(self):
         return str(self.id)
 
@@ -50,9 +40,19 @@ class User(UserMixin):
         return [cls(*row) for row in rows] if rows else []
 
     @classmethod
-    def get_by_id(cls, user_id):
-        row = execute_query(
-            "SELECT id, name, email, login, password_hash, is_admin FROM users WHERE id = %s", (user_id,), fetchone=True)
+    def get_by_id(cls, user_id, usar_cache=True):
+        # usar_cache=False para conferência de senha: lê o hash gravado agora no banco
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        row = lookup_cache.get_item(user_cache, user_id) if usar_cache else None
+        if row is None:
+            row = execute_query(
+                "SELECT id, name, email, login, password_hash, is_admin FROM users WHERE id = %s", (user_id,), fetchone=True)
+            if row:
+                user_cache.set(user_id, row)
         return cls(*row) if row else None
 
     @classmethod
@@ -81,23 +81,23 @@ class User(UserMixin):
 
     @classmethod
     def update(cls, user_id, name, email, login, new_password=None, is_admin=None):
-        user = cls.get_by_id(user_id)
-        if not user:
-            return None
-
-        password_hash_to_save = user.password_hash
+        # só grava senha e is_admin quando informados: os valores atuais vêm do próprio UPDATE
+        # (RETURNING), nunca do user_cache, que pode estar defasado até receber a notificação
+        colunas = ["name = %s", "email = %s", "login = %s"]
+        params = [name, email, login]
         if new_password:
-            password_hash_to_save = generate_password_hash(new_password)
-
-        is_admin_to_save = user.is_admin if is_admin is None else is_admin
+            colunas.append("password_hash = %s")
+            params.append(generate_password_hash(new_password))
+        if is_admin is not None:
+            colunas.append("is_admin = %s")
+            params.append(is_admin)
+        params.append(user_id)
 
         try:
-            query = "UPDATE users SET name = %s, email = %s, login = %s, password_hash = %s, is_admin = %s WHERE id = %s"
-            params = (name, email, login, password_hash_to_save,
-                      is_admin_to_save, user_id)
-            if execute_query(query, params, commit=True):
-                return cls(user_id, name, email, login, password_hash_to_save, is_admin_to_save)
-            return None
+            query = f"UPDATE users SET {', '.join(colunas)} WHERE id = %s RETURNING id, name, email, login, password_hash, is_admin"
+            row = execute_query(query, params, fetchone=True, commit=True)
+            lookup_cache.invalidate_item(user_cache, int(user_id))
+            return cls(*row) if row else None
         except UniqueViolation as e:
             raise ValueError(
                 "Erro: Já existe outro usuário com este login ou email.") from e
@@ -106,4 +106,7 @@ class User(UserMixin):
     def delete(cls, user_id):
         query = "DELETE FROM users WHERE id = %s"
         params = (user_id,)
-        return execute_query(query, params, commit=True)
+        resultado = execute_query(query, params, commit=True)
+        lookup_cache.invalidate_item(user_cache, int(user_id))
+        lookup_cache.invalidate_user(user_id)
+        return resultado
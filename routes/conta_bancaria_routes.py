@@ -2,6 +2,7 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from models.conta_bancaria_model import ContaBancaria
 from psycopg.errors import UniqueViolation
+from services.dinheiro import ler_valor
 from flask_login import login_required, current_user
 
 conta_bancaria_bp = Blueprint(
@@ -68,8 +69,8 @@ def add_conta_bancaria():
             return render_template('contas_bancarias/add.html', tipos_conta=TIPOS_CONTA)
 
         try:
-            saldo_inicial_float = float(saldo_inicial)
-            limite_credito_float = float(
+            saldo_inicial_valor = ler_valor(saldo_inicial)
+            limite_credito_valor = ler_valor(
                 limite_credito) if limite_credito else None
 
             if len(nome_banco) > 100:
@@ -79,7 +80,7 @@ def add_conta_bancaria():
             new_conta = ContaBancaria.add(
                 current_user.id,
                 nome_banco, agencia_val, numero_conta_val, tipo_conta,
-                saldo_inicial_float, limite_credito_float
+                saldo_inicial_valor, limite_credito_valor
             )
             if new_conta:
                 flash('Conta adicionada com sucesso!', 'success')
@@ -137,9 +138,9 @@ def edit_conta_bancaria(conta_id):
             return render_template('contas_bancarias/edit.html', conta=conta, tipos_conta=TIPOS_CONTA)
 
         try:
-            saldo_inicial_float = float(saldo_inicial)
-            saldo_atual_float = float(saldo_atual)
-            limite_credito_float = float(
+            saldo_inicial_valor = ler_valor(saldo_inicial)
+            saldo_atual_valor = ler_valor(saldo_atual)
+            limite_credito_valor = ler_valor(
                 limite_credito) if limite_credito else None
 
             if len(nome_banco) > 100:
@@ -148,7 +149,7 @@ def edit_conta_bancaria(conta_id):
 
             updated_conta = ContaBancaria.update(
                 conta_id, nome_banco, agencia_val, numero_conta_val, tipo_conta,
-                saldo_inicial_float, saldo_atual_float, limite_credito_float
+                saldo_inicial_valor, saldo_atual_valor, limite_credito_valor
             )
             if updated_conta:
                 flash('Conta atualizada com sucesso!', 'success')
@@ -4,6 +4,7 @@ from models.crediario_model import Crediario
 from models.tipo_crediario_model import TipoCrediario
 from flask_login import login_required, current_user
 from psycopg.errors import UniqueViolation
+from services.dinheiro import ler_valor
 
 crediario_bp = Blueprint('crediarios', __name__, url_prefix='/crediarios')
 
@@ -36,11 +37,11 @@ def add_crediario():
             return render_template('crediarios/add.html', tipos_crediario=tipos_crediario_disponiveis)
 
         try:
-            limite_float = float(limite)
+            limite_valor = ler_valor(limite)
             final_int = int(final)
 
             new_crediario = Crediario.add(
-                crediario_nome, tipo_selecionado, final_int, limite_float, current_user.id
+                crediario_nome, tipo_selecionado, final_int, limite_valor, current_user.id
             )
             if new_crediario:
                 flash('Crediário adicionado com sucesso!', 'success')
@@ -87,11 +88,11 @@ def edit_crediario(crediario_id):
             return render_template('crediarios/edit.html', crediario=crediario, tipos_crediario=tipos_crediario_disponiveis)
 
         try:
-            limite_float = float(limite)
+            limite_valor = ler_valor(limite)
             final_int = int(final)
 
             updated_crediario = Crediario.update(
-                crediario_id, crediario_nome, tipo_selecionado, final_int, limite_float, current_user.id
+                crediario_id, crediario_nome, tipo_selecionado, final_int, limite_valor, current_user.id
             )
             if updated_crediario:
                 flash('Crediário atualizado com sucesso!', 'success')
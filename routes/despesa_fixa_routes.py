@@ -4,6 +4,7 @@ from flask_login import login_required, current_user
 from datetime import datetime, date
 from models.despesa_fixa_model import DespesaFixa
 from models.contas_pagar_model import ContasPagar
+from services.dinheiro import ler_valor
 
 despesas_fixas_bp = Blueprint(
     'despesa_fixa', __name__, url_prefix='/despesa_fixa')
@@ -45,7 +46,7 @@ def add_despesa_fixa():
             descricao = conta_selecionada.conta
 
             mes_ano = datetime.strptime(mes_ano_str, '%Y-%m').date()
-            valor = float(valor_str)
+            valor = ler_valor(valor_str)
 
             if DespesaFixa.add(current_user.id, descricao, mes_ano, valor):
                 flash('Despesa fixa cadastrada com sucesso!', 'success')
@@ -97,7 +98,7 @@ def edit_despesa_fixa(despesa_id):
             descricao = conta_selecionada.conta
 
             mes_ano = datetime.strptime(mes_ano_str, '%Y-%m').date()
-            valor = float(valor_str)
+            valor = ler_valor(valor_str)
 
             if DespesaFixa.update(despesa_id, current_user.id, descricao, mes_ano, valor):
                 flash('Despesa fixa atualizada com sucesso!', 'success')
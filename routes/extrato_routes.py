@@ -2,12 +2,14 @@
 
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import calendar
 
 from models.conta_bancaria_model import ContaBancaria
 from models.movimento_bancario_model import MovimentoBancario
 from models.user_model import User
+from services.dinheiro import ZERO
+from services.exportacao import FORMATOS, resposta_exportacao
 
 
 extrato_bp = Blueprint('extrato', __name__, url_prefix='/extratos')
@@ -19,8 +21,8 @@ def extrato_bancario():
     contas = ContaBancaria.get_all_for_user(current_user.id)
     movimentos = []
     conta_selecionada = None
-    saldo_inicial_mes = 0.0
-    saldo_final_mes = 0.0
+    saldo_inicial_mes = ZERO
+    saldo_final_mes = ZERO
     mes_extrato = None
     ano_extrato = None
 
@@ -42,14 +44,13 @@ def extrato_bancario():
             else:
                 ano_extrato, mes_extrato = map(int, mes_ano_str.split('-'))
 
-                movimentos = MovimentoBancario.get_extrato_mensal(
-                    conta_id, ano_extrato, mes_extrato)
-
                 saldo_inicial_mes = MovimentoBancario.get_saldo_inicial_do_mes(
                     conta_id, ano_extrato, mes_extrato)
 
-                saldo_final_mes = saldo_inicial_mes + \
-                    sum(m.valor for m in movimentos)
+                movimentos = MovimentoBancario.get_extrato_mensal(
+                    conta_id, ano_extrato, mes_extrato, saldo_inicial_mes)
+
+                saldo_final_mes = movimentos[-1].saldo_acumulado if movimentos else saldo_inicial_mes
 
         except Exception as e:
             flash(f'Erro ao gerar extrato: {e}', 'danger')
@@ -93,6 +94,38 @@ def extrato_bancario():
     )
 
 
+@extrato_bp.route('/exportar')
+@login_required
+def exportar_extrato():
+    conta_id = request.args.get('conta_id', type=int)
+    de = request.args.get('de') or request.args.get('mes_ano')
+    ate = request.args.get('ate') or de
+    formato = request.args.get('formato', 'csv')
+
+    conta = ContaBancaria.get_by_id(conta_id) if conta_id else None
+    if not conta or conta.user_id != current_user.id:
+        flash('Conta bancária não encontrada ou não pertence ao usuário.', 'danger')
+        return redirect(url_for('extrato.extrato_bancario'))
+
+    try:
+        ano_de, mes_de = map(int, de.split('-'))
+        ano_ate, mes_ate = map(int, ate.split('-'))
+        inicio = date(ano_de, mes_de, 1)
+        # date() valida o mês de "ate" antes de passar ao primeiro dia do mês seguinte
+        ultimo_mes = date(ano_ate, mes_ate, 1)
+        fim = date(ultimo_mes.year + ultimo_mes.month // 12, ultimo_mes.month % 12 + 1, 1)
+        if fim <= inicio or formato not in FORMATOS:
+            raise ValueError
+    except (AttributeError, ValueError):
+        flash('Período ou formato de exportação inválido.', 'warning')
+        return redirect(url_for('extrato.extrato_bancario', conta_id=conta_id, mes_ano=de))
+
+    linhas = MovimentoBancario.iter_extrato_periodo(conta.id, inicio, fim)
+    return resposta_exportacao(
+        ['Data', 'Descrição', 'Valor', 'Saldo'], linhas, formato,
+        f'extrato_{conta.nome_banco}_{conta.numero_conta}_{de}_{ate}'.replace(' ', '_'), 'Extrato')
+
+
 @extrato_bp.route('/delete/<int:movimento_id>', methods=['POST'])
 @login_required
 def delete_movimento(movimento_id):
@@ -105,7 +138,9 @@ def delete_movimento(movimento_id):
                                 conta_id=request.form.get('conta_id'),
                                 mes_ano=request.form.get('mes_ano')))
 
-    if not user.check_password(password):
+    # hash lido do banco, não do user_cache: uma troca de senha vale já nesta requisição
+    conferido = User.get_by_id(user.id, usar_cache=False)
+    if not conferido or not conferido.check_password(password):
         flash('Senha incorreta. A exclusão não foi realizada.', 'danger')
         return redirect(url_for('extrato.extrato_bancario',
                                 conta_id=request.form.get('conta_id'),
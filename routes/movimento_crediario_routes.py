@@ -1,11 +1,13 @@
 # routes/movimento_crediario_routes.py
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from datetime import date
 
 from models.movimento_crediario_model import MovimentoCrediario
 from models.grupo_crediario_model import GrupoCrediario
 from models.crediario_model import Crediario
+from services.exportacao import FORMATOS, resposta_exportacao
+from services.dinheiro import ler_valor
 
 movimento_crediario_bp = Blueprint(
     'movimento_crediario', __name__, url_prefix='/movimento_crediario')
@@ -18,6 +20,57 @@ def list_movimentos_crediario():
     return render_template('movimento_crediario/list.html', movimentos=movimentos)
 
 
+@movimento_crediario_bp.route('/exportar')
+@login_required
+def exportar_movimentos_crediario():
+    formato = request.args.get('formato', 'csv')
+    if formato not in FORMATOS:
+        flash('Formato de exportação inválido.', 'warning')
+        return redirect(url_for('movimento_crediario.list_movimentos_crediario'))
+
+    linhas = MovimentoCrediario.iter_all_for_user(current_user.id)
+    return resposta_exportacao(
+        ['Data Compra', 'Descrição', 'Grupo', 'Crediário', 'Valor Total', 'Parcelas',
+         '1ª Parcela', 'Última Parcela', 'Valor Parcela Mensal'],
+        linhas, formato, 'movimentos_crediario', 'Crediário')
+
+
+def _parametros_previsao():
+    # ?inicio=YYYY-MM&meses=N (padrão: mês atual, 12 meses; no máximo 60)
+    inicio_str = request.args.get('inicio') or date.today().strftime('%Y-%m')
+    inicio = date.fromisoformat(inicio_str + '-01')
+    meses = int(request.args.get('meses', 12))
+    if meses < 1 or meses > 60:
+        raise ValueError('O número de meses deve estar entre 1 e 60.')
+    return inicio, meses
+
+
+@movimento_crediario_bp.route('/previsao')
+@login_required
+def previsao_parcelas():
+    try:
+        inicio, meses = _parametros_previsao()
+    except ValueError:
+        flash('Parâmetros de previsão inválidos.', 'warning')
+        inicio, meses = date.today().replace(day=1), 12
+
+    previsao = MovimentoCrediario.get_previsao_parcelas(
+        current_user.id, inicio, meses)
+    return render_template('movimento_crediario/previsao.html', previsao=previsao,
+                           inicio_str=inicio.strftime('%Y-%m'), meses=meses)
+
+
+@movimento_crediario_bp.route('/previsao.json')
+@login_required
+def previsao_parcelas_json():
+    try:
+        inicio, meses = _parametros_previsao()
+    except ValueError:
+        return jsonify({'erro': 'Parâmetros de previsão inválidos.'}), 400
+
+    return jsonify(MovimentoCrediario.get_previsao_parcelas(current_user.id, inicio, meses))
+
+
 @movimento_crediario_bp.route('/add', methods=['GET', 'POST'])
 @login_required
 def add_movimento_crediario():
@@ -50,7 +103,7 @@ def add_movimento_crediario():
         try:
             data_compra = date.fromisoformat(data_compra_str)
             primeira_parcela = date.fromisoformat(primeira_parcela_str + '-01')
-            valor_total = float(valor_total_str)
+            valor_total = ler_valor(valor_total_str)
             num_parcelas = int(num_parcelas_str)
 
             if valor_total <= 0 or num_parcelas <= 0:
@@ -136,7 +189,7 @@ def edit_movimento_crediario(movimento_id):
         try:
             data_compra = date.fromisoformat(data_compra_str)
             primeira_parcela = date.fromisoformat(primeira_parcela_str + '-01')
-            valor_total = float(valor_total_str)
+            valor_total = ler_valor(valor_total_str)
             num_parcelas = int(num_parcelas_str)
 
             if valor_total <= 0 or num_parcelas <= 0:
@@ -189,6 +242,32 @@ def edit_movimento_crediario(movimento_id):
     )
 
 
+@movimento_crediario_bp.route('/parcelas/<int:movimento_id>')
+@login_required
+def list_parcelas(movimento_id):
+    movimento = MovimentoCrediario.get_by_id(movimento_id, current_user.id)
+    if not movimento:
+        flash('Movimento de Crediário não encontrado ou você não tem permissão para acessá-lo.', 'danger')
+        return redirect(url_for('movimento_crediario.list_movimentos_crediario'))
+
+    parcelas = MovimentoCrediario.get_parcelas(movimento_id, current_user.id)
+    return render_template('movimento_crediario/parcelas.html', movimento=movimento, parcelas=parcelas)
+
+
+@movimento_crediario_bp.route('/parcelas/pagar/<int:parcela_id>', methods=['POST'])
+@login_required
+def pagar_parcela(parcela_id):
+    pago = request.form.get('pago') == '1'
+    movimento_id = MovimentoCrediario.set_parcela_paga(
+        parcela_id, current_user.id, pago)
+    if not movimento_id:
+        flash('Parcela não encontrada ou você não tem permissão para alterá-la.', 'danger')
+        return redirect(url_for('movimento_crediario.list_movimentos_crediario'))
+
+    flash('Parcela marcada como paga.' if pago else 'Parcela marcada como em aberto.', 'success')
+    return redirect(url_for('movimento_crediario.list_parcelas', movimento_id=movimento_id))
+
+
 @movimento_crediario_bp.route('/delete/<int:movimento_id>', methods=['POST'])
 @login_required
 def delete_movimento_crediario(movimento_id):
@@ -1,15 +1,19 @@
 # routes/movimento_routes.py
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from datetime import datetime
+from datetime import date, datetime
 
 from models.conta_bancaria_model import ContaBancaria
 from models.movimento_bancario_model import MovimentoBancario
 from models.transacao_model import Transacao
+from services.importacao_extrato import ler_extrato
+from services.dinheiro import ler_valor
 
 movimento_bp = Blueprint('movimento', __name__, url_prefix='/movimento')
 
+LOTE_MAXIMO = 500
+
 
 @movimento_bp.route('/')
 @login_required
@@ -30,8 +34,8 @@ def mov_lancamento():
             'nome_banco': conta.nome_banco,
             'numero_conta': conta.numero_conta,
             'tipo_conta': conta.tipo_conta,
-            'saldo_atual': float(conta.saldo_atual),
-            'limite_credito': float(conta.limite_credito) if conta.limite_credito is not None else None
+            'saldo_atual': conta.saldo_atual,
+            'limite_credito': conta.limite_credito
         })
 
     if request.method == 'POST':
@@ -44,7 +48,7 @@ def mov_lancamento():
 
         try:
             data = datetime.strptime(data_str, '%Y-%m-%d').date()
-            valor = float(valor_str.replace(',', '.'))
+            valor = ler_valor(valor_str)
 
             if is_transfer:
                 if not conta_destino_id:
@@ -77,6 +81,101 @@ def mov_lancamento():
     return render_template('movimento/lancamento.html', title='Novo Lançamento Bancário', contas=contas_json_serializable, transacoes=transacoes)
 
 
+def _ler_item_lote(item):
+    # converte um item do JSON; transferências trazem conta_destino_id
+    if not isinstance(item, dict):
+        raise ValueError("Cada lançamento deve ser um objeto JSON.")
+    try:
+        conta_id = int(item['conta_id'])
+        valor = ler_valor(item['valor'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Informe conta_id e valor numéricos.")
+    if valor == 0:
+        raise ValueError("O valor do lançamento deve ser diferente de zero.")
+
+    try:
+        data = datetime.strptime(item['data'], '%Y-%m-%d').date() if item.get('data') else date.today()
+    except (TypeError, ValueError):
+        raise ValueError("Data inválida, use o formato AAAA-MM-DD.")
+
+    conta_destino_id = None
+    if item.get('tipo') == 'transferencia' or item.get('conta_destino_id'):
+        try:
+            conta_destino_id = int(item['conta_destino_id'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Selecione a conta destino para a transferência.")
+        valor = abs(valor)
+        descricao = item.get('descricao') or "Transferência entre contas"
+    else:
+        descricao = (item.get('descricao') or '').strip()
+        if not descricao:
+            raise ValueError("A descrição é obrigatória.")
+
+    return {'conta_id': conta_id, 'conta_destino_id': conta_destino_id,
+            'data': data, 'valor': valor, 'descricao': descricao[:255]}
+
+
+@movimento_bp.route('/lancamento/lote', methods=['POST'])
+@login_required
+def mov_lancamento_lote():
+    # corpo: lista de lançamentos (ou {"lancamentos": [...]}); aplicados todos ou nenhum
+    dados = request.get_json(silent=True)
+    if isinstance(dados, dict):
+        dados = dados.get('lancamentos')
+    if not isinstance(dados, list) or not dados:
+        return jsonify({'erro': 'Envie uma lista JSON de lançamentos.'}), 400
+    if len(dados) > LOTE_MAXIMO:
+        return jsonify({'erro': f'No máximo {LOTE_MAXIMO} lançamentos por lote.'}), 400
+
+    itens = []
+    erros = []
+    for indice, item in enumerate(dados):
+        try:
+            itens.append(_ler_item_lote(item))
+        except ValueError as e:
+            erros.append({'indice': indice, 'erro': str(e)})
+    if erros:
+        return jsonify({'lancados': 0, 'erros': erros}), 400
+
+    try:
+        resultado = MovimentoBancario.add_lote(current_user.id, itens)
+    except Exception as e:
+        print(f"Erro inesperado no lançamento em lote: {e}")
+        return jsonify({'erro': 'Ocorreu um erro inesperado ao lançar o lote.'}), 500
+
+    return jsonify(resultado), (400 if resultado['erros'] else 201)
+
+
+@movimento_bp.route('/importar', methods=['GET', 'POST'])
+@login_required
+def importar_extrato():
+    contas = ContaBancaria.get_all_for_user(current_user.id)
+
+    if request.method == 'POST':
+        conta_id = request.form.get('conta_id')
+        arquivo = request.files.get('arquivo')
+
+        conta = next((c for c in contas if str(c.id) == str(conta_id)), None)
+        if not conta:
+            flash('Conta bancária não encontrada ou não pertence ao usuário.', 'danger')
+        elif not arquivo or not arquivo.filename:
+            flash('Selecione um arquivo CSV ou OFX para importar.', 'warning')
+        else:
+            try:
+                resultado = MovimentoBancario.importar_lote(
+                    conta.id, ler_extrato(arquivo.stream, arquivo.filename))
+                flash(
+                    f"Importação concluída: {resultado['inseridos']} lançamento(s) importado(s), "
+                    f"{resultado['duplicados']} duplicado(s) ignorado(s).", 'success')
+                return redirect(url_for('movimento.importar_extrato'))
+            except ValueError as e:
+                flash(f'Erro na importação: {e}', 'danger')
+            except Exception as e:
+                flash(f'Ocorreu um erro inesperado: {e}', 'danger')
+
+    return render_template('movimento/importar.html', title='Importar Extrato', contas=contas)
+
+
 @movimento_bp.route('/resumo_contas')
 @login_required
 def mov_resumo_contas():
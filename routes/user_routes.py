@@ -1,6 +1,7 @@
 # routes/user_routes.py
-from flask import Blueprint, render_template, request, redirect, url_for, flash
-from models.user_model import User
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from models.user_model import User, user_cache
+from services.cache import lookup_cache
 from flask_login import login_required, current_user, login_user, logout_user
 from functools import wraps
 
@@ -74,7 +75,8 @@ def edit_user(user_id):
         password = request.form.get('password')
         name = request.form['name']
         email = request.form['email']
-        is_admin = 'is_admin' in request.form if current_user.is_admin else user.is_admin
+        # só um admin altera is_admin; None mantém o valor gravado no banco
+        is_admin = 'is_admin' in request.form if current_user.is_admin else None
 
         if not (login and name and email):
             flash(
@@ -125,6 +127,13 @@ def delete_user(user_id):
     return redirect(url_for('users.list_users'))
 
 
+@user_bp.route('/cache/stats')
+@login_required
+@admin_required
+def cache_stats():
+    return jsonify({'users': user_cache.stats(), 'lookups': lookup_cache.stats()})
+
+
 @user_bp.route('/login', methods=['GET', 'POST'])
 def login():
     if current_user.is_authenticated:
@@ -0,0 +1,222 @@
+# services/cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+# canal do PostgreSQL (LISTEN/NOTIFY) por onde os processos trocam invalidações do LookupCache
+CANAL_INVALIDACAO = 'lookup_cache'
+RECONEXAO_OUVINTE_S = 5
+
+
+class TTLCache:
+    # cache LRU em memória do processo, com limite de itens e expiração por tempo
+    def __init__(self, maxsize=1024, ttl=300, nome=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.nome = nome
+        self.hits = 0
+        self.misses = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                expira_em, valor = item
+                if expira_em > time.monotonic():
+                    self._itens.move_to_end(chave)
+                    self.hits += 1
+                    return valor
+                del self._itens[chave]
+            self.misses += 1
+            return None
+
+    def set(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.maxsize:
+                self._itens.popitem(last=False)
+
+    def invalidate(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def invalidate_where(self, condicao):
+        with self._lock:
+            for chave in [c for c in self._itens if condicao(c)]:
+                del self._itens[chave]
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'nome': self.nome,
+                'itens': len(self._itens),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits / total) if total else 0.0
+            }
+
+
+class LookupCache:
+    # listas pequenas por (tabela, usuário) -- transações, crediários, grupos etc.
+    # Os modelos invalidam a entrada em add/update/delete. Os objetos guardados são
+    # compartilhados entre requisições: quem lê recebe uma cópia da lista e não os altera.
+    # Com notificar=True cada invalidação também vai por NOTIFY (canal CANAL_INVALIDACAO)
+    # e uma thread de cada processo, com LISTEN, invalida a mesma entrada nos demais
+    # workers; sem isso (ou com o ouvinte desconectado) a defasagem entre workers chega ao ttl.
+    # Caches por id registrados com vincular() (ex.: users) usam o mesmo canal.
+    def __init__(self, maxsize=4096, ttl=600, notificar=False):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, nome='lookups')
+        self._lock = threading.Lock()
+        self._contadores = {}
+        # cargas em andamento: chave -> [geração, carregadores]; uma invalidação durante a
+        # carga muda a geração e o valor lido é descartado. A entrada sai com o último carregador.
+        self._carregando = {}
+        self._notificar = notificar
+        self._ouvinte_pid = None
+        self._vinculados = {}
+
+    def vincular(self, cache):
+        self._vinculados[cache.nome] = cache
+
+    def get_item(self, cache, chave):
+        self._garantir_ouvinte()
+        return cache.get(chave)
+
+    def invalidate_item(self, cache, chave):
+        cache.invalidate(chave)
+        self._enviar(f'#{cache.nome}:{chave}')
+
+    def get_or_load(self, tabela, user_id, loader):
+        self._garantir_ouvinte()
+        chave = (tabela, int(user_id))
+        valor = self._cache.get(chave)
+        with self._lock:
+            contador = self._contadores.setdefault(
+                tabela, {'hits': 0, 'misses': 0})
+            if valor is not None:
+                contador['hits'] += 1
+                return valor
+            contador['misses'] += 1
+            carga = self._carregando.setdefault(chave, [0, 0])
+            carga[1] += 1
+            geracao = carga[0]
+
+        valor = None
+        try:
+            valor = loader()
+        finally:
+            with self._lock:
+                carga = self._carregando[chave]
+                carga[1] -= 1
+                if not carga[1]:
+                    del self._carregando[chave]
+                # execute_query devolve False em erro de operação: só listas vão para o cache
+                if isinstance(valor, list) and carga[0] == geracao:
+                    self._cache.set(chave, valor)
+        return valor
+
+    def invalidate(self, tabela, user_id):
+        self._invalidar_local(tabela, int(user_id))
+        self._enviar(f'{tabela}:{int(user_id)}')
+
+    def invalidate_user(self, user_id):
+        self._invalidar_local(None, int(user_id))
+        self._enviar(f'*:{int(user_id)}')
+
+    def _invalidar_local(self, tabela, user_id):
+        # tabela None: todas as tabelas do usuário
+        def afetada(chave):
+            return chave[1] == user_id and (tabela is None or chave[0] == tabela)
+        with self._lock:
+            for chave, carga in self._carregando.items():
+                if afetada(chave):
+                    carga[0] += 1
+            self._cache.invalidate_where(afetada)
+
+    def clear(self):
+        with self._lock:
+            for carga in self._carregando.values():
+                carga[0] += 1
+            self._cache.clear()
+        for cache in self._vinculados.values():
+            cache.clear()
+
+    def _enviar(self, mensagem):
+        # depois do commit do modelo; uma falha aqui não desfaz a gravação já confirmada
+        if not self._notificar:
+            return
+        from database.db_manager import execute_query
+        try:
+            execute_query('SELECT pg_notify(%s, %s)', (CANAL_INVALIDACAO, mensagem), commit=True)
+        except Exception as e:
+            print(f"Erro ao notificar a invalidação do cache ({mensagem}): {e}")
+
+    def _aplicar(self, mensagem):
+        # "tabela:uid" ou "*:uid" (LookupCache); "#nome:chave" (cache vinculado)
+        tabela, _, user_id = mensagem.rpartition(':')
+        try:
+            if tabela.startswith('#'):
+                cache = self._vinculados.get(tabela[1:])
+                if cache is not None:
+                    cache.invalidate(int(user_id))
+            else:
+                self._invalidar_local(None if tabela == '*' else tabela, int(user_id))
+        except ValueError:
+            print(f"Notificação de invalidação do cache inválida: {mensagem}")
+
+    def _garantir_ouvinte(self):
+        if self._notificar and self._ouvinte_pid != os.getpid():
+            self._iniciar_ouvinte()
+
+    def _iniciar_ouvinte(self):
+        # uma thread por processo (o pid muda nos workers criados por fork depois do preload)
+        with self._lock:
+            if self._ouvinte_pid == os.getpid():
+                return
+            self._ouvinte_pid = os.getpid()
+        threading.Thread(target=self._ouvir, name='invalidacao-lookup-cache', daemon=True).start()
+
+    def _ouvir(self):
+        from database.db_manager import get_db_connection
+        while True:
+            try:
+                conn = get_db_connection()
+                conn.autocommit = True
+                with conn:
+                    conn.execute(f'LISTEN {CANAL_INVALIDACAO}')
+                    # o que foi gravado enquanto não havia LISTEN não chegou até aqui
+                    self.clear()
+                    for notificacao in conn.notifies():
+                        self._aplicar(notificacao.payload)
+            except Exception as e:
+                print(f"Erro no ouvinte de invalidação do cache: {e}")
+            time.sleep(RECONEXAO_OUVINTE_S)
+
+    def stats(self):
+        with self._lock:
+            tabelas = {}
+            for tabela, contador in self._contadores.items():
+                total = contador['hits'] + contador['misses']
+                tabelas[tabela] = dict(
+                    contador, hit_ratio=(contador['hits'] / total) if total else 0.0)
+        geral = self._cache.stats()
+        geral['tabelas'] = tabelas
+        geral['notificacoes'] = self._notificar
+        return geral
+
+
+lookup_cache = LookupCache(maxsize=Config.LOOKUP_CACHE_MAXSIZE,
+                           ttl=Config.LOOKUP_CACHE_TTL,
+                           notificar=Config.LOOKUP_CACHE_NOTIFY)
@@ -0,0 +1,52 @@
+# services/dinheiro.py
+# Valores monetários são Decimal com duas casas do banco ao template: as colunas NUMERIC já
+# chegam do psycopg como Decimal (e Decimal volta ao banco como numeric), então somas e
+# saldos ficam exatos sem conversão por linha. Aqui ficam a leitura dos formulários e o
+# arredondamento, sempre meio para cima, como o ROUND do PostgreSQL.
+import re
+from decimal import ROUND_HALF_UP, Decimal
+
+CENTAVO = Decimal('0.01')
+ZERO = Decimal('0.00')
+# milhar com ponto e decimal com vírgula (pt-BR) / milhar com vírgula e decimal com ponto
+_FORMATO_VIRGULA = re.compile(r'[+-]?(\d{1,3}(\.\d{3})+|\d+)(,\d+)?')
+_FORMATO_PONTO = re.compile(r'[+-]?(\d{1,3}(,\d{3})+|\d+)(\.\d+)?')
+
+
+def dinheiro(valor):
+    # None continua None; float passa por repr para não herdar o erro da representação binária
+    if valor is None:
+        return None
+    if isinstance(valor, float):
+        valor = repr(valor)
+    valor = Decimal(valor)
+    if not valor.is_finite():
+        raise ValueError("Valor monetário inválido.")
+    return valor.quantize(CENTAVO, rounding=ROUND_HALF_UP)
+
+
+def ler_valor(texto):
+    # "1234.56", "1,234.56", "1234,56", "1.234,56" ou "R$ 1.234,56": o último separador é o
+    # decimal. Mais de duas casas decimais é erro, nunca arredondamento ("1,234" é ambíguo).
+    limpo = str(texto or '').strip().replace('R$', '').replace(' ', '').replace('\xa0', '')
+    ultimo = max(limpo.rfind(','), limpo.rfind('.'))
+    if ultimo >= 0 and limpo[ultimo] == ',' and _FORMATO_VIRGULA.fullmatch(limpo):
+        limpo = limpo.replace('.', '').replace(',', '.')
+    elif _FORMATO_PONTO.fullmatch(limpo):
+        limpo = limpo.replace(',', '')
+    else:
+        raise ValueError(f"Valor inválido: '{texto}'.")
+    if len(limpo.partition('.')[2]) > 2:
+        raise ValueError(f"Valor com mais de duas casas decimais: '{texto}'.")
+    return dinheiro(limpo)
+
+
+def valor_parcela(total, parcelas):
+    # valor mensal (o da primeira parcela): o total em centavos é dividido por igual e o resto
+    # vai, um centavo para cada, nas primeiras parcelas (ver MovimentoCrediario._gerar_parcelas)
+    if not total or not parcelas:
+        return ZERO
+    base, resto = divmod(int(dinheiro(total) / CENTAVO), parcelas)
+    if base < 1:
+        raise ValueError("Cada parcela deve ser de pelo menos R$ 0,01.")
+    return (base + (1 if resto else 0)) * CENTAVO
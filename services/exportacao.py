@@ -0,0 +1,101 @@
+# services/exportacao.py
+import csv
+import io
+import os
+import re
+import tempfile
+from datetime import date
+from decimal import Decimal
+from urllib.parse import quote
+
+from flask import Response, stream_with_context
+
+LINHAS_POR_BLOCO = 1000
+TAMANHO_BLOCO_ARQUIVO = 64 * 1024
+# nome de arquivo seguro em qualquer navegador (filename=); o nome completo vai em filename*
+_NOME_INSEGURO = re.compile(r'[^A-Za-z0-9_-]+')
+
+
+def gerar_csv(cabecalho, linhas, delimitador=';'):
+    # gera o CSV em blocos de LINHAS_POR_BLOCO linhas; nada além do bloco atual fica em memória
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=delimitador)
+    buffer.write('﻿')
+    escritor.writerow(cabecalho)
+    pendentes = 0
+    for linha in linhas:
+        escritor.writerow(linha)
+        pendentes += 1
+        if pendentes >= LINHAS_POR_BLOCO:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pendentes = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gerar_xlsx(cabecalho, linhas, nome_planilha='Dados'):
+    # XlsxWriter em modo constant_memory grava cada linha em disco assim que é escrita;
+    # o arquivo final (zip) é enviado em blocos e removido ao final
+    import xlsxwriter
+
+    descritor, caminho = tempfile.mkstemp(suffix='.xlsx')
+    os.close(descritor)
+    try:
+        workbook = xlsxwriter.Workbook(
+            caminho, {'constant_memory': True, 'tmpdir': tempfile.gettempdir()})
+        planilha = workbook.add_worksheet(nome_planilha[:31])
+        formato_data = workbook.add_format({'num_format': 'dd/mm/yyyy'})
+        formato_valor = workbook.add_format({'num_format': '#,##0.00'})
+        negrito = workbook.add_format({'bold': True})
+
+        planilha.write_row(0, 0, cabecalho, negrito)
+        for numero, linha in enumerate(linhas, start=1):
+            for coluna, valor in enumerate(linha):
+                if isinstance(valor, date):
+                    planilha.write_datetime(numero, coluna, valor, formato_data)
+                elif isinstance(valor, (Decimal, float)):
+                    planilha.write_number(numero, coluna, float(valor), formato_valor)
+                else:
+                    planilha.write(numero, coluna, valor)
+        workbook.close()
+
+        with open(caminho, 'rb') as arquivo:
+            while True:
+                bloco = arquivo.read(TAMANHO_BLOCO_ARQUIVO)
+                if not bloco:
+                    break
+                yield bloco
+    finally:
+        os.remove(caminho)
+
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+
+def _content_disposition(nome_arquivo, formato):
+    # o nome pode vir de dados do usuário (nome do banco): filename leva só [A-Za-z0-9_-]
+    # e filename* (RFC 5987) o nome original, codificado em UTF-8
+    seguro = _NOME_INSEGURO.sub('_', nome_arquivo).strip('_') or 'exportacao'
+    completo = quote(f'{nome_arquivo}.{formato}', safe='')
+    return f"attachment; filename=\"{seguro}.{formato}\"; filename*=UTF-8''{completo}"
+
+
+def resposta_exportacao(cabecalho, linhas, formato, nome_arquivo, nome_planilha='Dados'):
+    # nome_planilha é fixo (não vem do usuário): o XlsxWriter rejeita nomes com / \ ? * [ ] :
+    # e, como a resposta é transmitida em blocos, o erro chegaria depois do status 200
+    if formato not in FORMATOS:
+        raise ValueError("Formato de exportação inválido. Use CSV ou XLSX.")
+    if formato == 'xlsx':
+        conteudo = gerar_xlsx(cabecalho, linhas, nome_planilha)
+    else:
+        conteudo = gerar_csv(cabecalho, linhas)
+    return Response(
+        stream_with_context(conteudo),
+        mimetype=FORMATOS[formato],
+        headers={'Content-Disposition': _content_disposition(nome_arquivo, formato)}
+    )
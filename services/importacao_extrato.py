@@ -0,0 +1,136 @@
+# services/importacao_extrato.py
+import codecs
+import csv
+import io
+import itertools
+import re
+from datetime import datetime
+
+from services.dinheiro import ler_valor
+
+DESCRICAO_PADRAO = 'Lançamento importado'
+TAMANHO_DESCRICAO = 255
+TAMANHO_BLOCO = 64 * 1024
+
+_OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+
+
+def _parse_data(valor, linha):
+    valor = valor.strip()
+    for formato in ('%Y-%m-%d', '%d/%m/%Y', '%Y%m%d'):
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Linha {linha}: data inválida '{valor}'.")
+
+
+def _parse_valor(valor, linha):
+    try:
+        return ler_valor(valor)
+    except ValueError as e:
+        raise ValueError(f"Linha {linha}: {e}")
+
+
+def _descricao(valor):
+    valor = (valor or '').strip()
+    return valor[:TAMANHO_DESCRICAO] if valor else DESCRICAO_PADRAO
+
+
+def ler_csv(stream):
+    # colunas esperadas: data, valor, descricao (cabeçalho opcional; separador ',' ou ';')
+    texto = io.TextIOWrapper(stream, encoding='utf-8-sig',
+                             errors='replace', newline='')
+    primeira = texto.readline()
+    if not primeira:
+        return
+    delimitador = ';' if primeira.count(';') > primeira.count(',') else ','
+    colunas = {'data': 0, 'valor': 1, 'descricao': 2}
+
+    cabecalho = next(csv.reader([primeira], delimiter=delimitador))
+    nomes = [c.strip().lower().replace('ç', 'c').replace('ã', 'a') for c in cabecalho]
+    if 'data' in nomes and 'valor' in nomes:
+        colunas = {
+            'data': nomes.index('data'),
+            'valor': nomes.index('valor'),
+            'descricao': nomes.index('descricao') if 'descricao' in nomes else None
+        }
+        linhas = csv.reader(texto, delimiter=delimitador)
+        inicio = 2
+    else:
+        linhas = itertools.chain(
+            csv.reader([primeira], delimiter=delimitador),
+            csv.reader(texto, delimiter=delimitador))
+        inicio = 1
+
+    for numero, campos in enumerate(linhas, start=inicio):
+        if not campos or not any(c.strip() for c in campos):
+            continue
+        try:
+            data = campos[colunas['data']]
+            valor = campos[colunas['valor']]
+            descricao = campos[colunas['descricao']] if colunas['descricao'] is not None and len(
+                campos) > colunas['descricao'] else ''
+        except IndexError:
+            raise ValueError(f"Linha {numero}: colunas insuficientes.")
+        yield _parse_data(data, numero), _parse_valor(valor, numero), _descricao(descricao)
+
+
+def _detectar_encoding_ofx(cabecalho):
+    cabecalho = cabecalho.upper()
+    if b'UTF-8' in cabecalho or b'UTF8' in cabecalho:
+        return 'utf-8'
+    return 'cp1252'
+
+
+def ler_ofx(stream):
+    # leitura incremental dos blocos <STMTTRN> (OFX 1.x SGML ou 2.x XML)
+    bloco = stream.read(TAMANHO_BLOCO)
+    decoder = codecs.getincrementaldecoder(
+        _detectar_encoding_ofx(bloco[:4096]))(errors='replace')
+    buffer = ''
+    transacao = None
+    numero = 0
+
+    while bloco:
+        buffer += decoder.decode(bloco)
+        corte = buffer.rfind('<')
+        processar, buffer = (buffer[:corte], buffer[corte:]) if corte > 0 else ('', buffer)
+        for fechamento, tag, conteudo in _OFX_TAG.findall(processar):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if not fechamento:
+                    transacao = {}
+                    numero += 1
+                elif transacao is not None:
+                    yield _transacao_ofx(transacao, numero)
+                    transacao = None
+            elif transacao is not None and not fechamento:
+                transacao[tag] = conteudo.strip()
+        bloco = stream.read(TAMANHO_BLOCO)
+
+    buffer += decoder.decode(b'', final=True)
+    for fechamento, tag, conteudo in _OFX_TAG.findall(buffer):
+        if tag.upper() == 'STMTTRN' and fechamento and transacao is not None:
+            yield _transacao_ofx(transacao, numero)
+            transacao = None
+        elif transacao is not None and not fechamento:
+            transacao[tag.upper()] = conteudo.strip()
+
+
+def _transacao_ofx(transacao, numero):
+    if 'DTPOSTED' not in transacao or 'TRNAMT' not in transacao:
+        raise ValueError(
+            f"Transação {numero}: DTPOSTED ou TRNAMT ausente no arquivo OFX.")
+    data = _parse_data(transacao['DTPOSTED'][:8], numero)
+    valor = _parse_valor(transacao['TRNAMT'], numero)
+    return data, valor, _descricao(transacao.get('MEMO') or transacao.get('NAME'))
+
+
+def ler_extrato(stream, nome_arquivo):
+    nome = (nome_arquivo or '').lower()
+    if nome.endswith('.csv') or nome.endswith('.txt'):
+        return ler_csv(stream)
+    if nome.endswith('.ofx') or nome.endswith('.qfx'):
+        return ler_ofx(stream)
+    raise ValueError("Formato de arquivo não suportado. Use CSV ou OFX.")
@@ -0,0 +1,90 @@
+# services/instrumentacao_sql.py
+# Coleta, por requisição, os comandos SQL executados (texto, duração, linhas) e o tempo
+# de espera por conexão do pool. Ativado com SQL_DEBUG=1: cada resposta ganha o cabeçalho
+# X-SQL-Stats e uma linha de log; comandos idênticos repetidos na mesma requisição
+# (o padrão N+1) são apontados.
+import re
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+
+from database.db_manager import registrar_ouvinte
+
+# limite de comandos guardados por requisição (exportações longas não acumulam tudo)
+MAX_CONSULTAS = 500
+
+_ESPACOS = re.compile(r'\s+')
+
+
+def _normalizar(sql):
+    return _ESPACOS.sub(' ', sql).strip()
+
+
+def _ouvinte(evento):
+    if not has_request_context():
+        return
+    coleta = g.get('sql_coleta')
+    if coleta is None:
+        return
+    if evento['tipo'] == 'conexao':
+        coleta['conexoes'] += 1
+        coleta['espera_conexao_ms'] += evento['espera_ms']
+    elif evento['sql']:
+        # o comando vazio é a verificação da conexão feita pelo pool
+        coleta['total'] += 1
+        coleta['tempo_ms'] += evento['duracao_ms']
+        if len(coleta['consultas']) < MAX_CONSULTAS:
+            coleta['consultas'].append(
+                (_normalizar(evento['sql']), evento['duracao_ms'], evento['linhas']))
+
+
+def _iniciar_coleta():
+    g.sql_coleta = {
+        'inicio': time.perf_counter(),
+        'total': 0,
+        'tempo_ms': 0.0,
+        'conexoes': 0,
+        'espera_conexao_ms': 0.0,
+        'consultas': []
+    }
+
+
+def resumo_da_requisicao():
+    coleta = g.get('sql_coleta')
+    if coleta is None:
+        return None
+    repeticoes = Counter(sql for sql, _, _ in coleta['consultas'])
+    return {
+        'consultas': coleta['total'],
+        'tempo_ms': round(coleta['tempo_ms'], 2),
+        'conexoes': coleta['conexoes'],
+        'espera_conexao_ms': round(coleta['espera_conexao_ms'], 2),
+        'repetidas': {sql: n for sql, n in repeticoes.items() if n > 1},
+        'detalhes': coleta['consultas']
+    }
+
+
+def _finalizar_coleta(response):
+    resumo = resumo_da_requisicao()
+    if resumo is None:
+        return response
+
+    response.headers['X-SQL-Stats'] = (
+        f"consultas={resumo['consultas']}; tempo_ms={resumo['tempo_ms']}; "
+        f"conexoes={resumo['conexoes']}; espera_conexao_ms={resumo['espera_conexao_ms']}; "
+        f"repetidas={len(resumo['repetidas'])}")
+
+    duracao_ms = (time.perf_counter() - g.sql_coleta['inicio']) * 1000
+    print(f"[SQL] {request.method} {request.path} ({request.endpoint}): "
+          f"{resumo['consultas']} consulta(s) em {resumo['tempo_ms']:.2f} ms, "
+          f"{resumo['conexoes']} conexão(ões), requisição em {duracao_ms:.2f} ms")
+    for sql, vezes in resumo['repetidas'].items():
+        print(f"[SQL]   repetida {vezes}x (possível N+1): {sql[:200]}")
+    return response
+
+
+def init_app(app):
+    registrar_ouvinte(_ouvinte)
+    app.before_request(_iniciar_coleta)
+    app.after_request(_finalizar_coleta)
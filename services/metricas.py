@@ -0,0 +1,223 @@
+# services/metricas.py
+# Registro de métricas em memória (por processo) exposto em /metrics no formato texto do
+# Prometheus: latência das requisições por endpoint, latência dos comandos SQL, espera por
+# conexão, estado do pool, acertos dos caches e erros 404/500. Cada observação custa uma
+# busca binária e um incremento sob lock, então pode ficar ligado em produção.
+import hmac
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, current_app, g, request
+
+from database.db_manager import get_pool_stats, registrar_ouvinte
+
+LIMITES_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_DB = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _rotulos(nomes, valores, extra=None):
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _numero(valor):
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Contador:
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *valores, quantidade=1):
+        with self._lock:
+            self._valores[valores] = self._valores.get(valores, 0) + quantidade
+
+    def exportar(self):
+        linhas = [f'# HELP {self.nome} {self.ajuda}', f'# TYPE {self.nome} counter']
+        with self._lock:
+            itens = list(self._valores.items())
+        for valores, total in itens:
+            linhas.append(f'{self.nome}{_rotulos(self.rotulos, valores)} {_numero(total)}')
+        return linhas
+
+
+class Histograma:
+    def __init__(self, nome, ajuda, rotulos=(), limites=LIMITES_HTTP):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.limites = tuple(limites)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor, *valores):
+        indice = bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(valores)
+            if serie is None:
+                serie = self._series[valores] = [[0] * (len(self.limites) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def exportar(self):
+        linhas = [f'# HELP {self.nome} {self.ajuda}', f'# TYPE {self.nome} histogram']
+        with self._lock:
+            series = [(valores, list(contagens), soma, total)
+                      for valores, (contagens, soma, total) in self._series.items()]
+        for valores, contagens, soma, total in series:
+            acumulado = 0
+            for limite, contagem in zip(self.limites + (float('inf'),), contagens):
+                acumulado += contagem
+                le = f'le="{_numero(limite)}"'
+                linhas.append(
+                    f'{self.nome}_bucket{_rotulos(self.rotulos, valores, le)} {acumulado}')
+            linhas.append(f'{self.nome}_sum{_rotulos(self.rotulos, valores)} {_numero(soma)}')
+            linhas.append(f'{self.nome}_count{_rotulos(self.rotulos, valores)} {total}')
+        return linhas
+
+
+class Registro:
+    def __init__(self):
+        self._metricas = []
+        self._coletores = []
+
+    def adicionar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def coletor(self, funcao):
+        # funcao() -> [(nome, tipo, ajuda, [(dict de rótulos, valor)])], lida a cada coleta
+        self._coletores.append(funcao)
+        return funcao
+
+    def exportar(self):
+        linhas = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.exportar())
+        for funcao in self._coletores:
+            try:
+                familias = funcao()
+            except Exception as e:
+                print(f"Erro ao coletar métricas: {e}")
+                continue
+            for nome, tipo, ajuda, amostras in familias:
+                linhas.append(f'# HELP {nome} {ajuda}')
+                linhas.append(f'# TYPE {nome} {tipo}')
+                for rotulos, valor in amostras:
+                    linhas.append(
+                        f'{nome}{_rotulos(rotulos.keys(), rotulos.values())} {_numero(valor)}')
+        return '\n'.join(linhas) + '\n'
+
+
+registro = Registro()
+
+requisicoes = registro.adicionar(Contador(
+    'financas_http_requisicoes_total', 'Requisições HTTP atendidas.',
+    ('endpoint', 'metodo', 'status')))
+duracao_requisicao = registro.adicionar(Histograma(
+    'financas_http_requisicao_duracao_segundos', 'Duração das requisições HTTP.',
+    ('endpoint', 'metodo'), LIMITES_HTTP))
+erros = registro.adicionar(Contador(
+    'financas_http_erros_total', 'Respostas dos tratadores de erro 404/500.', ('codigo',)))
+duracao_consulta = registro.adicionar(Histograma(
+    'financas_db_consulta_duracao_segundos', 'Duração dos comandos SQL.',
+    ('operacao',), LIMITES_DB))
+espera_conexao = registro.adicionar(Histograma(
+    'financas_db_conexao_espera_segundos', 'Espera para obter uma conexão do pool.',
+    (), LIMITES_DB))
+
+_OPERACOES = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'COPY')
+
+
+def _ouvinte_db(evento):
+    if evento['tipo'] == 'conexao':
+        espera_conexao.observar(evento['espera_ms'] / 1000)
+        return
+    if not evento['sql']:
+        return
+    operacao = evento['sql'].split(None, 1)[0].upper()
+    duracao_consulta.observar(evento['duracao_ms'] / 1000,
+                              operacao if operacao in _OPERACOES else 'OUTRA')
+
+
+@registro.coletor
+def _coletar_pool():
+    stats = get_pool_stats()
+    amostras = []
+    for chave in ('pool_min', 'pool_max', 'pool_size', 'pool_available', 'requests_waiting'):
+        if chave in stats:
+            amostras.append(({'estado': chave}, stats[chave]))
+    return [
+        ('financas_db_pool', 'gauge', 'Estado do pool de conexões.', amostras),
+        ('financas_db_conexoes_obtidas_total', 'counter', 'Conexões obtidas do pool.',
+         [({}, stats['acquisitions'])]),
+    ]
+
+
+@registro.coletor
+def _coletar_caches():
+    from models.user_model import user_cache
+    from services.cache import lookup_cache
+
+    acertos = []
+    falhas = []
+    usuarios = user_cache.stats()
+    acertos.append(({'cache': 'users'}, usuarios['hits']))
+    falhas.append(({'cache': 'users'}, usuarios['misses']))
+    for tabela, contador in lookup_cache.stats()['tabelas'].items():
+        acertos.append(({'cache': tabela}, contador['hits']))
+        falhas.append(({'cache': tabela}, contador['misses']))
+    return [
+        ('financas_cache_acertos_total', 'counter', 'Leituras atendidas pelo cache.', acertos),
+        ('financas_cache_falhas_total', 'counter', 'Leituras que foram ao banco.', falhas),
+    ]
+
+
+def registrar_erro(codigo):
+    erros.inc(str(codigo))
+
+
+def _inicio_requisicao():
+    g.metricas_inicio = time.perf_counter()
+
+
+def _fim_requisicao(response):
+    inicio = g.pop('metricas_inicio', None)
+    if inicio is not None:
+        endpoint = request.endpoint or 'sem_rota'
+        duracao_requisicao.observar(time.perf_counter() - inicio, endpoint, request.method)
+        requisicoes.inc(endpoint, request.method, str(response.status_code))
+    return response
+
+
+def metricas():
+    esperado = f"Bearer {current_app.config['METRICS_TOKEN']}"
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), esperado):
+        return Response('Não autorizado.\n', status=401, mimetype='text/plain')
+    return Response(registro.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def init_app(app):
+    # o endpoint expõe tráfego, erros e estado do pool/caches: nunca sem token
+    if not app.config.get('METRICS_TOKEN'):
+        print("METRICS_ENABLED sem METRICS_TOKEN: /metrics não foi registrado.")
+        return
+    registrar_ouvinte(_ouvinte_db)
+    app.before_request(_inicio_requisicao)
+    app.after_request(_fim_requisicao)
+    app.add_url_rule('/metrics', 'metricas', metricas)
+    app.extensions['metricas'] = registro
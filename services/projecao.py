@@ -0,0 +1,80 @@
+# services/projecao.py
+from datetime import date
+from itertools import accumulate
+
+from dateutil.relativedelta import relativedelta
+
+from config import Config
+from database.db_manager import get_db_cursor
+from services.dinheiro import ZERO
+
+
+def _carregar(cursor, user_id, inicio, fim):
+    # três leituras agregadas na mesma conexão: saldo atual, despesas fixas e parcelas em aberto
+    cursor.execute(
+        "SELECT COALESCE(SUM(saldo_atual), 0) FROM contas_bancarias WHERE user_id = %s;",
+        (user_id,)
+    )
+    saldo_atual = cursor.fetchone()[0]
+
+    cursor.execute(
+        """
+        SELECT date_trunc('month', mes_ano)::date, SUM(valor)
+        FROM despesas_fixas
+        WHERE user_id = %s AND mes_ano >= %s AND mes_ano < %s
+        GROUP BY 1;
+        """,
+        (user_id, inicio, fim)
+    )
+    despesas = dict(cursor.fetchall())
+
+    cursor.execute(
+        """
+        SELECT p.mes_referencia,
+               SUM(CASE WHEN gc.tipo = 'Estorno' THEN -p.valor ELSE p.valor END)
+        FROM parcelas_crediario p
+        JOIN movimento_crediario mc ON p.id_movimento_crediario = mc.id
+        JOIN grupo_crediario gc ON mc.id_grupo_crediario = gc.id
+        WHERE p.user_id = %s AND p.pago = FALSE
+          AND p.mes_referencia >= %s AND p.mes_referencia < %s
+        GROUP BY 1;
+        """,
+        (user_id, inicio, fim)
+    )
+    parcelas = dict(cursor.fetchall())
+    return saldo_atual, despesas, parcelas
+
+
+def calcular_projecao(user_id, meses=None, hoje=None):
+    # saldo projetado mês a mês: parte da soma dos saldos atuais das contas e desconta,
+    # em cada mês, as despesas fixas e as parcelas de crediário ainda não pagas.
+    # Não há cache: o saldo atual muda a cada lançamento e as três consultas agregadas
+    # custam pouco; calcular na hora evita mostrar saldo antigo em outro worker.
+    meses = meses or Config.PROJECAO_MESES
+    hoje = hoje or date.today()
+    inicio = date(hoje.year, hoje.month, 1)
+    fim = inicio + relativedelta(months=meses)
+
+    with get_db_cursor() as cursor:
+        saldo_atual, despesas, parcelas = _carregar(
+            cursor, user_id, inicio, fim)
+
+    eixo = [inicio + relativedelta(months=i) for i in range(meses)]
+    # somas em Decimal, exatas: nada a arredondar
+    despesas_mes = [despesas.get(mes, ZERO) for mes in eixo]
+    parcelas_mes = [parcelas.get(mes, ZERO) for mes in eixo]
+    saidas = [d + p for d, p in zip(despesas_mes, parcelas_mes)]
+    saldos_finais = list(accumulate(saidas, lambda saldo, saida: saldo - saida,
+                                    initial=saldo_atual))
+
+    return [
+        {
+            'mes': mes.strftime('%Y-%m'),
+            'saldo_inicial': saldos_finais[i],
+            'despesas_fixas': despesas_mes[i],
+            'parcelas_crediario': parcelas_mes[i],
+            'total_saidas': saidas[i],
+            'saldo_projetado': saldos_finais[i + 1]
+        }
+        for i, mes in enumerate(eixo)
+    ]
@@ -0,0 +1,14 @@
+# wsgi.py
+# Ponto de entrada para servidores WSGI, por exemplo:
+#   gunicorn --preload -w 4 wsgi:app
+# Com --preload o processo mestre importa as rotas, confere a versão do esquema e compila
+# os templates uma única vez; os workers herdam tudo pelo fork.
+from app import create_app, preaquecer
+from database.db_manager import close_pool
+from database.migrate import verificar_versao
+
+app = preaquecer(create_app())
+
+verificar_versao()
+# o pool aberto pela verificação não pode ser herdado pelos workers: cada um abre o seu
+close_pool()